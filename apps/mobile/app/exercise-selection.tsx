@@ -1,4 +1,5 @@
 import { useCreateSession } from '@/hooks/api';
+import type { StreamMode } from '@/hooks/landmarkPacket';
 import { router } from 'expo-router';
 import React, { useState } from 'react';
 import { Alert, ScrollView, StyleSheet, Text, TouchableOpacity, View } from 'react-native';
@@ -12,8 +13,15 @@ const EXERCISES = [
 	{ id: 'shouldertap', name: 'Shoulder Taps', description: 'Core stability' },
 ];
 
+const STREAM_MODES: { id: StreamMode; name: string }[] = [
+	{ id: 'overlay', name: 'Video' },
+	{ id: 'landmarks', name: 'Video + Skeleton' },
+	{ id: 'stats', name: 'Stats Only' },
+];
+
 export default function ExerciseSelectionScreen() {
 	const [selectedExercise, setSelectedExercise] = useState<string | null>(null);
+	const [streamMode, setStreamMode] = useState<StreamMode>('overlay');
 	const createSessionMutation = useCreateSession();
 
 	const startSession = async () => {
@@ -29,6 +37,7 @@ export default function ExerciseSelectionScreen() {
 				params: {
 					sessionId: session.id,
 					exercise: selectedExercise,
+					streamMode,
 				},
 			});
 		} catch (error) {
@@ -53,6 +62,19 @@ export default function ExerciseSelectionScreen() {
 						</TouchableOpacity>
 					))}
 				</View>
+
+				<View style={styles.streamModeRow}>
+					{STREAM_MODES.map((mode) => (
+						<TouchableOpacity
+							key={mode.id}
+							style={[styles.streamModeButton, streamMode === mode.id && styles.streamModeButtonSelected]}
+							onPress={() => setStreamMode(mode.id)}>
+							<Text style={[styles.streamModeText, streamMode === mode.id && styles.streamModeTextSelected]}>
+								{mode.name}
+							</Text>
+						</TouchableOpacity>
+					))}
+				</View>
 			</ScrollView>
 
 			<View style={styles.footer}>
@@ -120,6 +142,33 @@ const styles = StyleSheet.create({
 		color: '#666',
 		textAlign: 'center',
 	},
+	streamModeRow: {
+		flexDirection: 'row',
+		justifyContent: 'space-between',
+		paddingHorizontal: 12,
+	},
+	streamModeButton: {
+		flex: 1,
+		marginHorizontal: 4,
+		paddingVertical: 10,
+		borderRadius: 8,
+		borderWidth: 2,
+		borderColor: '#e0e0e0',
+		backgroundColor: 'white',
+		alignItems: 'center',
+	},
+	streamModeButtonSelected: {
+		borderColor: '#4A90E2',
+		backgroundColor: '#f0f7ff',
+	},
+	streamModeText: {
+		fontSize: 13,
+		fontWeight: '600',
+		color: '#333',
+	},
+	streamModeTextSelected: {
+		color: '#4A90E2',
+	},
 	footer: {
 		padding: 20,
 		gap: 12,
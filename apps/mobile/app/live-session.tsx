@@ -1,5 +1,7 @@
+import { SkeletonOverlay } from '@/components/SkeletonOverlay';
 import { VideoStream } from '@/components/VideoStream';
 import { useEndSession, useExerciseStats } from '@/hooks/api';
+import type { StreamMode } from '@/hooks/landmarkPacket';
 import { useWebRTCVideoStream } from '@/hooks/useWebRTCVideoStream';
 import { router, useLocalSearchParams } from 'expo-router';
 import React, { useEffect, useRef, useState } from 'react';
@@ -12,20 +14,32 @@ export default function LiveSessionScreen() {
 		throw new Error('EXPO_PUBLIC_WS_URL is not set');
 	}
 
-	const { sessionId, exercise } = useLocalSearchParams<{
+	const {
+		sessionId,
+		exercise,
+		streamMode = 'overlay',
+	} = useLocalSearchParams<{
 		sessionId: string;
 		exercise: string;
+		streamMode?: StreamMode;
 	}>();
 
 	const sessionStartTime = useRef<Date>(new Date());
 	const [sessionDuration, setSessionDuration] = useState<string>('00:00');
 	const endSessionMutation = useEndSession();
 
-	const { repCount, plankDuration, shoulderTapCount, isConnected } = useExerciseStats();
+	const wsStats = useExerciseStats();
+	const { isConnected } = wsStats;
 
-	const { remoteStream, connectionState, webSocketState, stopVideoStream } = useWebRTCVideoStream({
-		sessionId,
-	});
+	const { remoteStream, connectionState, channelStats, landmarkFrame, webSocketState, stopVideoStream } =
+		useWebRTCVideoStream({
+			sessionId,
+		});
+
+	// Prefer stats delivered peer-to-peer over the data channel, fall back to the WebSocket relay
+	const repCount = channelStats?.rep_count ?? wsStats.repCount;
+	const plankDuration = channelStats?.plank_duration ?? wsStats.plankDuration;
+	const shoulderTapCount = channelStats?.shoulder_tap_count ?? wsStats.shoulderTapCount;
 
 	const { sendJsonMessage } = useWebSocket(process.env.EXPO_PUBLIC_WS_URL, {
 		share: true,
@@ -50,9 +64,10 @@ export default function LiveSessionScreen() {
 				type: 'session_start',
 				sessionId,
 				exercise,
+				options: { streamMode },
 			});
 		}
-	}, [webSocketState, sessionId, exercise, sendJsonMessage]);
+	}, [webSocketState, sessionId, exercise, streamMode, sendJsonMessage]);
 
 	const endSession = () => {
 		Alert.alert('End Session', 'Are you sure you want to end this session?', [
@@ -83,9 +98,12 @@ export default function LiveSessionScreen() {
 	return (
 		<View style={styles.container}>
 			<View style={styles.cameraContainer}>
-				{remoteStream ? (
+				{remoteStream || (streamMode === 'stats' && landmarkFrame) ? (
 					<View style={styles.videoContainer}>
-						<VideoStream stream={remoteStream} style={styles.videoStream} objectFit='contain' mirror={false} />
+						{remoteStream && (
+							<VideoStream stream={remoteStream} style={styles.videoStream} objectFit='contain' mirror={false} />
+						)}
+						{streamMode !== 'overlay' && <SkeletonOverlay frame={landmarkFrame} />}
 						<View style={styles.debugOverlay}>
 							<View style={styles.debugHeader}>
 								<Text style={styles.debugTitle}>{exercise}</Text>
@@ -0,0 +1,91 @@
+import { type LandmarkFrame, POSE_CONNECTIONS } from '@/hooks/landmarkPacket';
+import React, { useState } from 'react';
+import { type LayoutChangeEvent, StyleSheet, View } from 'react-native';
+
+interface SkeletonOverlayProps {
+	frame: LandmarkFrame | null;
+	visibilityThreshold?: number;
+}
+
+// Draws the pose skeleton from landmark packets on top of a 'contain'-fitted video (or an empty view)
+export function SkeletonOverlay({ frame, visibilityThreshold = 0.5 }: SkeletonOverlayProps) {
+	const [layout, setLayout] = useState({ width: 0, height: 0 });
+
+	const onLayout = (event: LayoutChangeEvent) => {
+		const { width, height } = event.nativeEvent.layout;
+		setLayout({ width, height });
+	};
+
+	if (!frame?.pose || !layout.width || !frame.width) {
+		return <View style={StyleSheet.absoluteFill} onLayout={onLayout} pointerEvents='none' />;
+	}
+
+	// Match objectFit='contain' of the video stream
+	const scale = Math.min(layout.width / frame.width, layout.height / frame.height);
+	const offsetX = (layout.width - frame.width * scale) / 2;
+	const offsetY = (layout.height - frame.height * scale) / 2;
+
+	const point = (i: number) => ({
+		x: offsetX + frame.landmarks[i * 3] * frame.width * scale,
+		y: offsetY + frame.landmarks[i * 3 + 1] * frame.height * scale,
+		visible: frame.landmarks[i * 3 + 2] >= visibilityThreshold,
+	});
+
+	const bones = POSE_CONNECTIONS.map(([a, b]) => {
+		const p1 = point(a);
+		const p2 = point(b);
+		if (!p1.visible || !p2.visible) {
+			return null;
+		}
+
+		const dx = p2.x - p1.x;
+		const dy = p2.y - p1.y;
+		const length = Math.sqrt(dx * dx + dy * dy);
+
+		return (
+			<View
+				key={`${a}-${b}`}
+				style={[
+					styles.bone,
+					{
+						left: (p1.x + p2.x) / 2 - length / 2,
+						top: (p1.y + p2.y) / 2 - 1,
+						width: length,
+						transform: [{ rotate: `${Math.atan2(dy, dx)}rad` }],
+					},
+				]}
+			/>
+		);
+	});
+
+	const joints = Array.from(new Set(POSE_CONNECTIONS.flat())).map((i) => {
+		const p = point(i);
+		if (!p.visible) {
+			return null;
+		}
+
+		return <View key={i} style={[styles.joint, { left: p.x - 4, top: p.y - 4 }]} />;
+	});
+
+	return (
+		<View style={StyleSheet.absoluteFill} onLayout={onLayout} pointerEvents='none'>
+			{bones}
+			{joints}
+		</View>
+	);
+}
+
+const styles = StyleSheet.create({
+	bone: {
+		position: 'absolute',
+		height: 2,
+		backgroundColor: '#00ff00',
+	},
+	joint: {
+		position: 'absolute',
+		width: 8,
+		height: 8,
+		borderRadius: 4,
+		backgroundColor: '#ff0000',
+	},
+});
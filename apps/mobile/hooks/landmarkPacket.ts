@@ -0,0 +1,95 @@
+// Decoder for the binary landmark packets sent by perception in landmark/stats stream modes.
+// Layout must match apps/perception/src/landmark_packet.py.
+
+export type StreamMode = 'overlay' | 'landmarks' | 'stats';
+
+export interface LandmarkFrame {
+	seq: number;
+	timestampMs: number;
+	width: number;
+	height: number;
+	pose: boolean;
+	repCount: number;
+	shoulderTapCount: number;
+	plankDuration: number;
+	angles: (number | null)[];
+	// Normalized [x, y, visibility] per landmark
+	landmarks: Float32Array;
+}
+
+const VERSION = 1;
+const FLAG_POSE = 0x01;
+const NUM_LANDMARKS = 33;
+const ANGLE_SLOTS = 6;
+const ANGLE_MISSING = 0xffff;
+const HEADER_SIZE = 34;
+const LANDMARK_SIZE = 5;
+export const PACKET_SIZE = HEADER_SIZE + NUM_LANDMARKS * LANDMARK_SIZE;
+
+// MediaPipe pose connections (body only, the face is left out)
+export const POSE_CONNECTIONS: [number, number][] = [
+	[11, 12],
+	[11, 13],
+	[13, 15],
+	[15, 17],
+	[15, 19],
+	[15, 21],
+	[17, 19],
+	[12, 14],
+	[14, 16],
+	[16, 18],
+	[16, 20],
+	[16, 22],
+	[18, 20],
+	[11, 23],
+	[12, 24],
+	[23, 24],
+	[23, 25],
+	[24, 26],
+	[25, 27],
+	[26, 28],
+	[27, 29],
+	[28, 30],
+	[29, 31],
+	[30, 32],
+	[27, 31],
+	[28, 32],
+];
+
+export function decodeLandmarkPacket(buffer: ArrayBuffer): LandmarkFrame | null {
+	if (buffer.byteLength !== PACKET_SIZE) {
+		return null;
+	}
+
+	const view = new DataView(buffer);
+	if (view.getUint8(0) !== 0x4c || view.getUint8(1) !== 0x50 || view.getUint8(2) !== VERSION) {
+		return null;
+	}
+
+	const angles: (number | null)[] = [];
+	for (let slot = 0; slot < ANGLE_SLOTS; slot++) {
+		const value = view.getUint16(22 + slot * 2, true);
+		angles.push(value === ANGLE_MISSING ? null : value / 100);
+	}
+
+	const landmarks = new Float32Array(NUM_LANDMARKS * 3);
+	for (let i = 0; i < NUM_LANDMARKS; i++) {
+		const offset = HEADER_SIZE + i * LANDMARK_SIZE;
+		landmarks[i * 3] = view.getUint16(offset, true) / 65535;
+		landmarks[i * 3 + 1] = view.getUint16(offset + 2, true) / 65535;
+		landmarks[i * 3 + 2] = view.getUint8(offset + 4) / 255;
+	}
+
+	return {
+		pose: (view.getUint8(3) & FLAG_POSE) !== 0,
+		seq: view.getUint32(4, true),
+		timestampMs: view.getUint32(8, true),
+		width: view.getUint16(12, true),
+		height: view.getUint16(14, true),
+		repCount: view.getUint16(16, true),
+		shoulderTapCount: view.getUint16(18, true),
+		plankDuration: view.getUint16(20, true) / 10,
+		angles,
+		landmarks,
+	};
+}
@@ -1,11 +1,49 @@
 import { useEffect, useRef, useState } from 'react';
 import { MediaStream, RTCIceCandidate, RTCPeerConnection, RTCSessionDescription } from 'react-native-webrtc';
 import useWebSocket, { ReadyState } from 'react-use-websocket';
+import { decodeLandmarkPacket, type LandmarkFrame } from '@/hooks/landmarkPacket';
 
 interface WebRTCVideoStreamProps {
 	sessionId: string;
 }
 
+export interface DataChannelStats {
+	exercise: string;
+	rep_count: number;
+	plank_duration: number;
+	shoulder_tap_count: number;
+	tempo?: TempoSummary;
+}
+
+// Per-rep tempo and range of motion, times in seconds and angles in degrees
+export interface RepRecord {
+	rep: number;
+	start: number;
+	end: number;
+	duration: number;
+	eccentric: number;
+	concentric: number;
+	min_angle: number;
+	range_of_motion: number;
+	depth: number | null;
+}
+
+export interface TempoSummary {
+	reps: number;
+	avg_duration?: number;
+	avg_eccentric?: number;
+	avg_range_of_motion?: number;
+}
+
+export interface RepEvent {
+	exercise: string;
+	count: number;
+	reps: RepRecord[];
+	timestamp: number;
+	// Group classes: which tracked person did the rep
+	person?: number;
+}
+
 export function useWebRTCVideoStream({ sessionId }: WebRTCVideoStreamProps) {
 	if (!process.env.EXPO_PUBLIC_WS_URL) {
 		throw new Error('EXPO_PUBLIC_WS_URL is not set');
@@ -13,6 +51,9 @@ export function useWebRTCVideoStream({ sessionId }: WebRTCVideoStreamProps) {
 
 	const [remoteStream, setRemoteStream] = useState<MediaStream | null>(null);
 	const [connectionState, setConnectionState] = useState<RTCPeerConnectionState>('new');
+	const [channelStats, setChannelStats] = useState<DataChannelStats | null>(null);
+	const [lastRepEvent, setLastRepEvent] = useState<RepEvent | null>(null);
+	const [landmarkFrame, setLandmarkFrame] = useState<LandmarkFrame | null>(null);
 
 	const pcRef = useRef<RTCPeerConnection | null>(null);
 	const peerConnectionConfig = {
@@ -67,6 +108,26 @@ export function useWebRTCVideoStream({ sessionId }: WebRTCVideoStreamProps) {
 		sendJsonMessage(message);
 	};
 
+	const handleDataChannelMessage = (raw: string) => {
+		try {
+			const data = JSON.parse(raw);
+
+			if (data.type === 'exercise_stats' && data.stats) {
+				setChannelStats(data.stats);
+			} else if (data.type === 'rep_event') {
+				setLastRepEvent({
+					exercise: data.exercise,
+					count: data.count,
+					reps: data.reps ?? [],
+					timestamp: data.timestamp,
+					...(data.person !== undefined ? { person: data.person } : {}),
+				});
+			}
+		} catch (error) {
+			console.error('Error parsing data channel message:', error);
+		}
+	};
+
 	const initializePeerConnection = () => {
 		stopPeerConnection();
 
@@ -107,6 +168,26 @@ export function useWebRTCVideoStream({ sessionId }: WebRTCVideoStreamProps) {
 			}
 		});
 
+		// Stats and rep events arrive peer-to-peer on the data channel negotiated by perception
+		// @ts-expect-error https://github.com/react-native-webrtc/react-native-webrtc/issues/1700#issue-3038071935
+		peerConnection.addEventListener('datachannel', (event: any) => {
+			const channel = event.channel;
+			if (channel.label === 'landmarks') {
+				// Binary landmark packets for client-side skeleton rendering
+				channel.addEventListener('message', (message: any) => {
+					const frame = decodeLandmarkPacket(message.data);
+					if (frame) {
+						setLandmarkFrame(frame);
+					}
+				});
+				channel.addEventListener('close', () => setLandmarkFrame(null));
+				return;
+			}
+
+			channel.addEventListener('message', (message: any) => handleDataChannelMessage(message.data));
+			channel.addEventListener('close', () => setChannelStats(null));
+		});
+
 		// Also listen for addstream as fallback
 		// @ts-expect-error https://github.com/react-native-webrtc/react-native-webrtc/issues/1700#issue-3038071935
 		peerConnection.addEventListener('addstream', (event: any) => {
@@ -177,6 +258,8 @@ export function useWebRTCVideoStream({ sessionId }: WebRTCVideoStreamProps) {
 	const stopVideoStream = () => {
 		stopPeerConnection();
 		setRemoteStream(null);
+		setChannelStats(null);
+		setLandmarkFrame(null);
 		setConnectionState('new');
 	};
 
@@ -189,6 +272,9 @@ export function useWebRTCVideoStream({ sessionId }: WebRTCVideoStreamProps) {
 	return {
 		remoteStream,
 		connectionState,
+		channelStats,
+		lastRepEvent,
+		landmarkFrame,
 		stopVideoStream,
 		webSocketState: readyState,
 		isWebSocketConnected: readyState === ReadyState.OPEN,
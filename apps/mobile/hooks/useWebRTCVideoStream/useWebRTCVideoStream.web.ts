@@ -1,11 +1,49 @@
 // Web version using browser native WebRTC APIs
 import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import useWebSocket, { ReadyState } from 'react-use-websocket';
+import { decodeLandmarkPacket, type LandmarkFrame } from '@/hooks/landmarkPacket';
 
 interface WebRTCVideoStreamProps {
 	sessionId: string;
 }
 
+export interface DataChannelStats {
+	exercise: string;
+	rep_count: number;
+	plank_duration: number;
+	shoulder_tap_count: number;
+	tempo?: TempoSummary;
+}
+
+// Per-rep tempo and range of motion, times in seconds and angles in degrees
+export interface RepRecord {
+	rep: number;
+	start: number;
+	end: number;
+	duration: number;
+	eccentric: number;
+	concentric: number;
+	min_angle: number;
+	range_of_motion: number;
+	depth: number | null;
+}
+
+export interface TempoSummary {
+	reps: number;
+	avg_duration?: number;
+	avg_eccentric?: number;
+	avg_range_of_motion?: number;
+}
+
+export interface RepEvent {
+	exercise: string;
+	count: number;
+	reps: RepRecord[];
+	timestamp: number;
+	// Group classes: which tracked person did the rep
+	person?: number;
+}
+
 export function useWebRTCVideoStream({ sessionId }: WebRTCVideoStreamProps) {
 	if (!process.env.EXPO_PUBLIC_WS_URL) {
 		throw new Error('EXPO_PUBLIC_WS_URL is not set');
@@ -14,6 +52,9 @@ export function useWebRTCVideoStream({ sessionId }: WebRTCVideoStreamProps) {
 	const [remoteStream, setRemoteStream] = useState<MediaStream | null>(null);
 	const [connectionState, setConnectionState] = useState<string>('new');
 	const [isStreaming, setIsStreaming] = useState<boolean>(false);
+	const [channelStats, setChannelStats] = useState<DataChannelStats | null>(null);
+	const [lastRepEvent, setLastRepEvent] = useState<RepEvent | null>(null);
+	const [landmarkFrame, setLandmarkFrame] = useState<LandmarkFrame | null>(null);
 	const pcRef = useRef<RTCPeerConnection | null>(null);
 	const isRegistered = useRef<boolean>(false);
 
@@ -91,6 +132,45 @@ export function useWebRTCVideoStream({ sessionId }: WebRTCVideoStreamProps) {
 			}
 		};
 
+		// Stats and rep events arrive peer-to-peer on the data channel negotiated by perception
+		pc.ondatachannel = (event) => {
+			const channel = event.channel;
+			if (channel.label === 'landmarks') {
+				// Binary landmark packets for client-side skeleton rendering
+				channel.binaryType = 'arraybuffer';
+				channel.onmessage = (message) => {
+					const frame = decodeLandmarkPacket(message.data);
+					if (frame) {
+						setLandmarkFrame(frame);
+					}
+				};
+				channel.onclose = () => setLandmarkFrame(null);
+				return;
+			}
+
+			channel.onmessage = (message) => {
+				try {
+					const data = JSON.parse(message.data);
+
+					if (data.type === 'exercise_stats' && data.stats) {
+						setChannelStats(data.stats);
+					} else if (data.type === 'rep_event') {
+						setLastRepEvent({
+							exercise: data.exercise,
+							count: data.count,
+							reps: data.reps ?? [],
+							timestamp: data.timestamp,
+							...(data.person !== undefined ? { person: data.person } : {}),
+						});
+					}
+				} catch (error) {
+					console.error('Error parsing data channel message:', error);
+				}
+			};
+			channel.onclose = () => setChannelStats(null);
+			console.log('📊 Stats data channel received');
+		};
+
 		pc.ontrack = (event) => {
 			console.log('📺 Received remote video track');
 			if (event.streams && event.streams[0]) {
@@ -177,6 +257,8 @@ export function useWebRTCVideoStream({ sessionId }: WebRTCVideoStreamProps) {
 			pcRef.current = null;
 		}
 		setRemoteStream(null);
+		setChannelStats(null);
+		setLandmarkFrame(null);
 		setIsStreaming(false);
 		setConnectionState('new');
 		console.log('🛑 Stopped video stream (web)');
@@ -191,6 +273,9 @@ export function useWebRTCVideoStream({ sessionId }: WebRTCVideoStreamProps) {
 	return {
 		remoteStream,
 		connectionState,
+		channelStats,
+		lastRepEvent,
+		landmarkFrame,
 		isStreaming,
 		startVideoStream,
 		stopVideoStream,
@@ -0,0 +1,376 @@
+"""
+Micro-benchmarks for the per-frame hot path, with a local baseline
+
+Times the geometry and drawing helpers in src/utils.py, landmark to pixel
+conversion, each exercise's draw_overlays / track_exercise /
+add_info_overlay on a fixed mid-rep pose, and the BGR to RGB conversion and
+frame wrapping in OpenCVVideoTrack.recv. Inputs are fixed (synthetic poses,
+seeded frames) so runs are comparable.
+
+Each case reports its best per-call time over several rounds. Results are
+compared against benchmarks/baseline.json; a case slower than the baseline
+by more than the threshold is timed again with more rounds, and only a case
+that is still slower is reported as a regression (exit status 1).
+
+Baselines are machine specific and not committed: the first run on a
+machine records benchmarks/baseline.json and passes, later runs compare
+against it. Record a new one with --save after an intended change. A
+reference workload is timed alongside the cases; when it runs much slower
+than at baseline time the machine is busy and the comparison is flagged as
+unreliable. It does not rescale the cases, contention slows some of them
+far more than others.
+
+    python benchmarks/bench_hot_path.py                 # compare against the baseline
+    python benchmarks/bench_hot_path.py --save          # record a new baseline
+    python benchmarks/bench_hot_path.py -k squat --threshold 0.1
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+# webrtc_streamer imports its siblings flat, as main.py sets it up
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+
+from mediapipe.framework.formats import landmark_pb2  # noqa: E402
+
+from src import utils  # noqa: E402
+from src.exercies import EXERCISE_CLASSES  # noqa: E402
+from src.exercies.ExerciseBase import ExerciseBase  # noqa: E402
+from src.synthetic_pose import SyntheticPoseGenerator  # noqa: E402
+from encoder_control import EncoderSettings  # noqa: E402
+from webrtc_streamer import OpenCVVideoTrack  # noqa: E402
+
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+WIDTH, HEIGHT = 640, 480
+
+CASES = {}
+MACHINE = "machine reference"
+
+
+def case(name):
+    """Register a benchmark: the decorated function does the setup and returns the call to time"""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def test_frame(width=WIDTH, height=HEIGHT):
+    return np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def mid_rep_landmarks(exercise: str) -> np.ndarray:
+    """Landmarks one third of the way into the first rep's descent"""
+    generator = SyntheticPoseGenerator(exercise, seed=0)
+    tempo = generator.tempo
+    t = tempo.lead_in + tempo.hold_top + tempo.down / 3
+    _, landmarks, _ = generator.generate(int(t * generator.fps) + 1)
+    return landmarks[-1]
+
+
+class Results:
+    """Stand-in for the MediaPipe Pose result, built from a landmark array"""
+
+    def __init__(self, landmarks: np.ndarray):
+        self.pose_landmarks = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z, visibility in landmarks.tolist():
+            self.pose_landmarks.landmark.add(x=x, y=y, z=z, visibility=visibility)
+
+
+# Geometry and drawing helpers
+
+@case("utils.ang")
+def bench_ang():
+    line_a, line_b = ((320, 240), (300, 330)), ((300, 330), (350, 420))
+    return lambda: utils.ang(line_a, line_b)
+
+
+@case("utils.convert_arc")
+def bench_convert_arc():
+    return lambda: utils.convert_arc((300, 330), (350, 240), sagitta=15)
+
+
+@case("utils.draw_ellipse")
+def bench_draw_ellipse():
+    image = test_frame()
+    center, radius, start, end = utils.convert_arc((300, 330), (350, 240), sagitta=15)
+    axes = (radius, radius)
+    return lambda: utils.draw_ellipse(image, center, axes, 0, start, end, (255, 255, 255), 2)
+
+
+@case("get_idx_to_coordinates")
+def bench_get_idx_to_coordinates():
+    processor = EXERCISE_CLASSES["squat"](use_pose=False)
+    image = test_frame()
+    results = Results(mid_rep_landmarks("squat"))
+    return lambda: processor.get_idx_to_coordinates(image, results)
+
+
+@case("landmarks_to_coordinates")
+def bench_landmarks_to_coordinates():
+    landmarks = mid_rep_landmarks("squat")
+    return lambda: ExerciseBase.landmarks_to_coordinates(landmarks, WIDTH, HEIGHT)
+
+
+# Per-exercise tracking and overlays
+
+def exercise_setup(exercise: str):
+    """Processor with metrics computed for a fixed mid-rep pose, plus a frame to draw on"""
+    landmarks = mid_rep_landmarks(exercise)
+    processor = EXERCISE_CLASSES[exercise](use_pose=False)
+    processor.process_landmarks(landmarks, WIDTH, HEIGHT, timestamp=0.0)
+    return processor, landmarks, Results(landmarks), test_frame()
+
+
+def register_exercise_cases(exercise: str):
+    @case(f"{exercise}.draw_overlays")
+    def bench_draw_overlays():
+        processor, _, results, image = exercise_setup(exercise)
+        return lambda: processor.draw_overlays(image, results)
+
+    @case(f"{exercise}.track_exercise")
+    def bench_track_exercise():
+        processor, landmarks, _, _ = exercise_setup(exercise)
+        return lambda: processor.track_exercise(landmarks)
+
+    @case(f"{exercise}.add_info_overlay")
+    def bench_add_info_overlay():
+        processor, _, _, image = exercise_setup(exercise)
+        return lambda: processor.add_info_overlay(image)
+
+
+for _exercise in EXERCISE_CLASSES:
+    register_exercise_cases(_exercise)
+
+
+# Outgoing video conversion
+
+class StillSource:
+    """Frame source that reports a new frame on every call"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.seq = 0
+
+    def get_frame(self):
+        self.seq += 1
+        return True, self.frame, time.monotonic(), self.seq
+
+
+class UnpacedTrack(OpenCVVideoTrack):
+    """recv without the frame-rate pacing, so only the conversion is timed"""
+
+    async def wait_for_slot(self):
+        return
+
+
+def run_now(coroutine):
+    """Drive a coroutine that never suspends to completion"""
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("coroutine suspended")
+
+
+def recv_case(width: int, height: int):
+    track = UnpacedTrack(StillSource(test_frame(width, height)), EncoderSettings())
+    return lambda: run_now(track.recv())
+
+
+@case("recv.640x480")
+def bench_recv_vga():
+    return recv_case(640, 480)
+
+
+@case("recv.1280x720_downscaled")
+def bench_recv_hd():
+    return recv_case(1280, 720)
+
+
+@case("cvtColor.BGR2RGB_640x480")
+def bench_bgr_to_rgb():
+    frame = test_frame()
+    return lambda: cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+@case("cvtColor.RGB2BGR_640x480")
+def bench_rgb_to_bgr():
+    frame = test_frame()
+    return lambda: cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+
+
+# Runner
+
+def calibrate(fn, min_time: float) -> int:
+    """Loop count that makes one timing round last at least min_time"""
+    fn()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return loops
+        loops *= 2 if elapsed <= 0 else max(2, int(min_time / elapsed * 1.2))
+
+
+def time_round(fn, loops: int) -> float:
+    """Per-call time in microseconds over one round"""
+    start = time.perf_counter()
+    for _ in range(loops):
+        fn()
+    return (time.perf_counter() - start) / loops * 1e6
+
+
+def run_cases(cases: dict, rounds: int, min_time: float) -> dict:
+    """Best per-call time of each case, in microseconds
+
+    Rounds go through all cases in turn rather than repeating one case
+    back to back, so a burst of load on the machine hits one round of
+    many cases instead of every round of one case.
+    """
+    calls = {name: setup() for name, setup in cases.items()}
+    loops = {name: calibrate(fn, min_time) for name, fn in calls.items()}
+    best = {name: float("inf") for name in calls}
+    for _ in range(rounds):
+        for name, fn in calls.items():
+            best[name] = min(best[name], time_round(fn, loops[name]))
+    return best
+
+
+def machine_reference():
+    """Fixed mix of interpreter and OpenCV work, timed in every round
+
+    Shared and throttled CPUs drift by tens of percent between runs; how
+    far this reference moved tells whether today's numbers can be trusted.
+    """
+    frame = test_frame(320, 240)
+    values = list(range(200))
+
+    def reference():
+        total = 0
+        for v in values:
+            total += v * v
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        cv2.line(frame, (0, 0), (319, 239), (255, 255, 255), 2)
+        return total
+
+    return reference
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_baseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filter", help="only run cases whose name contains this")
+    parser.add_argument("--save", action="store_true", help="record the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown over the baseline, as a fraction (default 0.2)")
+    parser.add_argument("--min-delta", type=float, default=0.5,
+                        help="ignore slowdowns smaller than this many microseconds (timer noise)")
+    parser.add_argument("--rounds", type=int, default=9)
+    parser.add_argument("--recheck-rounds", type=int, default=27,
+                        help="rounds for timing a case again before reporting it")
+    parser.add_argument("--min-time", type=float, default=0.02, help="seconds per case per round")
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    # Processors log on every construction
+    logging.disable(logging.INFO)
+    baseline = load_baseline(args.baseline)
+    reference = baseline.get("results", {})
+    reference_speed = baseline.get("reference")
+    if reference and baseline.get("environment") != environment():
+        print(f"⚠️ Baseline was recorded on {baseline.get('environment')}, comparisons may not hold")
+
+    cases = {name: setup for name, setup in CASES.items() if not args.filter or args.filter in name}
+    cases[MACHINE] = machine_reference
+    results = run_cases(cases, args.rounds, args.min_time)
+    speed = results.pop(MACHINE)
+
+    def slower(name: str, us: float) -> bool:
+        old = reference[name]
+        return us / old - 1 > args.threshold and us - old > args.min_delta
+
+    # Timing noise comes in bursts: a case over the threshold gets a longer second run
+    suspects = {name: CASES[name] for name, us in results.items()
+                if not args.save and name in reference and slower(name, us)}
+    if suspects:
+        print(f"⏳ Timing {len(suspects)} case(s) again: {', '.join(suspects)}")
+        for name, us in run_cases(suspects, args.recheck_rounds, args.min_time).items():
+            results[name] = min(results[name], us)
+
+    # How much slower the machine itself is running than when the baseline was taken
+    drift = speed / reference_speed if reference_speed else 1.0
+    print(f"machine reference {speed:.2f} us, {drift:.2f}x the baseline's")
+    if drift > 1 + args.threshold:
+        print("⚠️ The machine is much busier than when the baseline was recorded, regressions may be noise")
+
+    regressions = []
+    print(f"{'case':<34}{'time':>12}{'baseline':>12}{'change':>9}")
+    for name, us in results.items():
+        old = reference.get(name)
+        if old is None:
+            print(f"{name:<34}{us:>9.2f} us{'-':>12}{'new':>9}")
+            continue
+
+        change = us / old - 1
+        regressed = slower(name, us)
+        flag = "  ❌ REGRESSION" if regressed else ""
+        print(f"{name:<34}{us:>9.2f} us{old:>9.2f} us{change:>+8.0%}{flag}")
+        if regressed:
+            regressions.append((name, old, us, change))
+
+    if args.save or not reference:
+        # A filtered run only replaces the cases it ran
+        merged = dict(reference)
+        merged.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": environment(), "results": merged, "reference": speed},
+                      f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"💾 Baseline saved to {args.baseline} ({len(results)} cases)"
+              + ("" if args.save else ", later runs compare against it"))
+        return 0
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} hot-path regression(s) over {args.threshold:.0%}:")
+        for name, old, us, change in regressions:
+            print(f"   {name}: {old:.2f} us -> {us:.2f} us ({change:+.0%})")
+        return 1
+
+    print(f"\n✅ No case slower than the baseline by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Overlay text drawing: cv2.putText vs the cached text sprites
+
+Draws the text of a squat frame onto a 640x480 frame and reports the time
+per frame for each renderer: the info panel and state labels, the joint
+angle labels, and both together.
+
+    python benchmarks/bench_text.py [iterations]
+"""
+
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.text_renderer import put_text  # noqa: E402
+
+
+# Joint angles as a real session produces them: new 2-decimal values nearly every frame
+ANGLES = np.round(np.random.default_rng(0).uniform(60, 180, (4096, 5)), 2)
+
+
+def angle_labels(draw, image, i):
+    """Five joint-angle labels, fresh values every frame"""
+    angles = ANGLES[i % len(ANGLES)]
+    for n, (x, y) in enumerate([(320, 300), (280, 300), (360, 200), (260, 200), (330, 240)]):
+        draw(image, str(angles[n]), (x, y),
+             fontFace=cv2.FONT_HERSHEY_SIMPLEX, fontScale=0.6, color=(0, 255, 0), thickness=2)
+
+
+def panel_text(draw, image, i):
+    """Info panel, depth and state labels: fixed text and slowly changing counters"""
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    draw(image, f"Depth: {i % 80:.0f}px (PARTIAL)", (330, 230), font, 0.6, (0, 165, 255), 2)
+    draw(image, "SQUAT", (20, 40), font, 0.8, (0, 255, 0), 2)
+    draw(image, "Reps: ", (20, 70), font, 0.7, (255, 255, 255), 2)
+    draw(image, f"{i // 30}", (100, 70), font, 1.0, (0, 255, 255), 3)
+    draw(image, f"Set: {i // 300 + 1}", (200, 70), font, 0.6, (255, 255, 255), 1)
+    draw(image, "WebRTC Live", (40, 110), font, 0.5, (0, 255, 0), 1)
+    draw(image, "IN POSITION", (270, 100), font, 0.8, (0, 255, 0), 2)
+
+
+def squat_frame(draw, image, i):
+    angle_labels(draw, image, i)
+    panel_text(draw, image, i)
+
+
+def bench(workload, draw, iterations):
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    # Warm up (fills the sprite cache)
+    for i in range(50):
+        workload(draw, image, i)
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        workload(draw, image, i)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'workload':<14}{'cv2.putText':>14}{'sprite cache':>14}{'speedup':>10}")
+    for workload in (panel_text, angle_labels, squat_frame):
+        baseline = bench(workload, cv2.putText, iterations)
+        cached = bench(workload, put_text, iterations)
+        print(f"{workload.__name__:<14}{baseline:>11.1f} us{cached:>11.1f} us{baseline / cached:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""
+Capacity load test: how many concurrent sessions one box sustains
+
+Starts the signaling stand-in (benchmarks/signaling_standin.py), one
+perception app per session (``main.py`` in its own process, reading a video
+file through CAMERA_SOURCE instead of a camera) and one simulated phone per
+session. Phones speak the mobile app's protocol: register for the session,
+send ``session_start``, answer the perception app's offer with aiortc and
+consume the video track and data channels.
+
+Sessions ramp up in steps; each step settles, then measures for a window
+and reports per session: received video FPS (landmark packets per second in
+landmarks and stats mode, where that is the analysis rate and the capacity
+measure; stats mode sends no video), worst frame gap, stats
+delivery delay (perception timestamp to phone), session startup time, and
+CPU of the perception process. Phones run in this process, their decoding
+CPU is reported separately since it competes for the same box.
+
+--pose-backend worker runs each app's pose inference in a worker process
+fed from the shared frame ring (src/pose_worker.py); the worker's CPU is
+counted with its app.
+
+--frame-marker asks the perception apps to stamp each frame's capture time
+into the video (src/frame_latency.py); phones decode it from every new frame
+and report glass-to-glass latency, capture to decoded on the phone. Phones
+and apps share this machine's clock, so no clock sync is needed.
+
+    python benchmarks/load_test.py [--ramp 1,2,4,8] [--video clip.mp4]
+        [--exercise squat] [--duration 20] [--settle 8] [--stream-mode overlay]
+        [--frame-marker] [--pose-backend worker]
+
+Without --video a short synthetic clip is rendered first; a real recording
+of someone exercising exercises the trackers and overlays more fully. CPU
+figures come from /proc (Linux).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+import websockets
+from aiortc import RTCPeerConnection, RTCSessionDescription
+from aiortc.sdp import candidate_from_sdp
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(HERE, "..")
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, HERE)
+
+from signaling_standin import SignalingStandIn  # noqa: E402
+from src.frame_latency import read_frame_marker  # noqa: E402
+from src.synthetic_pose import SyntheticPoseGenerator  # noqa: E402
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def nan_safe(reduce, values) -> float:
+    """reduce() over the values that are not NaN, NaN when there are none"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    return float(reduce(values)) if len(values) else float("nan")
+
+
+def p50(values):
+    return np.percentile(values, 50)
+
+
+def p95(values):
+    return np.percentile(values, 95)
+
+
+def cpu_seconds(pid: int) -> float:
+    """User + system CPU time of a process and its threads"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def child_pids(pid: int) -> List[int]:
+    """Direct children of a process (worker processes an app spawned)"""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def render_clip(path: str, exercise: str, seconds: float = 12, fps: int = 30):
+    """Render a synthetic figure doing the exercise, as a stand-in camera feed"""
+    generator = SyntheticPoseGenerator(exercise, fps=fps, seed=0)
+    _, landmarks, _ = generator.generate(int(seconds * fps))
+    width, height = 640, 480
+    limbs = [(11, 13), (13, 15), (12, 14), (14, 16), (11, 12), (11, 23), (12, 24), (23, 24),
+             (23, 25), (25, 27), (24, 26), (26, 28), (27, 31), (28, 32)]
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    background = np.full((height, width, 3), (90, 110, 120), dtype=np.uint8)
+    for frame_landmarks in landmarks:
+        frame = background.copy()
+        px = (frame_landmarks[:, :2] * (width, height)).astype(int)
+        for a, b in limbs:
+            cv2.line(frame, tuple(px[a]), tuple(px[b]), (60, 90, 170), 18, cv2.LINE_AA)
+        cv2.circle(frame, tuple(px[0]), 26, (120, 160, 210), -1, cv2.LINE_AA)
+        writer.write(frame)
+    writer.release()
+
+
+class PerceptionProcess:
+    """One perception app (main.py) fed from a video file"""
+
+    def __init__(self, index: int, ws_url: str, video: str, exercise: str, log_dir: str,
+                 pose_backend: Optional[str] = None):
+        env = dict(os.environ)
+        env.update({
+            "WS_URL": ws_url,
+            "CAMERA_SOURCE": video,
+            "STANDBY": "1",
+            "STANDBY_EXERCISES": exercise,
+            "RECORD_SESSIONS": "0",
+            "FRAME_RING_NAME": "",
+        })
+        if pose_backend:
+            env["POSE_BACKEND"] = pose_backend
+            if pose_backend == "worker":
+                # One ring per app, the workers read their own app's camera
+                env["FRAME_RING_NAME"] = f"perception-load-{os.getpid()}-{index}"
+        self.log_path = os.path.join(log_dir, f"perception-{index}.log")
+        self.log = open(self.log_path, "w")
+        self.process = subprocess.Popen([sys.executable, "main.py"], cwd=APP_DIR, env=env,
+                                        stdout=self.log, stderr=subprocess.STDOUT)
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def cpu(self) -> float:
+        """CPU seconds of the app and the worker processes it started"""
+        total = 0.0
+        for pid in [self.pid] + child_pids(self.pid):
+            try:
+                total += cpu_seconds(pid)
+            except (FileNotFoundError, ProcessLookupError):
+                pass
+        return total
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.log.close()
+
+
+class SimulatedPhone:
+    """Mobile client for one session: starts it, answers the offer, consumes media"""
+
+    def __init__(self, ws_url: str, session_id: str, exercise: str, options: dict):
+        self.ws_url = ws_url
+        self.session_id = session_id
+        self.exercise = exercise
+        self.options = options
+        self.ws = None
+        self.pc: Optional[RTCPeerConnection] = None
+        self.tasks: List[asyncio.Task] = []
+
+        self.started_at = 0.0
+        self.first_frame_ms: Optional[float] = None
+        self.startup_ms: Optional[float] = None
+        self.reset()
+
+    def reset(self):
+        """Start a new measurement window"""
+        self.window_start = time.monotonic()
+        self.frame_times: List[float] = []
+        self.stats_delays: List[float] = []
+        self.landmark_packets = 0
+        self.rep_count = 0
+        self.glass_ms: List[float] = []
+        self.last_marker_seq = None
+
+    async def start(self):
+        self.ws = await websockets.connect(self.ws_url, max_size=None)
+        self.tasks.append(asyncio.create_task(self.read_signaling()))
+        await self.send({"type": "register", "sessionId": self.session_id, "role": "mobile"})
+        self.started_at = time.monotonic()
+        await self.send({"type": "session_start", "sessionId": self.session_id, "exercise": self.exercise,
+                         "memberId": f"load-{self.session_id}", "options": self.options})
+
+    async def send(self, message: dict):
+        await self.ws.send(json.dumps(message))
+
+    async def read_signaling(self):
+        try:
+            async for raw in self.ws:
+                data = json.loads(raw)
+                msg_type = data.get("type")
+                if msg_type == "webrtc_signaling" and data.get("fromRole") == "perception":
+                    await self.handle_signaling(data.get("signaling") or {})
+                elif msg_type == "session_ready":
+                    self.startup_ms = data.get("startupMs")
+                else:
+                    self.handle_stats(data)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    async def handle_signaling(self, signaling: dict):
+        signal_type, data = signaling.get("type"), signaling.get("data") or {}
+        if signal_type == "offer":
+            if self.pc:
+                await self.pc.close()
+            self.pc = RTCPeerConnection()
+            self.pc.on("track", self.on_track)
+            self.pc.on("datachannel", self.on_datachannel)
+            await self.pc.setRemoteDescription(RTCSessionDescription(sdp=data["sdp"], type=data["type"]))
+            answer = await self.pc.createAnswer()
+            await self.pc.setLocalDescription(answer)
+            await self.send({
+                "type": "webrtc_signaling", "targetRole": "perception",
+                "signaling": {"type": "answer", "data": {"type": answer.type, "sdp": self.pc.localDescription.sdp}},
+            })
+        elif signal_type == "ice-candidate" and self.pc and data.get("candidate"):
+            candidate = candidate_from_sdp(data["candidate"])
+            candidate.sdpMid = data.get("sdpMid")
+            candidate.sdpMLineIndex = data.get("sdpMLineIndex")
+            await self.pc.addIceCandidate(candidate)
+
+    def on_track(self, track):
+        if track.kind == "video":
+            self.tasks.append(asyncio.create_task(self.consume(track)))
+
+    def on_datachannel(self, channel):
+        if channel.label == "landmarks":
+            @channel.on("message")
+            def on_packet(_):
+                self.landmark_packets += 1
+        else:
+            @channel.on("message")
+            def on_message(raw):
+                self.handle_stats(json.loads(raw))
+
+    def handle_stats(self, data: dict):
+        """exercise_stats/rep_event over the data channel or the server fallback"""
+        if data.get("type") not in ("exercise_stats", "rep_event"):
+            return
+        # Perception stamps time.time() when sending; the server keeps it as sentAt
+        sent = data.get("sentAt", data.get("timestamp"))
+        if isinstance(sent, (int, float)):
+            self.stats_delays.append((time.time() - sent) * 1000)
+        if data.get("type") == "rep_event":
+            self.rep_count = data.get("count", self.rep_count)
+
+    async def consume(self, track):
+        try:
+            while True:
+                frame = await track.recv()
+                now = time.monotonic()
+                if self.first_frame_ms is None:
+                    self.first_frame_ms = (now - self.started_at) * 1000
+                self.frame_times.append(now)
+                if self.options.get("frameMarker"):
+                    self.read_marker(frame)
+        except Exception:
+            pass
+
+    def read_marker(self, frame):
+        marker = read_frame_marker(frame.to_ndarray(format="gray"))
+        # Repeated frames keep their marker, only count each one the first time
+        if marker and marker[0] != self.last_marker_seq:
+            self.last_marker_seq = marker[0]
+            now_ms = int(time.time() * 1000) & 0xFFFFFFFF
+            self.glass_ms.append((now_ms - marker[1]) & 0xFFFFFFFF)
+
+    def window(self) -> Dict:
+        elapsed = time.monotonic() - self.window_start
+        gaps = np.diff(self.frame_times) * 1000
+        return {
+            "fps": len(self.frame_times) / elapsed if elapsed > 0 else 0.0,
+            "max_gap_ms": nan_safe(np.max, gaps),
+            "p95_gap_ms": nan_safe(p95, gaps),
+            "stats_p50_ms": nan_safe(p50, self.stats_delays),
+            "stats_p95_ms": nan_safe(p95, self.stats_delays),
+            "landmark_pps": self.landmark_packets / elapsed if elapsed > 0 else 0.0,
+            "glass_p50_ms": nan_safe(p50, self.glass_ms),
+            "glass_p95_ms": nan_safe(p95, self.glass_ms),
+        }
+
+    async def stop(self):
+        try:
+            await self.send({"type": "session_end", "sessionId": self.session_id})
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        for task in self.tasks:
+            task.cancel()
+        if self.pc:
+            await self.pc.close()
+        await self.ws.close()
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.standin = SignalingStandIn()
+        self.processes: List[PerceptionProcess] = []
+        self.phones: List[SimulatedPhone] = []
+        self.log_dir = args.log_dir or tempfile.mkdtemp(prefix="perception-load-")
+
+    def idle_perception(self) -> int:
+        return sum(1 for c in self.standin.connections.values() if c.role == "perception" and not c.session_id)
+
+    async def add_perception(self, count: int, video: str):
+        """Start perception apps and wait until they are warm and registered"""
+        for _ in range(count):
+            self.processes.append(PerceptionProcess(len(self.processes), self.standin.url, video,
+                                                    self.args.exercise, self.log_dir, self.args.pose_backend))
+        deadline = time.monotonic() + self.args.startup_timeout
+        while self.idle_perception() < count:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Perception apps did not register in time, see logs in {self.log_dir}")
+            await asyncio.sleep(0.2)
+
+    async def add_sessions(self, count: int):
+        options = {"streamMode": self.args.stream_mode, "frameMarker": self.args.frame_marker}
+        for _ in range(count):
+            phone = SimulatedPhone(self.standin.url, f"load-{len(self.phones) + 1}", self.args.exercise, options)
+            self.phones.append(phone)
+            await phone.start()
+
+    async def run(self):
+        args = self.args
+        video = args.video
+        if not video:
+            video = os.path.join(self.log_dir, f"{args.exercise}.mp4")
+            render_clip(video, args.exercise)
+        print(f"Logs and clip in {self.log_dir}, video source {video}")
+
+        await self.standin.start()
+        self.print_header()
+        rows = []
+        try:
+            for sessions in args.ramp:
+                new = sessions - len(self.phones)
+                if new <= 0:
+                    continue
+                await self.add_perception(new, video)
+                await self.add_sessions(new)
+                await asyncio.sleep(args.settle)
+                rows.append(await self.measure(sessions))
+                self.print_row(rows[-1])
+        finally:
+            for phone in self.phones:
+                await phone.stop()
+            await asyncio.sleep(0.5)
+            # Off the event loop: the apps' shutdown still talks to the stand-in running on it
+            await asyncio.gather(*(asyncio.to_thread(process.stop) for process in self.processes))
+            await self.standin.stop()
+
+        self.print_summary(rows)
+
+    async def measure(self, sessions: int) -> Dict:
+        for phone in self.phones:
+            phone.reset()
+        cpu_before = [p.cpu() for p in self.processes]
+        own_before = cpu_seconds(os.getpid())
+        wall = time.monotonic()
+
+        await asyncio.sleep(self.args.duration)
+
+        wall = time.monotonic() - wall
+        cpu = [(p.cpu() - before) / wall * 100 for p, before in zip(self.processes, cpu_before)]
+        own = (cpu_seconds(os.getpid()) - own_before) / wall * 100
+        windows = [phone.window() for phone in self.phones]
+        startup = [p.startup_ms for p in self.phones if p.startup_ms is not None]
+        first_frame = [p.first_frame_ms for p in self.phones if p.first_frame_ms is not None]
+
+        def column(key):
+            return np.array([w[key] for w in windows], dtype=float)
+
+        return {
+            "sessions": sessions,
+            "fps_mean": float(np.mean(column("fps"))),
+            "fps_min": float(np.min(column("fps"))),
+            "pps_mean": float(np.mean(column("landmark_pps"))),
+            "pps_min": float(np.min(column("landmark_pps"))),
+            "gap_p95_ms": nan_safe(np.max, column("p95_gap_ms")),
+            "gap_max_ms": nan_safe(np.max, column("max_gap_ms")),
+            "stats_p50_ms": nan_safe(np.median, column("stats_p50_ms")),
+            "stats_p95_ms": nan_safe(np.max, column("stats_p95_ms")),
+            "glass_p50_ms": nan_safe(np.median, column("glass_p50_ms")),
+            "glass_p95_ms": nan_safe(np.max, column("glass_p95_ms")),
+            "startup_ms": float(np.max(startup)) if startup else float("nan"),
+            "first_frame_ms": float(np.max(first_frame)) if first_frame else float("nan"),
+            "cpu_per_session": float(np.mean(cpu)),
+            "cpu_total": float(np.sum(cpu)),
+            "phones_cpu": own,
+            "load": os.getloadavg()[0],
+        }
+
+    @property
+    def packets_mode(self) -> bool:
+        """Landmark packets, one per analysed frame, measure capacity instead of video"""
+        return self.args.stream_mode != "overlay"
+
+    def print_header(self):
+        glass = f" {'g2g p50':>8} {'g2g p95':>8}" if self.args.frame_marker else ""
+        packets = f" {'pps avg':>8} {'pps min':>8}" if self.packets_mode else ""
+        print(f"{'sessions':>8} {'fps avg':>8} {'fps min':>8}{packets} {'gap p95':>8} {'gap max':>8} "
+              f"{'stats p50':>10} {'stats p95':>10} {'startup':>8} {'1st frame':>10} "
+              f"{'cpu/sess':>9} {'cpu all':>8} {'phones':>7} {'load':>5}{glass}")
+
+    def print_row(self, r: Dict):
+        glass = f" {r['glass_p50_ms']:>6.0f}ms {r['glass_p95_ms']:>6.0f}ms" if self.args.frame_marker else ""
+        packets = f" {r['pps_mean']:>8.1f} {r['pps_min']:>8.1f}" if self.packets_mode else ""
+        print(f"{r['sessions']:>8} {r['fps_mean']:>8.1f} {r['fps_min']:>8.1f}{packets} {r['gap_p95_ms']:>6.0f}ms "
+              f"{r['gap_max_ms']:>6.0f}ms {r['stats_p50_ms']:>8.1f}ms {r['stats_p95_ms']:>8.1f}ms "
+              f"{r['startup_ms']:>6.0f}ms {r['first_frame_ms']:>8.0f}ms {r['cpu_per_session']:>8.0f}% "
+              f"{r['cpu_total']:>7.0f}% {r['phones_cpu']:>6.0f}% {r['load']:>5.1f}{glass}", flush=True)
+
+    def print_summary(self, rows: List[Dict]):
+        target = self.args.target_fps
+        rate, unit = ("pps_min", "landmark packets/s") if self.packets_mode else ("fps_min", "fps")
+        sustained = [r["sessions"] for r in rows if r[rate] >= target]
+        cores = os.cpu_count()
+        if sustained:
+            print(f"\n✅ Up to {max(sustained)} concurrent sessions held >= {target:g} {unit} per session "
+                  f"on {cores} CPU(s)")
+        else:
+            print(f"\n❌ No step held >= {target:g} {unit} per session on {cores} CPU(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ramp", default="1,2,4,8",
+                        type=lambda s: sorted({int(n) for n in s.split(",") if n}),
+                        help="session counts to step through")
+    parser.add_argument("--video", help="video file the perception apps read instead of a camera")
+    parser.add_argument("--exercise", default="squat")
+    parser.add_argument("--pose-backend", choices=("legacy", "tasks", "worker"),
+                        help="POSE_BACKEND for the perception apps (default: their environment's)")
+    parser.add_argument("--stream-mode", default="overlay", choices=("overlay", "landmarks", "stats"))
+    parser.add_argument("--frame-marker", action="store_true",
+                        help="stamp capture times into the video and report glass-to-glass latency")
+    parser.add_argument("--duration", type=float, default=20, help="measurement window per step, seconds")
+    parser.add_argument("--settle", type=float, default=8, help="seconds to let new sessions settle")
+    parser.add_argument("--target-fps", type=float, default=24, help="per-session FPS (packets/s in landmarks and stats mode) that counts as sustained")
+    parser.add_argument("--startup-timeout", type=float, default=60)
+    parser.add_argument("--log-dir", help="where perception logs (and the synthetic clip) go")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(LoadTest(args).run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Local Python stand-in for the Node signaling server (packages/api/src/server/websocket.ts)
+
+Speaks the same JSON protocol: ``connected`` on connect, ``register`` with
+role and session, ``client_registered`` to the rest of the session,
+``webrtc_signaling`` routed by target role / client id with ``fromRole`` and
+``fromClientId``, ``session_start`` / ``session_end`` to perception clients,
+``exercise_stats`` / ``rep_event`` / ``session_ready`` forwarded to the
+session's mobiles, and any other message type broadcast to every client.
+
+One difference: the Node server hands ``session_start`` to every perception
+client, which only works with one perception app per server. To host many
+sessions on one box, the stand-in gives each ``session_start`` to a single
+perception client that has no session yet.
+
+    python benchmarks/signaling_standin.py [--port 3001]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import secrets
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+import websockets
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+@dataclass
+class Connection:
+    ws: object
+    session_id: Optional[str] = None
+    role: Optional[str] = None
+
+
+class SignalingStandIn:
+    """In-process signaling server for load tests
+
+    ``on_message`` (optional) sees every parsed message as
+    ``(client_id, connection, message)`` before it is routed, so a test
+    harness can observe traffic such as ``session_ready`` without joining a
+    session.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 on_message: Optional[Callable[[str, Connection, dict], None]] = None):
+        self.host = host
+        self.port = port
+        self.on_message = on_message
+        self.connections: Dict[str, Connection] = {}
+        self.server = None
+        self.messages = 0
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        self.server = await websockets.serve(self.handle_connection, self.host, self.port, max_size=None)
+        # Port 0 picks a free port
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"📡 Signaling stand-in listening on {self.url}")
+        return self
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def handle_connection(self, ws):
+        client_id = secrets.token_hex(5)[:9]
+        connection = self.connections[client_id] = Connection(ws)
+        await self.send(connection, {"type": "connected", "timestamp": _now(),
+                                     "message": "WebSocket connected", "clientId": client_id})
+        try:
+            async for raw in ws:
+                try:
+                    message = json.loads(raw)
+                except ValueError as e:
+                    logger.error(f"Failed to parse message from {client_id}: {e}")
+                    continue
+                self.messages += 1
+                if self.on_message:
+                    self.on_message(client_id, connection, message)
+                await self.route(client_id, connection, message)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            self.connections.pop(client_id, None)
+
+    async def send(self, connection: Connection, message: dict):
+        try:
+            await connection.ws.send(json.dumps(message))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    async def route(self, client_id: str, connection: Connection, message: dict):
+        msg_type = message.get("type")
+
+        if msg_type == "register":
+            connection.session_id = message.get("sessionId")
+            connection.role = message.get("role")
+            if connection.session_id:
+                await self.to_session(connection.session_id, {
+                    "type": "client_registered", "clientId": client_id, "role": connection.role,
+                    "options": message.get("options"), "timestamp": _now(),
+                }, exclude=client_id)
+
+        elif msg_type == "webrtc_signaling":
+            if not connection.session_id:
+                return
+            target_role, target_id = message.get("targetRole"), message.get("targetClientId")
+            for other_id, other in self.connections.items():
+                if (other_id != client_id and other.session_id == connection.session_id
+                        and other.role == target_role and (not target_id or other_id == target_id)):
+                    await self.send(other, {
+                        "type": "webrtc_signaling", "fromRole": connection.role, "fromClientId": client_id,
+                        "signaling": message.get("signaling"), "timestamp": _now(),
+                    })
+                    return
+            logger.warning(f"No {target_role} client found in session {connection.session_id}")
+
+        elif msg_type == "session_start":
+            idle = [c for c in self.connections.values() if c.role == "perception" and not c.session_id]
+            if not idle:
+                logger.warning(f"No idle perception client for session {message.get('sessionId')}")
+                return
+            perception = idle[0]
+            # Claim it now, the app registers for the session once it has started
+            perception.session_id = message.get("sessionId")
+            await self.send(perception, {
+                "type": "session_start", "sessionId": message.get("sessionId"),
+                "exercise": message.get("exercise"), "memberId": message.get("memberId"),
+                "options": message.get("options"), "timestamp": _now(),
+            })
+
+        elif msg_type == "session_end":
+            session_id = message.get("sessionId")
+            for other in list(self.connections.values()):
+                if other.role == "perception" and other.session_id == session_id:
+                    await self.send(other, {"type": "session_end", "sessionId": session_id, "timestamp": _now()})
+
+        elif msg_type in ("exercise_stats", "rep_event", "session_ready"):
+            if connection.session_id:
+                forwarded = {key: value for key, value in message.items() if key != "timestamp"}
+                # Keep the sender's timestamp so receivers can measure delivery delay
+                forwarded["sentAt"] = message.get("timestamp")
+                forwarded["timestamp"] = _now()
+                await self.to_mobiles(message.get("sessionId"), forwarded)
+
+        else:
+            # Anything else goes to everyone, like the Node server's legacy handling
+            broadcast = {**message, "timestamp": _now(), "fromClient": client_id}
+            for other in list(self.connections.values()):
+                await self.send(other, broadcast)
+
+    async def to_session(self, session_id: str, message: dict, exclude: Optional[str] = None):
+        for other_id, other in list(self.connections.items()):
+            if other.session_id == session_id and other_id != exclude:
+                await self.send(other, message)
+
+    async def to_mobiles(self, session_id: str, message: dict):
+        for other in list(self.connections.values()):
+            if other.role == "mobile" and other.session_id == session_id:
+                await self.send(other, message)
+
+
+async def serve(port: int):
+    standin = await SignalingStandIn(host="0.0.0.0", port=port).start()
+    try:
+        await asyncio.Future()
+    finally:
+        await standin.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=3001)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(serve(args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Soak test: cycle sessions through one perception app and flag memory growth
+
+Runs the perception app (``main.py``, reading a video file) against the
+signaling stand-in and starts and ends sessions back to back with a
+simulated phone, each session streaming for a few seconds. After every
+session the app sends a ``memory_report`` (see src/memory_tracker.py,
+turned on here with MEMORY_REPORTS=1); the soak test collects them and,
+after a few warm-up cycles, checks:
+
+  - RSS growth since the end of warm-up stays within --max-growth-mb
+  - live per-session objects (peer connections, tracks, producers...) do
+    not accumulate from cycle to cycle
+
+Exits with status 1 if either is exceeded.
+
+    python benchmarks/soak_test.py [--cycles 50] [--hold 4] [--max-growth-mb 30] [--trace]
+
+--trace turns on tracemalloc in the app (MEMORY_TRACE=1) so its log shows
+the Python allocation sites that grew in each session.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from load_test import PerceptionProcess, SimulatedPhone, render_clip  # noqa: E402
+from signaling_standin import SignalingStandIn  # noqa: E402
+
+MB = 1024 * 1024
+
+
+class SoakTest:
+    def __init__(self, args):
+        self.args = args
+        self.reports: Dict[str, dict] = {}
+        self.arrived = asyncio.Event()
+        self.standin = SignalingStandIn(on_message=self.on_message)
+        self.log_dir = args.log_dir or tempfile.mkdtemp(prefix="perception-soak-")
+
+    def on_message(self, client_id, connection, message):
+        if message.get("type") == "memory_report":
+            self.reports[message.get("sessionId")] = message
+            self.arrived.set()
+
+    async def wait_report(self, session_id: str, timeout: float = 30):
+        deadline = time.monotonic() + timeout
+        while session_id not in self.reports:
+            self.arrived.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError(f"No memory report for {session_id}, see logs in {self.log_dir}")
+            try:
+                await asyncio.wait_for(self.arrived.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        return self.reports[session_id]
+
+    async def run(self) -> int:
+        args = self.args
+        video = args.video
+        if not video:
+            video = os.path.join(self.log_dir, f"{args.exercise}.mp4")
+            render_clip(video, args.exercise)
+        print(f"Logs and clip in {self.log_dir}")
+
+        await self.standin.start()
+        os.environ["MEMORY_REPORTS"] = "1"
+        if args.trace:
+            os.environ["MEMORY_TRACE"] = "1"
+        app = PerceptionProcess(0, self.standin.url, video, args.exercise, self.log_dir)
+        rows = []
+        try:
+            deadline = time.monotonic() + args.startup_timeout
+            while not any(c.role == "perception" for c in self.standin.connections.values()):
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Perception app did not register, see {app.log_path}")
+                await asyncio.sleep(0.2)
+
+            print(f"{'cycle':>5} {'rss':>9} {'session':>9} {'growth':>9} {'frames':>7}  live objects")
+            for cycle in range(1, args.cycles + 1):
+                session_id = f"soak-{cycle}"
+                phone = SimulatedPhone(self.standin.url, session_id, args.exercise,
+                                       {"streamMode": args.stream_mode})
+                await phone.start()
+                await asyncio.sleep(args.hold)
+                frames = len(phone.frame_times)
+                await phone.stop()
+
+                report = await self.wait_report(session_id)
+                rows.append(report)
+                live = {name: n for name, n in report["objects"].items() if n}
+                print(f"{cycle:>5} {report['rssAfter'] / MB:>7.1f}MB {report['rssDelta'] / MB:>+7.1f}MB "
+                      f"{report['rssGrowth'] / MB:>+7.1f}MB {frames:>7}  {live}", flush=True)
+        finally:
+            app.stop()
+            await self.standin.stop()
+
+        return self.verdict(rows)
+
+    def verdict(self, rows) -> int:
+        args = self.args
+        if len(rows) <= args.warmup:
+            print(f"Not enough cycles past the {args.warmup} warm-up cycles to judge")
+            return 0
+
+        measured = rows[args.warmup:]
+        rss = np.array([r["rssAfter"] for r in measured], dtype=float)
+        growth = (rss[-1] - rows[args.warmup - 1]["rssAfter"]) / MB if args.warmup else (rss[-1] - rss[0]) / MB
+        slope = np.polyfit(np.arange(len(rss)), rss, 1)[0] / 1024 if len(rss) > 1 else 0.0
+        print(f"\nRSS after warm-up: {growth:+.1f}MB over {len(measured)} cycles ({slope:+.0f}KB/cycle trend)")
+
+        failed = False
+        if growth > args.max_growth_mb:
+            print(f"❌ RSS grew {growth:.1f}MB, bound is {args.max_growth_mb:g}MB")
+            failed = True
+
+        first, last = measured[0]["objects"], measured[-1]["objects"]
+        leaked = {name: (first[name], last[name]) for name in last if last[name] > first.get(name, 0)}
+        if leaked:
+            print(f"❌ Per-session objects accumulating (first -> last measured cycle): {leaked}")
+            failed = True
+
+        if not failed:
+            print("✅ No memory growth beyond the bound, per-session objects released")
+        return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--hold", type=float, default=4, help="seconds each session streams")
+    parser.add_argument("--warmup", type=int, default=3, help="cycles before growth is measured")
+    parser.add_argument("--max-growth-mb", type=float, default=30)
+    parser.add_argument("--trace", action="store_true", help="tracemalloc allocation sites in the app log")
+    parser.add_argument("--video", help="video file the perception app reads instead of a camera")
+    parser.add_argument("--exercise", default="squat")
+    parser.add_argument("--stream-mode", default="overlay", choices=("overlay", "landmarks", "stats"))
+    parser.add_argument("--startup-timeout", type=float, default=60)
+    parser.add_argument("--log-dir", help="where the perception log (and the synthetic clip) go")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    sys.exit(asyncio.run(SoakTest(args).run()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Exercise trackers under synthetic load, no camera or MediaPipe
+
+Feeds generated landmark sequences (see src/synthetic_pose.py) straight into
+each tracker through ``process_landmarks`` and reports throughput, per-frame
+cost and how many reps were counted against how many were performed, with
+optional jitter, limb occlusion and detection dropouts.
+
+    python benchmarks/stress_trackers.py [--frames 20000] [--exercise squat]
+        [--noise 0.002] [--occlusion 0.01] [--dropout 0.02] [--tempo 1.0] [--seed 0]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.exercies import EXERCISE_CLASSES, get_exercise_processor  # noqa: E402
+from src.synthetic_pose import DEFAULT_TEMPOS, SyntheticPoseGenerator, Tempo  # noqa: E402
+
+
+def scaled_tempo(exercise: str, factor: float) -> Tempo:
+    """Default tempo for the exercise, sped up (factor > 1) or slowed down"""
+    base = DEFAULT_TEMPOS[exercise]
+    return Tempo(
+        rep_duration=(base.down + base.up) / factor,
+        eccentric=base.down / (base.down + base.up),
+        hold_top=base.hold_top / factor,
+        hold_bottom=base.hold_bottom / factor,
+        lead_in=base.lead_in,
+    )
+
+
+def count_empty_records(events) -> int:
+    """Rep events whose tempo record has no duration, i.e. the rep's start was lost"""
+    return sum(1 for event in events if event["rep"] and event["rep"]["duration"] <= 0)
+
+
+def run(exercise: str, args) -> dict:
+    generator = SyntheticPoseGenerator(
+        exercise, fps=args.fps, tempo=scaled_tempo(exercise, args.tempo), noise=args.noise,
+        occlusion=args.occlusion, dropout=args.dropout, seed=args.seed,
+    )
+    timestamps, landmarks, present = generator.generate(args.frames)
+    processor = get_exercise_processor(exercise, use_pose=False)
+
+    costs = np.empty(args.frames)
+    clock = time.perf_counter
+    # Drain rep events like the app's stats sender does, every half second of video
+    drain_every = max(1, int(args.fps // 2))
+    events = 0
+    empty_records = 0
+    start = clock()
+    for i in range(args.frames):
+        t0 = clock()
+        processor.process_landmarks(landmarks[i] if present[i] else None, timestamp=float(timestamps[i]))
+        costs[i] = clock() - t0
+        if i % drain_every == 0:
+            drained = processor.rep_events.drain()
+            events += len(drained)
+            empty_records += count_empty_records(drained)
+    elapsed = clock() - start
+    drained = processor.rep_events.drain()
+    events += len(drained)
+    empty_records += count_empty_records(drained)
+
+    return {
+        "exercise": exercise,
+        "fps": args.frames / elapsed,
+        "mean_us": costs.mean() * 1e6,
+        "p99_us": np.percentile(costs, 99) * 1e6,
+        "counted": processor.rep_total(),
+        "expected": generator.expected_reps(args.frames),
+        "events": events,
+        "empty_records": empty_records,
+        "plank_s": getattr(processor, "plank_duration", None),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--exercise", choices=sorted(EXERCISE_CLASSES), action="append")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--tempo", type=float, default=1.0, help="speed factor over the default tempo")
+    parser.add_argument("--noise", type=float, default=0.002)
+    parser.add_argument("--occlusion", type=float, default=0.0)
+    parser.add_argument("--dropout", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.frames} frames at {args.fps:g} fps ({args.frames / args.fps / 60:.1f} min of video), "
+          f"noise={args.noise} occlusion={args.occlusion} dropout={args.dropout} tempo x{args.tempo}")
+    print(f"{'exercise':<12} {'frames/s':>10} {'mean us':>9} {'p99 us':>9} {'reps':>11}")
+    for exercise in args.exercise or list(EXERCISE_CLASSES):
+        r = run(exercise, args)
+        if r["plank_s"] is not None:
+            reps = f"hold {r['plank_s']:.1f}s"
+        else:
+            reps = f"{r['counted']}/{r['expected']}"
+            if r["events"] != r["counted"]:
+                reps += f" ({r['events']} rep events)"
+            if r["empty_records"]:
+                reps += f" ({r['empty_records']} zero-duration records)"
+        print(f"{r['exercise']:<12} {r['fps']:>10.0f} {r['mean_us']:>9.1f} {r['p99_us']:>9.1f} {reps:>11}")
+
+
+if __name__ == "__main__":
+    main()
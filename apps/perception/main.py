@@ -1,18 +1,22 @@
 import asyncio
-import json
 import logging
 import os
+import signal
 import sys
 import time
 from typing import Optional
 
-import websockets
 from dotenv import load_dotenv
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
+from encoder_control import EncoderSettings
 from exercies import get_exercise_processor
-from ThreadedCamera import ThreadedCamera
+from frame_profiler import FrameLoopProfiler
+from memory_tracker import SessionMemoryTracker
+from session_recorder import SessionRecorder
+from signaling_client import SignalingClient
+from ThreadedCamera import ThreadedCamera, camera_source
 from webrtc_streamer import WebRTCStreamer
 
 # Load environment variables
@@ -25,88 +29,110 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def session_people(value) -> int:
+    """People to track from the session's "people" option, 1 when it is not a number"""
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        logger.warning(f"⚠️ Ignoring people option {value!r}, tracking one person")
+        return 1
+
+
 class PerceptionApp:
     def __init__(self):
         self.ws_url = os.getenv("WS_URL", "ws://192.168.1.103:3001")
         self.session_id: Optional[str] = None
         self.exercise_type: Optional[str] = None
         self.member_id: Optional[str] = None
+        self.stream_mode = "overlay"
+        self.draw_skeleton = True
+        # People tracked in one frame, more than one for group classes
+        self.people = 1
+        # Pose estimator per session: backend legacy/tasks, model lite/full/heavy (None = env default)
+        self.pose_backend: Optional[str] = None
+        self.pose_model: Optional[str] = None
+        self.encoder_settings = EncoderSettings()
         self.running = False
         self.threaded_camera = None
         self.exercise_processor = None
+        self.stats_task: Optional[asyncio.Task] = None
         self.webrtc_streamer: Optional[WebRTCStreamer] = None
-        self.ws = None
-        self.loop = None
-
-    async def connect_websocket(self):
-        """Connect to WebSocket server"""
-        try:
-            self.ws = await websockets.connect(self.ws_url)
-            logger.info(f"✅ Connected to WebSocket server at {self.ws_url}")
-
-            # Register as perception client immediately (without session)
-            await self.ws.send(
-                json.dumps(
-                    {
-                        "type": "register",
-                        "role": "perception",
-                    }
-                )
-            )
-            logger.info("📱 Registered as perception client (waiting for session)")
-            return True
-        except Exception as e:
-            logger.error(f"❌ Failed to connect to WebSocket: {e}")
-            return False
-
-    async def register_as_perception(self):
-        """Register as perception client"""
-        if self.ws and self.session_id:
-            await self.ws.send(
-                json.dumps(
-                    {
-                        "type": "register",
-                        "sessionId": self.session_id,
-                        "role": "perception",
-                    }
-                )
-            )
-            logger.info(f"📱 Registered as perception for session {self.session_id}")
-
-    async def handle_websocket_messages(self):
-        """Handle incoming WebSocket messages"""
-        try:
-            async for message in self.ws:
-                data = json.loads(message)
-                await self.handle_message(data)
-        except websockets.exceptions.ConnectionClosed:
-            logger.info("WebSocket connection closed")
-        except Exception as e:
-            logger.error(f"Error handling WebSocket message: {e}")
-
-    async def handle_message(self, data):
-        """Handle specific message types"""
-        msg_type = data.get("type")
-
-        if msg_type == "session_start":
-            await self.handle_session_start(data)
-        elif msg_type == "session_end":
-            await self.handle_session_end(data)
-        elif msg_type == "webrtc_signaling":
-            await self.handle_webrtc_signaling(data)
+        self.record_sessions = os.getenv("RECORD_SESSIONS", "0") == "1"
+        self.recorder: Optional[SessionRecorder] = None
+
+        # Standby keeps the camera open and processors warm between sessions
+        self.standby = os.getenv("STANDBY", "1") == "1"
+        self.standby_exercises = [e for e in os.getenv("STANDBY_EXERCISES", "squat").split(",") if e]
+        # Warm exercise processors by exercise type
+        self.processors = {}
+
+        # On-demand frame loop profiling (profile message or SIGUSR1)
+        self.profiler = FrameLoopProfiler(os.getenv("PROFILE_DIR", "profiles"))
+        self.profile_seconds = float(os.getenv("PROFILE_SECONDS", "10"))
+        self.profile_task: Optional[asyncio.Task] = None
+
+        # RSS and live per-session objects left behind by each session. Each
+        # report runs a full collection and heap scan on the event loop (tens
+        # of ms), so only when asked for: soak tests or MEMORY_REPORTS=1
+        memory_trace = os.getenv("MEMORY_TRACE", "0") == "1"
+        self.memory: Optional[SessionMemoryTracker] = None
+        if memory_trace or os.getenv("MEMORY_REPORTS", "0") == "1":
+            self.memory = SessionMemoryTracker(trace=memory_trace)
+
+        # One shared signaling connection for session control, WebRTC and stats
+        self.signaling = SignalingClient(self.ws_url)
+        self.signaling.on("session_start", self.handle_session_start)
+        self.signaling.on("session_end", self.handle_session_end)
+        self.signaling.on("webrtc_signaling", self.handle_webrtc_signaling)
+        self.signaling.on("client_registered", self.handle_client_registered)
+        self.signaling.on("profile", self.handle_profile)
 
     async def handle_session_start(self, data):
         """Handle session start message"""
+        started = time.monotonic()
+
+        # Back-to-back sessions: end the current one first
+        if self.running:
+            logger.info(f"🔁 Switching from session {self.session_id}")
+            await self.stop_tracking()
+
+        warm = self.threaded_camera is not None
         self.session_id = data.get("sessionId")
         self.exercise_type = data.get("exercise")
         self.member_id = data.get("memberId")
+        options = data.get("options") or {}
+        self.stream_mode = options.get("streamMode", "overlay")
+        self.draw_skeleton = options.get("skeleton", True)
+        self.people = session_people(options.get("people", 1))
+        if self.people > 1 and self.stream_mode != "overlay":
+            # Landmark packets carry one pose; group sessions stream overlays
+            logger.warning(f"⚠️ Stream mode {self.stream_mode} is single-person, using overlay for {self.people} people")
+            self.stream_mode = "overlay"
+        self.pose_backend = options.get("poseBackend")
+        self.pose_model = options.get("poseModel")
+        if self.pose_model and not self.pose_backend:
+            # Model choice only exists for the Tasks landmarker
+            self.pose_backend = "tasks"
+        self.encoder_settings = EncoderSettings.from_options(options)
+        if options.get("record", self.record_sessions):
+            self.recorder = SessionRecorder.for_session(self.session_id, fps=self.encoder_settings.max_fps)
 
         logger.info(f"🚀 Session started: {self.session_id}")
         logger.info(f"   Exercise: {self.exercise_type}")
         logger.info(f"   Member: {self.member_id}")
+        logger.info(f"   Stream mode: {self.stream_mode}")
+        logger.info(f"   Skeleton overlay: {'on' if self.draw_skeleton else 'off'}")
+        if self.people > 1:
+            logger.info(f"   People: up to {self.people}")
+        if self.pose_backend:
+            logger.info(f"   Pose: {self.pose_backend} backend, {self.pose_model or 'default'} model")
+        logger.info(f"   Encoder: {self.encoder_settings}")
+
+        if self.memory:
+            self.memory.begin(self.session_id)
 
         # Register with the new session
-        await self.register_as_perception()
+        await self.signaling.register(self.session_id)
 
         # Start camera and exercise tracking
         await self.start_tracking()
@@ -114,6 +140,18 @@ class PerceptionApp:
         # Initialize WebRTC streaming
         await self.start_webrtc_streaming()
 
+        latency_ms = (time.monotonic() - started) * 1000
+        logger.info(f"⏱️ Session ready in {latency_ms:.0f}ms ({'warm' if warm else 'cold'} start)")
+        await self.signaling.send(
+            {
+                "type": "session_ready",
+                "sessionId": self.session_id,
+                "startupMs": round(latency_ms, 1),
+                "warm": warm,
+                "timestamp": time.time(),
+            }
+        )
+
     async def handle_session_end(self, data):
         """Handle session end message"""
         session_id = data.get("sessionId")
@@ -124,9 +162,48 @@ class PerceptionApp:
 
     async def handle_webrtc_signaling(self, data):
         """Forward WebRTC signaling to streamer"""
-        if self.webrtc_streamer:
+        if self.webrtc_streamer and data.get("fromRole") == "mobile":
             signaling = data.get("signaling", {})
-            await self.webrtc_streamer.handle_signaling(signaling)
+            await self.webrtc_streamer.handle_signaling(signaling, data.get("fromClientId"))
+
+    async def handle_client_registered(self, data):
+        """Offer the running session's stream to another viewer that joined it"""
+        if self.webrtc_streamer and data.get("role") == "mobile" and data.get("clientId"):
+            logger.info(f"👀 Viewer {data['clientId']} joined session {self.session_id}")
+            await self.webrtc_streamer.add_viewer(data["clientId"], data.get("options"))
+
+    async def handle_profile(self, data):
+        """Profile the live frame loop for a few seconds, the session keeps running"""
+        session_id = data.get("sessionId")
+        if session_id and session_id != self.session_id:
+            return
+        self.start_profile(float(data.get("seconds", self.profile_seconds)))
+
+    def start_profile(self, seconds: float):
+        # Runs in the background, message dispatch must not wait for it
+        if self.profile_task and not self.profile_task.done():
+            logger.warning("Profile already in progress")
+            return
+        self.profile_task = asyncio.create_task(self.run_profile(seconds))
+
+    async def run_profile(self, seconds: float):
+        try:
+            result = await self.profiler.profile(
+                seconds, self.exercise_processor, label=self.session_id or "idle"
+            )
+        except Exception as e:
+            logger.error(f"Profiling failed: {e}")
+            return
+
+        if result:
+            await self.signaling.send(
+                {
+                    "type": "profile_result",
+                    "sessionId": self.session_id,
+                    **result,
+                    "timestamp": time.time(),
+                }
+            )
 
     async def start_tracking(self):
         """Start camera and exercise tracking"""
@@ -136,18 +213,75 @@ class PerceptionApp:
 
         self.running = True
 
-        # Initialize camera
-        self.threaded_camera = ThreadedCamera()
-        self.threaded_camera.start()
-        logger.info("📹 Camera started")
+        # Initialize camera (already open in standby)
+        self.start_camera()
 
         # Initialize exercise processor for tracking
         if self.exercise_type:
-            self.exercise_processor = get_exercise_processor(self.exercise_type)
+            # Off the event loop: a model may be loaded or downloaded first
+            self.exercise_processor = await asyncio.to_thread(
+                self.acquire_processor, self.exercise_type, self.people, self.pose_backend, self.pose_model
+            )
+            self.exercise_processor.draw_skeleton = self.draw_skeleton
             logger.info(f"🏋️ Started {self.exercise_type} tracking")
 
             # Start sending exercise stats periodically
-            asyncio.create_task(self.send_exercise_stats())
+            self.stats_task = asyncio.create_task(self.send_exercise_stats())
+
+    def start_camera(self):
+        if not self.threaded_camera:
+            self.threaded_camera = ThreadedCamera(
+                shared_ring=os.getenv("FRAME_RING_NAME") or None,
+                source=camera_source(os.getenv("CAMERA_SOURCE", "0")),
+            )
+            self.threaded_camera.start()
+            logger.info("📹 Camera started")
+
+    def acquire_processor(self, exercise_type: str, people: int = 1,
+                          pose_backend: Optional[str] = None, pose_model: Optional[str] = None):
+        """Warm processor for the exercise with fresh counters, or a new one"""
+        key = ":".join([exercise_type.lower()] + [
+            str(part) for part in (people if people > 1 else None, pose_backend, pose_model) if part
+        ])
+        processor = self.processors.get(key)
+        if processor:
+            processor.reset()
+            return processor
+
+        processor = None
+        if people > 1:
+            # Only group classes need the multi-person landmarker and its model
+            from group_processor import GroupExerciseProcessor
+            try:
+                processor = GroupExerciseProcessor(exercise_type, num_poses=people, pose_model=pose_model)
+            except (FileNotFoundError, RuntimeError, ValueError) as e:
+                logger.error(f"❌ Group tracking unavailable, tracking one person: {e}")
+        elif pose_backend or pose_model:
+            try:
+                processor = get_exercise_processor(exercise_type, pose_backend=pose_backend, pose_model=pose_model)
+            except (FileNotFoundError, RuntimeError, ValueError) as e:
+                logger.error(f"❌ Pose backend {pose_backend} ({pose_model or 'default'} model) unavailable: {e}")
+        if processor is None:
+            # Default estimator, shared with the standby processors
+            key = exercise_type.lower()
+            processor = self.processors.get(key)
+            if processor:
+                processor.reset()
+                return processor
+            processor = get_exercise_processor(exercise_type)
+        if self.standby:
+            self.processors[key] = processor
+        return processor
+
+    async def warm_up(self):
+        """Open the camera and build the standby processors ahead of the first session"""
+        self.start_camera()
+        for exercise_type in self.standby_exercises:
+            if exercise_type.lower() not in self.processors:
+                self.processors[exercise_type.lower()] = await asyncio.to_thread(
+                    get_exercise_processor, exercise_type
+                )
+        logger.info(f"♨️ Standby ready: camera open, warm processors {list(self.processors)}")
 
     async def start_webrtc_streaming(self):
         """Initialize and start WebRTC streaming"""
@@ -167,30 +301,38 @@ class PerceptionApp:
 
         # Create WebRTC streamer with exercise processor
         self.webrtc_streamer = WebRTCStreamer(
-            ws_url=self.ws_url,
+            self.signaling,
             session_id=self.session_id,
             exercise_processor=self.exercise_processor,
+            stream_mode=self.stream_mode,
+            encoder_settings=self.encoder_settings,
+            recorder=self.recorder,
         )
 
-        # Connect and register
-        if await self.webrtc_streamer.connect():
-            # Start listening for signaling
-            asyncio.create_task(self.webrtc_streamer.listen_for_signaling())
+        if self.recorder:
+            self.recorder.start()
 
-            # Start streaming video
-            await self.webrtc_streamer.start_streaming(self.threaded_camera)
-            logger.info("🎥 WebRTC streaming started")
+        # Start streaming video (signaling goes over the shared connection)
+        await self.webrtc_streamer.start_streaming(self.threaded_camera)
+        logger.info("🎥 WebRTC streaming started")
 
-    async def stop_tracking(self):
-        """Stop camera and exercise tracking"""
+    async def stop_tracking(self, release: Optional[bool] = None):
+        """End the session's tracking
+
+        In standby the camera and processors stay warm for the next session;
+        with ``release`` (or standby off) everything is shut down.
+        """
+        release = not self.standby if release is None else release
         self.running = False
         logger.info("📹 Stopping tracking...")
 
-        # Stop WebRTC streaming first
+        if self.stats_task:
+            self.stats_task.cancel()
+            self.stats_task = None
+
+        # Stop WebRTC streaming first, this also stops the analysis worker
         try:
             if self.webrtc_streamer:
-                await self.webrtc_streamer.stop_streaming()
-                await asyncio.sleep(0.1)  # Small delay to ensure streaming stops
                 await self.webrtc_streamer.disconnect()
                 self.webrtc_streamer = None
                 logger.info("✅ WebRTC streaming stopped")
@@ -198,42 +340,59 @@ class PerceptionApp:
             logger.error(f"Error stopping WebRTC: {e}")
             self.webrtc_streamer = None
 
-        # Small delay before cleaning up processor
-        await asyncio.sleep(0.1)
-
-        # Clean up exercise processor before stopping camera
-        try:
-            if self.exercise_processor:
-                self.exercise_processor.cleanup()
-                self.exercise_processor = None
-                logger.info("✅ Exercise processor cleaned up")
-        except Exception as e:
-            logger.error(f"Error cleaning up exercise processor: {e}")
-            self.exercise_processor = None
-
-        # Small delay before stopping camera
-        await asyncio.sleep(0.1)
+        # Flush the recording off the event loop, the writer may still be encoding
+        if self.recorder:
+            recorder, self.recorder = self.recorder, None
+            try:
+                await asyncio.to_thread(recorder.stop)
+            except Exception as e:
+                logger.error(f"Error stopping recorder: {e}")
+
+        # Clean up exercise processors before stopping camera
+        if release:
+            processors = list(self.processors.values())
+            if self.exercise_processor and self.exercise_processor not in processors:
+                processors.append(self.exercise_processor)
+            for processor in processors:
+                try:
+                    processor.cleanup()
+                except Exception as e:
+                    logger.error(f"Error cleaning up exercise processor: {e}")
+            self.processors = {}
+            logger.info("✅ Exercise processors cleaned up")
+        self.exercise_processor = None
 
         # Stop camera last
-        try:
-            if self.threaded_camera:
-                self.threaded_camera.stop()
-                self.threaded_camera = None
-                logger.info("✅ Camera stopped")
-        except Exception as e:
-            logger.error(f"Error stopping camera: {e}")
+        if release:
+            try:
+                if self.threaded_camera:
+                    self.threaded_camera.stop()
+                    logger.info("✅ Camera stopped")
+            except Exception as e:
+                logger.error(f"Error stopping camera: {e}")
             self.threaded_camera = None
 
         # Reset session info
         self.session_id = None
         self.exercise_type = None
         self.member_id = None
+        self.stream_mode = "overlay"
+        self.draw_skeleton = True
+        self.people = 1
+        self.pose_backend = None
+        self.pose_model = None
+        await self.signaling.register()
 
         logger.info("📹 Tracking stopped successfully")
 
+        # What the session left behind once everything is torn down
+        report = self.memory.end() if self.memory else None
+        if report:
+            await self.signaling.send({"type": "memory_report", **report, "timestamp": time.time()})
+
     async def send_exercise_stats(self):
         """Send exercise stats periodically to mobile app"""
-        while self.running and self.ws:
+        while self.running:
             try:
                 if self.exercise_processor:
                     # Get current stats from processor
@@ -250,17 +409,38 @@ class PerceptionApp:
                             self.exercise_processor, "shoulder_tap_count", 0
                         ),
                     }
-
-                    # Send stats to mobile app
-                    await self.ws.send(
-                        json.dumps(
+                    if "people" in base_stats:
+                        # Group class: per-person counts and tempo, keyed by person id
+                        stats["people"] = base_stats["people"]
+                        stats["left"] = base_stats["left"]
+                    else:
+                        stats["tempo"] = self.exercise_processor.timeline.summary()
+                    if self.webrtc_streamer:
+                        stats["pipeline"] = self.webrtc_streamer.pipeline_stats()
+
+                    # One rep event per counted rep, with its tempo/range-of-motion
+                    # record; the queue never drops, so none are lost between polls
+                    for event in self.exercise_processor.rep_events.drain():
+                        await self.send_to_mobile(
                             {
-                                "type": "exercise_stats",
+                                "type": "rep_event",
                                 "sessionId": self.session_id,
-                                "stats": stats,
+                                "exercise": self.exercise_type,
+                                "count": event["count"],
+                                "reps": [event["rep"]] if event["rep"] else [],
+                                **({"person": event["person"]} if "person" in event else {}),
                                 "timestamp": time.time(),
                             }
                         )
+
+                    # Send stats to mobile app
+                    await self.send_to_mobile(
+                        {
+                            "type": "exercise_stats",
+                            "sessionId": self.session_id,
+                            "stats": stats,
+                            "timestamp": time.time(),
+                        }
                     )
 
                 # Send stats every 500ms for responsive UI
@@ -269,26 +449,44 @@ class PerceptionApp:
                 logger.error(f"Error sending exercise stats: {e}")
                 break
 
-    async def run(self):
-        """Main run loop"""
-        # Connect to WebSocket
-        if not await self.connect_websocket():
+    async def send_to_mobile(self, message: dict):
+        """Send a message to the mobile app, peer-to-peer when possible
+
+        Uses the WebRTC data channel when it is open and falls back to the
+        WebSocket server otherwise.
+        """
+        if self.webrtc_streamer and self.webrtc_streamer.send_data(message):
             return
 
+        await self.signaling.send(message)
+
+    async def run(self):
+        """Main run loop"""
         try:
-            # Handle messages until disconnected
-            await self.handle_websocket_messages()
-        except KeyboardInterrupt:
+            loop = asyncio.get_running_loop()
+            try:
+                # kill -USR1 <pid> profiles the running session
+                loop.add_signal_handler(signal.SIGUSR1, self.start_profile, self.profile_seconds)
+                # Terminating shuts down like Ctrl-C, so pose worker processes
+                # and the shared frame ring are released too
+                loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+            except (AttributeError, NotImplementedError):
+                pass
+
+            if self.standby:
+                await self.warm_up()
+
+            # Handle messages, reconnecting as needed, until shut down
+            await self.signaling.run()
+        except (KeyboardInterrupt, asyncio.CancelledError):
             logger.info("Shutting down...")
         finally:
             await self.cleanup()
 
     async def cleanup(self):
         """Clean up resources"""
-        await self.stop_tracking()
-
-        if self.ws:
-            await self.ws.close()
+        await self.stop_tracking(release=True)
+        await self.signaling.close()
 
         logger.info("✅ Cleanup complete")
 
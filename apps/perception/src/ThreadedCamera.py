@@ -1,21 +1,50 @@
+import os
 import time
 from threading import Thread
+from typing import Optional, Union
 
 import cv2
+from frame_ring import SharedFrameRing
+from stage_queue import DROP_OLDEST, StageQueue
+
+
+def camera_source(value: str) -> Union[int, str]:
+    """Camera index ("0") or path/URL of a video to read instead"""
+    return int(value) if value.isdigit() else value
 
 
 class ThreadedCamera:
-    def __init__(self):
-        self.capture = cv2.VideoCapture(0)
+    def __init__(self, shared_ring: Optional[str] = None, source: Union[int, str] = 0):
+        self.source = source
+        self.capture = cv2.VideoCapture(source)
         self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 2)
         # FPS = 1/X
         # X = desired FPS
         self.FPS = 1 / 60
         self.FPS_MS = int(self.FPS * 1000)
 
+        # A video file stands in for a camera: played at its own frame rate, looped
+        self.from_file = isinstance(source, str) and "://" not in source
+        if self.from_file:
+            file_fps = self.capture.get(cv2.CAP_PROP_FPS) or 30
+            self.FPS = 1 / file_fps
+            self.FPS_MS = int(self.FPS * 1000)
+
         # Start frame retrieval thread
         self.thread = Thread(target=self.update, args=())
         self.frame = None
+        # Monotonic capture time and sequence number of the current frame
+        self.latest = (None, 0.0, 0)
+        # Hand-off to the analysis stage, as (frame, capture time, sequence number)
+        self.frames = StageQueue(
+            "camera",
+            maxsize=int(os.getenv("CAMERA_QUEUE_SIZE", "1")),
+            policy=os.getenv("CAMERA_QUEUE_POLICY", DROP_OLDEST),
+        )
+        # Optional shared-memory ring other processes read frames from (the
+        # pose worker, src/pose_worker.py), created with the first frame's shape
+        self.shared_ring_name = shared_ring
+        self.ring: Optional[SharedFrameRing] = None
         self.thread.daemon = True
         self.running = True
 
@@ -25,21 +54,51 @@ class ThreadedCamera:
             self.thread.start()
 
     def update(self):
+        next_frame = time.monotonic()
         while self.running:
             try:
                 if self.capture and self.capture.isOpened():
                     (self.status, self.frame) = self.capture.read()
-                time.sleep(self.FPS)
+                    if not self.status and self.from_file:
+                        # End of the clip, start over
+                        self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        (self.status, self.frame) = self.capture.read()
+                    if self.status:
+                        capture_time = time.monotonic()
+                        self.latest = (self.frame, capture_time, self.latest[2] + 1)
+                        self.frames.put(self.latest)
+                        if self.shared_ring_name:
+                            self.publish(self.frame, capture_time)
+                    else:
+                        self.latest = (None,) + self.latest[1:]
+
+                if self.from_file:
+                    # Files read instantly, hold each frame for its duration
+                    next_frame = max(next_frame + self.FPS, time.monotonic() - self.FPS)
+                    time.sleep(max(0.0, next_frame - time.monotonic()))
+                else:
+                    time.sleep(self.FPS)
             except Exception as e:
                 print(f"Error in camera update loop: {e}")
                 break
 
+    def publish(self, frame, capture_time):
+        """Copy the frame into the shared ring for out-of-process readers"""
+        if self.ring is None:
+            self.ring = SharedFrameRing.create(frame.shape, name=self.shared_ring_name)
+        self.ring.write(frame, capture_time)
+
     def show_frame(self):
         """Return current frame"""
         if self.frame is not None:
             return True, self.frame
         return False, None
 
+    def get_frame(self):
+        """Return current frame with its monotonic capture time and sequence number"""
+        frame, capture_time, seq = self.latest
+        return frame is not None, frame, capture_time, seq
+
     def stop(self):
         """Stop the camera thread"""
         # Signal thread to stop
@@ -54,5 +113,10 @@ class ThreadedCamera:
             self.capture.release()
             self.capture = None
 
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
         # Clear frame reference
         self.frame = None
+        self.latest = (None, 0.0, 0)
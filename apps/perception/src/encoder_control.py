@@ -0,0 +1,191 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import cv2
+from aiortc import RTCRtpSender
+
+logger = logging.getLogger(__name__)
+
+
+class EncoderSettings:
+    """Per-session caps on the encoded video stream
+
+    Built from the ``options`` of a ``session_start`` message:
+    ``maxWidth``, ``maxHeight``, ``maxFps``, ``maxBitrate`` (bits per second)
+    and ``codec`` (``"vp8"`` or ``"h264"``, aiortc's default order if unset).
+    ``frameMarker`` stamps each frame's sequence number and capture time into
+    the video for glass-to-glass latency (see frame_latency.py).
+    """
+
+    DEFAULT_MAX_WIDTH = 640
+    DEFAULT_MAX_HEIGHT = 480
+    DEFAULT_MAX_FPS = 30
+    DEFAULT_MAX_BITRATE = 1_000_000
+
+    def __init__(self, max_width: int = DEFAULT_MAX_WIDTH, max_height: int = DEFAULT_MAX_HEIGHT,
+                 max_fps: float = DEFAULT_MAX_FPS, max_bitrate: int = DEFAULT_MAX_BITRATE,
+                 codec: Optional[str] = None, frame_marker: bool = False):
+        self.max_width = max_width
+        self.max_height = max_height
+        self.max_fps = max_fps
+        self.max_bitrate = max_bitrate
+        self.codec = codec.lower() if codec else None
+        self.frame_marker = frame_marker
+
+    @classmethod
+    def from_options(cls, options: dict) -> "EncoderSettings":
+        return cls(
+            max_width=int(options.get("maxWidth", cls.DEFAULT_MAX_WIDTH)),
+            max_height=int(options.get("maxHeight", cls.DEFAULT_MAX_HEIGHT)),
+            max_fps=float(options.get("maxFps", cls.DEFAULT_MAX_FPS)),
+            max_bitrate=int(options.get("maxBitrate", cls.DEFAULT_MAX_BITRATE)),
+            codec=options.get("codec"),
+            frame_marker=bool(options.get("frameMarker", False)),
+        )
+
+    def to_options(self) -> dict:
+        return {
+            "maxWidth": self.max_width,
+            "maxHeight": self.max_height,
+            "maxFps": self.max_fps,
+            "maxBitrate": self.max_bitrate,
+            "codec": self.codec,
+            "frameMarker": self.frame_marker,
+        }
+
+    def __repr__(self):
+        return (f"EncoderSettings({self.max_width}x{self.max_height}, {self.max_fps}fps, "
+                f"{self.max_bitrate // 1000}kbps, codec={self.codec or 'default'}"
+                f"{', frame marker' if self.frame_marker else ''})")
+
+
+def fit_frame(frame, max_width: int, max_height: int):
+    """Downscale a frame to fit within max_width x max_height, keeping its aspect ratio"""
+    h, w = frame.shape[:2]
+    scale = min(max_width / w, max_height / h)
+    if scale >= 1:
+        return frame
+
+    # Even dimensions keep the yuv420p conversion in the encoder happy
+    size = (max(2, int(w * scale) & ~1), max(2, int(h * scale) & ~1))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def prefer_codec(transceiver, codec: Optional[str]):
+    """Put the requested codec first in the SDP offer for this transceiver"""
+    if not codec:
+        return
+
+    mime_type = f"video/{codec}".lower()
+    capabilities = RTCRtpSender.getCapabilities("video").codecs
+    preferred = [c for c in capabilities if c.mimeType.lower() == mime_type]
+    if not preferred:
+        logger.warning(f"Codec '{codec}' not supported, keeping default preferences")
+        return
+
+    # Keep retransmission support alongside the preferred codec
+    rtx = [c for c in capabilities if c.mimeType.lower() == "video/rtx"]
+    transceiver.setCodecPreferences(preferred + rtx)
+    logger.info(f"🎞️ Preferring {codec} for video")
+
+
+class CongestionController:
+    """Adapts resolution, framerate and bitrate to RTCP receiver reports
+
+    Every ``interval`` seconds the sender's ``remote-inbound-rtp`` stats
+    (fraction lost and round-trip time from RTCP receiver reports) are
+    checked, each new report once (RTCP arrives every few seconds, the
+    stats keep the last one in between). Congestion steps the quality level
+    down immediately; a clean link steps it back up only after several
+    consecutive good reports. The bitrate cap is re-applied each tick
+    because aiortc lets REMB feedback raise the encoder target on its own.
+    """
+
+    # (resolution scale, framerate scale, bitrate scale) per quality level
+    LEVELS = [
+        (1.0, 1.0, 1.0),
+        (0.75, 1.0, 0.7),
+        (0.5, 0.75, 0.45),
+        (0.35, 0.5, 0.3),
+    ]
+    LOSS_DEGRADE = 0.05
+    LOSS_RECOVER = 0.01
+    RTT_DEGRADE = 0.3
+    RTT_RECOVER = 0.15
+    RECOVER_TICKS = 5
+
+    def __init__(self, sender, track, settings: EncoderSettings, interval: float = 1.0):
+        self.sender = sender
+        self.track = track
+        self.settings = settings
+        self.interval = interval
+        self.level = 0
+        self.good_ticks = 0
+        # Receipt time of the last receiver report acted on, per report id
+        self.handled_reports: Dict[str, object] = {}
+        self.task: Optional[asyncio.Task] = None
+        self.apply_level()
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    @property
+    def bitrate_cap(self) -> int:
+        return int(self.settings.max_bitrate * self.LEVELS[self.level][2])
+
+    def apply_level(self):
+        size_scale, fps_scale, _ = self.LEVELS[self.level]
+        self.track.max_width = int(self.settings.max_width * size_scale)
+        self.track.max_height = int(self.settings.max_height * size_scale)
+        self.track.max_fps = self.settings.max_fps * fps_scale
+
+    def cap_encoder_bitrate(self):
+        # aiortc creates the encoder lazily and does not expose it publicly
+        encoder = getattr(self.sender, "_RTCRtpSender__encoder", None)
+        if encoder is not None and hasattr(encoder, "target_bitrate"):
+            if encoder.target_bitrate > self.bitrate_cap:
+                encoder.target_bitrate = self.bitrate_cap
+
+    def on_report(self, fraction_lost: float, rtt: Optional[float]):
+        """Step the quality level from one receiver report"""
+        rtt = rtt or 0.0
+        if fraction_lost > self.LOSS_DEGRADE or rtt > self.RTT_DEGRADE:
+            self.good_ticks = 0
+            if self.level < len(self.LEVELS) - 1:
+                self.level += 1
+                self.apply_level()
+                logger.info(f"📉 Congestion (loss {fraction_lost:.0%}, rtt {rtt * 1000:.0f}ms), "
+                            f"stream level {self.level}")
+        elif fraction_lost < self.LOSS_RECOVER and rtt < self.RTT_RECOVER:
+            self.good_ticks += 1
+            if self.level > 0 and self.good_ticks >= self.RECOVER_TICKS:
+                self.good_ticks = 0
+                self.level -= 1
+                self.apply_level()
+                logger.info(f"📈 Link recovered, stream level {self.level}")
+        else:
+            self.good_ticks = 0
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                report = await self.sender.getStats()
+                for stats in report.values():
+                    # getStats keeps returning the last receiver report until
+                    # the next RTCP packet; act on each report once
+                    if stats.type == "remote-inbound-rtp" and self.handled_reports.get(stats.id) != stats.timestamp:
+                        self.handled_reports[stats.id] = stats.timestamp
+                        # RTCP fraction lost is 8-bit fixed point
+                        self.on_report(stats.fractionLost / 256, stats.roundTripTime)
+                self.cap_encoder_bitrate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error adapting stream: {e}")
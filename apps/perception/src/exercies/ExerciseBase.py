@@ -1,39 +1,71 @@
 import logging
 import os
-from typing import Dict, Tuple
+import time
+from typing import Dict, Optional, Tuple
 
 import cv2
 import mediapipe as mp
 import numpy as np
 from mediapipe.python.solutions.drawing_utils import \
     _normalized_to_pixel_coordinates
+from src.landmark_buffer import LandmarkRingBuffer
+from src.motion_gate import MotionGate
+from src.pose_backend import create_pose_backend, describe_pose_backend
+from src.rep_timeline import RepTimeline
+from src.skeleton_renderer import SkeletonRenderer
+from src.stage_queue import NEVER_DROP, StageQueue
+from src.text_renderer import put_text
+from src.utils import ang
 
 logger = logging.getLogger(__name__)
 
-mp_drawing = mp.solutions.drawing_utils
 mp_pose = mp.solutions.pose
 
 
 class ExerciseBase:
     """Base class for all exercises - no GUI, WebRTC compatible"""
+
+    # Joint angles computed every frame: name -> (landmark_a, vertex, landmark_c)
+    # Order matters, it is the slot order in landmark packets
+    JOINT_ANGLES: Dict[str, Tuple[int, int, int]] = {}
+    
+    # Joint angles that drive a rep, the smallest one present is used for the rep timeline
+    REP_ANGLES: Tuple[str, ...] = ()
+    
+    # Landmark indices the exercise reads, the only ones converted to pixel
+    # coordinates. Subclasses that don't declare them get the landmarks of
+    # their JOINT_ANGLES plus EXTRA_LANDMARKS (the nose places the rep label)
+    LANDMARKS: Tuple[int, ...] = tuple(range(33))
+    EXTRA_LANDMARKS: Tuple[int, ...] = (0,)
     
-    def __init__(self):
-        # Get thresholds from environment or use defaults
-        min_detection = float(os.getenv('MIN_DETECTION_CONFIDENCE', '0.5'))
-        min_tracking = float(os.getenv('MIN_TRACKING_CONFIDENCE', '0.5'))
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'LANDMARKS' not in vars(cls):
+            cls.LANDMARKS = tuple(sorted(
+                {idx for joint in cls.JOINT_ANGLES.values() for idx in joint} | set(cls.EXTRA_LANDMARKS)
+            ))
+    
+    def __init__(self, use_pose: bool = True, pose_backend: Optional[str] = None,
+                 pose_model: Optional[str] = None, pose_running_mode: Optional[str] = None):
+        # Legacy mp.solutions Pose or a Tasks PoseLandmarker (lite/full/heavy),
+        # both answer process(image_rgb) with .pose_landmarks; thresholds and
+        # unset choices come from the environment.
+        # Without Pose only process_landmarks works (synthetic or external landmarks)
+        self.pose = create_pose_backend(
+            pose_backend, pose_model, pose_running_mode
+        ) if use_pose else None
         
-        self.pose = mp_pose.Pose(
-            min_detection_confidence=min_detection,
-            min_tracking_confidence=min_tracking
-        )
+        # Skip inference on frames that barely moved since the last inferred one
+        self.motion_gate = MotionGate() if os.getenv('MOTION_GATE', '1') == '1' else None
+        self.last_results = None
         
-        # Drawing specs for pose overlay
-        self.pose_landmark_drawing_spec = mp_drawing.DrawingSpec(
-            thickness=5, circle_radius=2, color=(0, 0, 255)
-        )
-        self.pose_connection_drawing_spec = mp_drawing.DrawingSpec(
-            thickness=1, circle_radius=1, color=(0, 255, 0)
+        # Batched skeleton drawing for the pose overlay, can be turned off per session
+        self.skeleton = SkeletonRenderer(
+            mp_pose.POSE_CONNECTIONS,
+            bone_color=(0, 255, 0), bone_thickness=1,
+            joint_color=(0, 0, 255), joint_radius=2, joint_thickness=5
         )
+        self.draw_skeleton = True
         
         # Common tracking variables
         self.rep_count = 0
@@ -42,57 +74,164 @@ class ExerciseBase:
         # For storing pixel coordinates
         self.idx_to_coordinates = {}
         
-        logger.info(f"Initialized {self.exercise_name} - Detection: {min_detection}, Tracking: {min_tracking}")
+        # Timestamp of the frame being tracked
+        self.frame_time = time.time()
+        
+        # Latest normalized landmarks and joint angles, for landmark streaming
+        self.pose_landmarks = None
+        self.joint_angles: Dict[str, float] = {}
+        
+        # Per-rep tempo and range of motion
+        self.timeline = RepTimeline()
+        
+        # Rep events for the stats sender; every rep must reach the phone, so never dropped
+        self.rep_events = StageQueue("rep_events", 64, NEVER_DROP)
+        
+        # Recent landmarks, angles and timestamps for smoothing and per-rep analysis
+        self.history = LandmarkRingBuffer(
+            int(os.getenv('LANDMARK_HISTORY', '120')), self.JOINT_ANGLES
+        )
+        
+        logger.info(f"Initialized {self.exercise_name} - Pose: {describe_pose_backend(self.pose)}")
     
-    def process_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, Dict]:
+    def process_frame(self, frame: np.ndarray, draw: bool = True) -> Tuple[np.ndarray, Dict]:
         """
         Process a single frame for exercise tracking
+        When draw is False no overlays are rendered (landmark streaming),
+        metrics and rep counting still run.
         Returns: (processed_frame_with_overlay, stats_dict)
         """
         if frame is None:
             return frame, self.get_stats()
         
-        # Create a copy for processing
-        image = frame.copy()
-        image = cv2.flip(image, 1)
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        # Process with MediaPipe
-        results = self.pose.process(image_rgb)
+        image, image_rgb = self.prepare_frame(frame)
+        return self.render_frame(image, self.infer(image_rgb), draw)
+    
+    # process_frame in three steps, so a pipelined producer can run each on
+    # its own thread: while one frame is in inference the previous one is
+    # being drawn and the next one prepared
+    
+    def prepare_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Mirror the camera frame; returns (BGR image to draw on, RGB image for MediaPipe)"""
+        image = cv2.flip(frame, 1)
+        return image, cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    
+    def infer(self, image_rgb: np.ndarray):
+        """Run MediaPipe Pose on a prepared RGB image, or reuse the last result if nothing moved"""
+        # The gate has no reference until the first frame, so that one is always inferred
+        gate = self.motion_gate
+        if gate and not gate.should_infer(image_rgb, self.pose_region()) and self.last_results is not None:
+            return self.last_results
         
-        # Convert back to BGR for OpenCV
-        image = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
+        self.last_results = self.pose.process(image_rgb)
+        return self.last_results
+    
+    def pose_region(self, visibility_threshold=0.5) -> Optional[Tuple[float, float, float, float]]:
+        """Normalized bounding box of the visible landmarks in the last inference result"""
+        if self.last_results is None or not self.last_results.pose_landmarks:
+            return None
+        points = [
+            (lm.x, lm.y) for lm in self.last_results.pose_landmarks.landmark
+            if lm.visibility >= visibility_threshold
+        ]
+        if not points:
+            return None
+        xs, ys = zip(*points)
+        return min(xs), min(ys), max(xs), max(ys)
+    
+    def render_frame(self, image: np.ndarray, results, draw: bool = True) -> Tuple[np.ndarray, Dict]:
+        """Metrics, rep counting and (optionally) overlays for one inferred frame"""
+        now = self.frame_time = time.time()
+        self.pose_landmarks = results.pose_landmarks
         
-        # Draw pose landmarks
         if results.pose_landmarks:
-            mp_drawing.draw_landmarks(
-                image,
-                results.pose_landmarks,
-                mp_pose.POSE_CONNECTIONS,
-                landmark_drawing_spec=self.pose_landmark_drawing_spec,
-                connection_drawing_spec=self.pose_connection_drawing_spec
-            )
-            
             # Get pixel coordinates
             self.idx_to_coordinates = self.get_idx_to_coordinates(image, results)
             
+            # Compute joint angles
+            self.update_metrics()
+            self.history.push(now, results.pose_landmarks, self.joint_angles)
+            
+            # Draw pose landmarks from the array just stored in the history
+            if draw and self.draw_skeleton:
+                self.skeleton.draw(image, self.history.latest()[1])
+            
             # Draw exercise-specific overlays
-            self.draw_overlays(image, results)
+            if draw:
+                self.draw_overlays(image, results)
             
             # Track exercise
-            self.track_exercise(results.pose_landmarks)
+            self.update_tracking(now, results.pose_landmarks)
+        else:
+            self.history.push(now)
         
         # Add info overlay
-        self.add_info_overlay(image)
+        if draw:
+            self.add_info_overlay(image)
         
         return image, self.get_stats()
     
+    def process_landmarks(self, landmarks: Optional[np.ndarray], width: int = 640, height: int = 480,
+                          timestamp: Optional[float] = None) -> Dict:
+        """
+        Track one frame from an (N, 4) array of normalized (x, y, z, visibility)
+        landmarks, without MediaPipe or drawing. None means no pose was found.
+        Returns: stats_dict
+        """
+        now = self.frame_time = time.time() if timestamp is None else timestamp
+        
+        if landmarks is None:
+            self.pose_landmarks = None
+            self.history.push(now)
+            return self.get_stats()
+        
+        self.idx_to_coordinates = self.landmarks_to_coordinates(landmarks, width, height, indices=self.LANDMARKS)
+        self.update_metrics()
+        self.history.push(now, landmarks, self.joint_angles)
+        self.update_tracking(now, landmarks)
+        return self.get_stats()
+    
+    def update_tracking(self, now: float, landmarks):
+        """Run the exercise's rep logic and feed the rep timeline"""
+        reps_before = self.rep_total()
+        self.track_exercise(landmarks)
+        
+        reps_after = self.rep_total()
+        record = None
+        if self.REP_ANGLES:
+            record = self.timeline.update(
+                now, self.rep_angle(), self.rep_depth(),
+                rep_completed=reps_after > reps_before
+            )
+        
+        if reps_after > reps_before:
+            self.rep_events.put({"count": reps_after, "rep": record, "timestamp": now})
+    
+    @staticmethod
+    def landmarks_to_coordinates(landmarks: np.ndarray, width: int, height: int,
+                                 visibility_threshold=0.5, indices=None) -> Dict[int, Tuple[int, int]]:
+        """Same as get_idx_to_coordinates, for a landmark array (all landmarks unless indices are given)"""
+        if indices is None:
+            indices = np.arange(len(landmarks))
+        else:
+            indices = np.asarray(indices)
+            landmarks = landmarks[indices]
+        xy = landmarks[:, :2]
+        keep = np.flatnonzero(
+            (landmarks[:, 3] >= visibility_threshold)
+            & (xy[:, 0] >= 0) & (xy[:, 0] <= 1) & (xy[:, 1] >= 0) & (xy[:, 1] <= 1)
+        )
+        px = np.minimum(np.floor(xy[keep] * (width, height)), (width - 1, height - 1)).astype(int)
+        return dict(zip(indices[keep].tolist(), map(tuple, px.tolist())))
+    
     def get_idx_to_coordinates(self, image, results, visibility_threshold=0.5, presence_threshold=0.5):
-        """Convert normalized landmarks to pixel coordinates"""
+        """Convert the exercise's landmarks (LANDMARKS) to pixel coordinates"""
         idx_to_coordinates = {}
         image_rows, image_cols, _ = image.shape
         try:
-            for idx, landmark in enumerate(results.pose_landmarks.landmark):
+            landmarks = results.pose_landmarks.landmark
+            for idx in self.LANDMARKS:
+                landmark = landmarks[idx]
                 if ((landmark.HasField('visibility') and
                      landmark.visibility < visibility_threshold) or
                         (landmark.HasField('presence') and
@@ -107,6 +246,35 @@ class ExerciseBase:
             pass
         return idx_to_coordinates
     
+    def update_metrics(self):
+        """Compute the declared joint angles from the current pixel coordinates
+
+        Subclasses extend this to derive their own tracking values; it runs
+        whether or not overlays are drawn.
+        """
+        idx = self.idx_to_coordinates
+        for name, (a, b, c) in self.JOINT_ANGLES.items():
+            if a in idx and b in idx and c in idx:
+                try:
+                    self.joint_angles[name] = ang((idx[a], idx[b]), (idx[b], idx[c]))
+                except (ValueError, ZeroDivisionError):
+                    self.joint_angles.pop(name, None)
+            else:
+                self.joint_angles.pop(name, None)
+    
+    def rep_total(self) -> int:
+        """Counter that moves once per completed rep"""
+        return self.rep_count
+    
+    def rep_angle(self) -> Optional[float]:
+        """Current driving angle for the rep timeline"""
+        angles = [self.joint_angles[name] for name in self.REP_ANGLES if name in self.joint_angles]
+        return min(angles) if angles else None
+    
+    def rep_depth(self) -> Optional[float]:
+        """Override to report an exercise-specific depth measure, smaller is deeper"""
+        return None
+    
     def draw_overlays(self, image, results):
         """Override in subclass to draw exercise-specific overlays"""
         pass
@@ -133,28 +301,37 @@ class ExerciseBase:
         cv2.addWeighted(overlay, 0.4, image, 0.6, 0, image)
         
         # Exercise name
-        cv2.putText(image, f"{self.exercise_name.upper()}", 
-                   (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+        put_text(image, f"{self.exercise_name.upper()}", 
+                (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
         
         # Rep counter
-        cv2.putText(image, f"Reps: ", 
-                   (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(image, f"{self.rep_count}", 
-                   (100, 70), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 3)
+        put_text(image, f"Reps: ", 
+                (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        put_text(image, f"{self.rep_count}", 
+                (100, 70), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 3)
         
         # Set indicator
         sets = self.rep_count // 10 + 1 if self.rep_count > 0 else 1
-        cv2.putText(image, f"Set: {sets}", 
-                   (200, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+        put_text(image, f"Set: {sets}", 
+                (200, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
         
         # Connection status
         cv2.circle(image, (25, 105), 5, (0, 255, 0), -1)
-        cv2.putText(image, "WebRTC Live", 
-                   (40, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+        put_text(image, "WebRTC Live", 
+                (40, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
     
     def reset(self):
         """Reset exercise tracking stats"""
         self.rep_count = 0
+        self.joint_angles = {}
+        self.idx_to_coordinates = {}
+        self.pose_landmarks = None
+        self.timeline.reset()
+        self.rep_events.clear()
+        self.history.clear()
+        self.last_results = None
+        if self.motion_gate:
+            self.motion_gate.reset()
     
     def cleanup(self):
         """Clean up resources"""
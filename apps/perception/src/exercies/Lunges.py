@@ -3,22 +3,34 @@ import logging
 import cv2
 import numpy as np
 from src.exercies.ExerciseBase import ExerciseBase
-from src.utils import ang
+from src.text_renderer import put_text
 
 logger = logging.getLogger(__name__)
 
 
 class Lunges(ExerciseBase):
     """Lunges exercise detection with visual overlays"""
+
+    JOINT_ANGLES = {
+        'left_knee': (23, 25, 27),
+        'right_knee': (24, 26, 28),
+    }
+    REP_ANGLES = ('left_knee', 'right_knee')
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.performed_lunge = False
         self.exercise_name = "lunges"
         self.frames = 0
         self.left_angle = 0
         self.right_angle = 0
     
+    def update_metrics(self):
+        """Knee angles for both legs"""
+        super().update_metrics()
+        self.left_angle = self.joint_angles.get('left_knee', self.left_angle)
+        self.right_angle = self.joint_angles.get('right_knee', self.right_angle)
+    
     def draw_overlays(self, image, results):
         """Draw lunges-specific visual overlays"""
         idx = self.idx_to_coordinates
@@ -29,12 +41,10 @@ class Lunges(ExerciseBase):
                 cv2.line(image, idx[23], idx[25], thickness=6, color=(255, 0, 0))
                 cv2.line(image, idx[25], idx[27], thickness=6, color=(255, 0, 0))
                 
-                self.left_angle = ang((idx[23], idx[25]), (idx[25], idx[27]))
-                
-                cv2.putText(image, str(round(self.left_angle, 2)),
-                           (idx[25][0] - 40, idx[25][1] - 50),
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.8, color=(0, 255, 0), thickness=3)
+                put_text(image, str(round(self.left_angle, 2)),
+                        (idx[25][0] - 40, idx[25][1] - 50),
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.8, color=(0, 255, 0), thickness=3)
                 
                 # Draw joint circles
                 cv2.circle(image, idx[23], 10, (0, 0, 255), cv2.FILLED)
@@ -55,21 +65,19 @@ class Lunges(ExerciseBase):
                 # Progress bar
                 cv2.rectangle(image, (50, int(bar_y)), (110, 450), c1, cv2.FILLED)
                 # Percentage text
-                cv2.putText(image, f'L: {int(per)}%', (50, 180), 
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.7, color=c1, thickness=2)
+                put_text(image, f'L: {int(per)}%', (50, 180), 
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.7, color=c1, thickness=2)
             
             # Draw hip - knee - ankle angle for right leg
             if 24 in idx and 26 in idx and 28 in idx:
                 cv2.line(image, idx[24], idx[26], thickness=6, color=(0, 0, 255))
                 cv2.line(image, idx[26], idx[28], thickness=6, color=(0, 0, 255))
                 
-                self.right_angle = ang((idx[24], idx[26]), (idx[26], idx[28]))
-                
-                cv2.putText(image, str(round(self.right_angle, 2)),
-                           (idx[26][0] - 40, idx[26][1] - 50),
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.8, color=(0, 255, 0), thickness=3)
+                put_text(image, str(round(self.right_angle, 2)),
+                        (idx[26][0] - 40, idx[26][1] - 50),
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.8, color=(0, 255, 0), thickness=3)
                 
                 # Draw joint circles
                 cv2.circle(image, idx[24], 10, (0, 0, 255), cv2.FILLED)
@@ -90,9 +98,9 @@ class Lunges(ExerciseBase):
                 # Progress bar
                 cv2.rectangle(image, (150, int(bar_y)), (210, 450), c2, cv2.FILLED)
                 # Percentage text
-                cv2.putText(image, f'R: {int(per)}%', (150, 180), 
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.7, color=c2, thickness=2)
+                put_text(image, f'R: {int(per)}%', (150, 180), 
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.7, color=c2, thickness=2)
             
             # Draw lunge depth indicator
             if self.left_angle < 100 or self.right_angle < 100:
@@ -100,10 +108,10 @@ class Lunges(ExerciseBase):
                 angle = self.left_angle if self.left_angle < 100 else self.right_angle
                 depth_per = np.interp(angle, (70, 110), (100, 0))
                 
-                cv2.putText(image, f"{side} LUNGE", 
-                           (250, 250), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-                cv2.putText(image, f"Depth: {int(depth_per)}%", 
-                           (250, 280), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                put_text(image, f"{side} LUNGE", 
+                        (250, 250), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+                put_text(image, f"Depth: {int(depth_per)}%", 
+                        (250, 280), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
         except:
             pass
     
@@ -134,30 +142,30 @@ class Lunges(ExerciseBase):
         cv2.addWeighted(overlay, 0.4, image, 0.6, 0, image)
         
         # Exercise name
-        cv2.putText(image, "LUNGES", 
-                   (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+        put_text(image, "LUNGES", 
+                (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
         
         # Rep counter
-        cv2.putText(image, f"Reps: ", 
-                   (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(image, f"{self.rep_count}", 
-                   (100, 70), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 3)
+        put_text(image, f"Reps: ", 
+                (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        put_text(image, f"{self.rep_count}", 
+                (100, 70), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 3)
         
         # Set indicator
         sets = self.rep_count // 10 + 1 if self.rep_count > 0 else 1
-        cv2.putText(image, f"Set: {sets}", 
-                   (200, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+        put_text(image, f"Set: {sets}", 
+                (200, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
         
         # Connection status
         cv2.circle(image, (25, 105), 5, (0, 255, 0), -1)
-        cv2.putText(image, "WebRTC Live", 
-                   (40, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+        put_text(image, "WebRTC Live", 
+                (40, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
         
         # Show current lunge state
         if self.performed_lunge and 0 in self.idx_to_coordinates:
-            cv2.putText(image, "LUNGE", 
-                       (self.idx_to_coordinates[0][0] - 40, self.idx_to_coordinates[0][1] - 100),
-                       cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 3)
+            put_text(image, "LUNGE", 
+                    (self.idx_to_coordinates[0][0] - 40, self.idx_to_coordinates[0][1] - 100),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 3)
     
     def reset(self):
         """Reset lunges tracking stats"""
@@ -1,24 +1,36 @@
 import logging
-import time
 
 import cv2
 import numpy as np
 from src.exercies.ExerciseBase import ExerciseBase
-from src.utils import ang
+from src.text_renderer import put_text
 
 logger = logging.getLogger(__name__)
 
 
 class Plank(ExerciseBase):
     """Plank exercise detection with duration tracking"""
+
+    JOINT_ANGLES = {
+        'left_body': (11, 23, 27),
+        'right_body': (12, 24, 28),
+    }
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.plank_timer = None
         self.plank_duration = 0
         self.exercise_name = "plank"
         self.current_angle = 0
     
+    def update_metrics(self):
+        """Body alignment angle, left side preferred"""
+        super().update_metrics()
+        if 'left_body' in self.joint_angles:
+            self.current_angle = self.joint_angles['left_body']
+        elif 'right_body' in self.joint_angles:
+            self.current_angle = self.joint_angles['right_body']
+    
     def draw_overlays(self, image, results):
         """Draw plank-specific visual overlays"""
         idx = self.idx_to_coordinates
@@ -29,12 +41,10 @@ class Plank(ExerciseBase):
                 cv2.line(image, idx[11], idx[23], thickness=6, color=(255, 0, 0))
                 cv2.line(image, idx[23], idx[27], thickness=6, color=(255, 0, 0))
                 
-                self.current_angle = ang((idx[11], idx[23]), (idx[23], idx[27]))
-                
-                cv2.putText(image, str(round(self.current_angle, 2)),
-                           (idx[23][0] - 40, idx[23][1] - 50),
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.8, color=(0, 255, 0), thickness=3)
+                put_text(image, str(round(self.current_angle, 2)),
+                        (idx[23][0] - 40, idx[23][1] - 50),
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.8, color=(0, 255, 0), thickness=3)
                 
                 # Draw joint circles
                 cv2.circle(image, idx[11], 10, (0, 0, 255), cv2.FILLED)
@@ -49,12 +59,10 @@ class Plank(ExerciseBase):
                 cv2.line(image, idx[12], idx[24], thickness=6, color=(0, 0, 255))
                 cv2.line(image, idx[24], idx[28], thickness=6, color=(0, 0, 255))
                 
-                self.current_angle = ang((idx[12], idx[24]), (idx[24], idx[28]))
-                
-                cv2.putText(image, str(round(self.current_angle, 2)),
-                           (idx[24][0] - 40, idx[24][1] - 50),
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.8, color=(0, 255, 0), thickness=3)
+                put_text(image, str(round(self.current_angle, 2)),
+                        (idx[24][0] - 40, idx[24][1] - 50),
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.8, color=(0, 255, 0), thickness=3)
                 
                 # Draw joint circles
                 cv2.circle(image, idx[12], 10, (0, 0, 255), cv2.FILLED)
@@ -77,9 +85,9 @@ class Plank(ExerciseBase):
                 cv2.rectangle(image, (200, int(bar)), (260, 550), color, cv2.FILLED)
                 
                 # Percentage text
-                cv2.putText(image, f'{int(per)} %', (200, 280), 
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=1.1, color=color, thickness=3)
+                put_text(image, f'{int(per)} %', (200, 280), 
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=1.1, color=color, thickness=3)
         except:
             pass
     
@@ -88,11 +96,11 @@ class Plank(ExerciseBase):
         # Check if angle is good for plank (>170 degrees means good alignment)
         if self.current_angle > 170:
             if self.plank_timer is None:
-                self.plank_timer = time.time()
+                self.plank_timer = self.frame_time
                 logger.info("Plank started")
             else:
                 # Update duration
-                self.plank_duration = time.time() - self.plank_timer
+                self.plank_duration = self.frame_time - self.plank_timer
         else:
             if self.plank_timer is not None:
                 logger.info(f"Plank ended - duration: {self.plank_duration:.1f}s")
@@ -117,12 +125,12 @@ class Plank(ExerciseBase):
         cv2.addWeighted(overlay, 0.4, image, 0.6, 0, image)
         
         # Exercise name
-        cv2.putText(image, "PLANK", 
-                   (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+        put_text(image, "PLANK", 
+                (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
         
         # Duration
-        cv2.putText(image, f"Duration: {self.plank_duration:.1f}s", 
-                   (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        put_text(image, f"Duration: {self.plank_duration:.1f}s", 
+                (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
         
         # Progress indicator
         if self.plank_duration > 0:
@@ -133,15 +141,15 @@ class Plank(ExerciseBase):
         
         # Connection status
         cv2.circle(image, (25, 105), 5, (0, 255, 0), -1)
-        cv2.putText(image, "WebRTC Live", 
-                   (40, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+        put_text(image, "WebRTC Live", 
+                (40, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
         
         # Show timer at top if in position
         if self.plank_timer and 0 in self.idx_to_coordinates:
-            cv2.putText(image, f"Plank Timer: {round(self.plank_duration)} sec",
-                       (self.idx_to_coordinates[0][0] - 60, self.idx_to_coordinates[0][1] - 100),
-                       fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                       fontScale=0.9, color=(0, 255, 0), thickness=3)
+            put_text(image, f"Plank Timer: {round(self.plank_duration)} sec",
+                    (self.idx_to_coordinates[0][0] - 60, self.idx_to_coordinates[0][1] - 100),
+                    fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                    fontScale=0.9, color=(0, 255, 0), thickness=3)
     
     def reset(self):
         """Reset plank tracking stats"""
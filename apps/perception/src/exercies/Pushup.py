@@ -3,6 +3,7 @@ import logging
 import cv2
 import numpy as np
 from src.exercies.ExerciseBase import ExerciseBase
+from src.text_renderer import put_text
 from src.utils import ang, convert_arc, draw_ellipse
 
 logger = logging.getLogger(__name__)
@@ -10,9 +11,17 @@ logger = logging.getLogger(__name__)
 
 class Pushup(ExerciseBase):
     """Pushup exercise detection with visual overlays"""
+
+    JOINT_ANGLES = {
+        'right_elbow': (12, 14, 16),
+        'left_elbow': (11, 13, 15),
+        'right_body': (12, 28, 16),
+        'left_body': (11, 27, 15),
+    }
+    REP_ANGLES = ('right_elbow', 'left_elbow')
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.performed_pushup = False
         self.exercise_name = "pushup"
     
@@ -28,11 +37,11 @@ class Pushup(ExerciseBase):
                 
                 l1 = np.linspace(idx[12], idx[28], 100)
                 l2 = np.linspace(idx[28], idx[16], 100)
-                eang1 = ang((idx[12], idx[28]), (idx[28], idx[16]))
+                eang1 = self.joint_angles['right_body']
                 
-                cv2.putText(image, str(round(eang1, 2)), idx[28],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                put_text(image, str(round(eang1, 2)), idx[28],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[80], l2[20], sagitta=15)
                 axes = (radius, radius)
@@ -44,11 +53,11 @@ class Pushup(ExerciseBase):
                 
                 l1 = np.linspace(idx[11], idx[27], 100)
                 l2 = np.linspace(idx[27], idx[15], 100)
-                eang1 = ang((idx[11], idx[27]), (idx[27], idx[15]))
+                eang1 = self.joint_angles['left_body']
                 
-                cv2.putText(image, str(round(eang1, 2)), idx[27],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                put_text(image, str(round(eang1, 2)), idx[27],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[80], l2[20], sagitta=15)
                 axes = (radius, radius)
@@ -64,11 +73,11 @@ class Pushup(ExerciseBase):
                 
                 l1 = np.linspace(idx[12], idx[14], 100)
                 l2 = np.linspace(idx[14], idx[16], 100)
-                ang1 = ang((idx[12], idx[14]), (idx[14], idx[16]))
+                ang1 = self.joint_angles['right_elbow']
                 
-                cv2.putText(image, "   " + str(round(ang1, 2)), idx[14],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                put_text(image, "   " + str(round(ang1, 2)), idx[14],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[80], l2[20], sagitta=15)
                 axes = (radius, radius)
@@ -86,11 +95,11 @@ class Pushup(ExerciseBase):
                 
                 l1 = np.linspace(idx[11], idx[13], 100)
                 l2 = np.linspace(idx[13], idx[15], 100)
-                ang1 = ang((idx[11], idx[13]), (idx[13], idx[15]))
+                ang1 = self.joint_angles['left_elbow']
                 
-                cv2.putText(image, str(round(ang1, 2)), idx[13],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                put_text(image, str(round(ang1, 2)), idx[13],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[80], l2[20], sagitta=15)
                 axes = (radius, radius)
@@ -115,9 +124,9 @@ class Pushup(ExerciseBase):
                 l2 = np.linspace(idx[16], temp, 100)
                 ang1 = ang((idx[14], idx[16]), (idx[16], temp))
                 
-                cv2.putText(image, "   " + str(round(ang1, 2)), idx[16],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                put_text(image, "   " + str(round(ang1, 2)), idx[16],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[80], l2[20], sagitta=15)
                 axes = (radius, radius)
@@ -132,9 +141,9 @@ class Pushup(ExerciseBase):
                 l2 = np.linspace(idx[15], temp, 100)
                 ang1 = ang((idx[13], idx[15]), (idx[15], temp))
                 
-                cv2.putText(image, "   " + str(round(ang1, 2)), idx[15],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                put_text(image, "   " + str(round(ang1, 2)), idx[15],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[80], l2[20], sagitta=15)
                 axes = (radius, radius)
@@ -153,8 +162,8 @@ class Pushup(ExerciseBase):
                 depth_text = "DOWN" if depth < 300 else "UP"
                 color = (0, 255, 0) if depth < 300 else (0, 165, 255)
                 
-                cv2.putText(image, f"Position: {depth_text}", 
-                           (20, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+                put_text(image, f"Position: {depth_text}", 
+                        (20, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
         except:
             pass
     
@@ -188,15 +197,24 @@ class Pushup(ExerciseBase):
         except:
             pass
     
+    def rep_depth(self):
+        """Vertical shoulder-wrist gap in pixels"""
+        idx = self.idx_to_coordinates
+        shoulder_idx = 12 if 12 in idx else 11
+        wrist_idx = 16 if 16 in idx else 15
+        if shoulder_idx in idx and wrist_idx in idx:
+            return abs(idx[shoulder_idx][1] - idx[wrist_idx][1])
+        return None
+    
     def add_info_overlay(self, image):
         """Add pushup-specific info overlay"""
         super().add_info_overlay(image)
         
         # Add pushup form indicator
         if self.performed_pushup and 0 in self.idx_to_coordinates:
-            cv2.putText(image, "DOWN", 
-                       (self.idx_to_coordinates[0][0] - 30, self.idx_to_coordinates[0][1] - 100),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+            put_text(image, "DOWN", 
+                    (self.idx_to_coordinates[0][0] - 30, self.idx_to_coordinates[0][1] - 100),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
     
     def reset(self):
         """Reset pushup tracking stats"""
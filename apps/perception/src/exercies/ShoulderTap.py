@@ -3,16 +3,22 @@ import logging
 import cv2
 import numpy as np
 from src.exercies.ExerciseBase import ExerciseBase
-from src.utils import ang
+from src.text_renderer import put_text
 
 logger = logging.getLogger(__name__)
 
 
 class ShoulderTap(ExerciseBase):
     """Shoulder tap exercise detection with visual overlays"""
+
+    JOINT_ANGLES = {
+        'left_arm': (11, 13, 15),
+        'right_arm': (12, 14, 16),
+    }
+    REP_ANGLES = ('left_arm', 'right_arm')
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.shoulder_tap_count = 0
         self.exercise_name = "shouldertap"
         self.performed_left_tap = False
@@ -22,6 +28,12 @@ class ShoulderTap(ExerciseBase):
         self.right_arm_angle = 0
         self.last_tap_side = None
     
+    def update_metrics(self):
+        """Shoulder - elbow - wrist angle for both arms"""
+        super().update_metrics()
+        self.left_arm_angle = self.joint_angles.get('left_arm', self.left_arm_angle)
+        self.right_arm_angle = self.joint_angles.get('right_arm', self.right_arm_angle)
+    
     def draw_overlays(self, image, results):
         """Draw shoulder tap-specific visual overlays"""
         idx = self.idx_to_coordinates
@@ -32,12 +44,10 @@ class ShoulderTap(ExerciseBase):
                 cv2.line(image, idx[11], idx[13], thickness=6, color=(255, 255, 0))
                 cv2.line(image, idx[13], idx[15], thickness=6, color=(255, 255, 0))
                 
-                self.left_arm_angle = ang((idx[11], idx[13]), (idx[13], idx[15]))
-                
-                cv2.putText(image, str(round(self.left_arm_angle, 2)),
-                           (idx[13][0] - 40, idx[13][1] - 50),
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.8, color=(0, 255, 0), thickness=3)
+                put_text(image, str(round(self.left_arm_angle, 2)),
+                        (idx[13][0] - 40, idx[13][1] - 50),
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.8, color=(0, 255, 0), thickness=3)
                 
                 # Draw joint circles
                 cv2.circle(image, idx[11], 10, (255, 255, 0), cv2.FILLED)
@@ -58,27 +68,25 @@ class ShoulderTap(ExerciseBase):
                 # Progress bar
                 cv2.rectangle(image, (50, int(bar_y)), (110, 450), c1, cv2.FILLED)
                 # Percentage text
-                cv2.putText(image, f'L: {int(per)}%', (50, 180), 
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.7, color=c1, thickness=2)
+                put_text(image, f'L: {int(per)}%', (50, 180), 
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.7, color=c1, thickness=2)
                 
                 # Draw tap indicator
                 if self.left_arm_angle < 120:
-                    cv2.putText(image, "LEFT TAP!", 
-                               (idx[15][0] - 30, idx[15][1] - 20),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+                    put_text(image, "LEFT TAP!", 
+                            (idx[15][0] - 30, idx[15][1] - 20),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
             
             # Draw shoulder - elbow - wrist angle for right arm
             if 12 in idx and 14 in idx and 16 in idx:
                 cv2.line(image, idx[12], idx[14], thickness=6, color=(255, 0, 255))
                 cv2.line(image, idx[14], idx[16], thickness=6, color=(255, 0, 255))
                 
-                self.right_arm_angle = ang((idx[12], idx[14]), (idx[14], idx[16]))
-                
-                cv2.putText(image, str(round(self.right_arm_angle, 2)),
-                           (idx[14][0] - 40, idx[14][1] - 50),
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.8, color=(0, 255, 0), thickness=3)
+                put_text(image, str(round(self.right_arm_angle, 2)),
+                        (idx[14][0] - 40, idx[14][1] - 50),
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.8, color=(0, 255, 0), thickness=3)
                 
                 # Draw joint circles
                 cv2.circle(image, idx[12], 10, (255, 0, 255), cv2.FILLED)
@@ -99,25 +107,25 @@ class ShoulderTap(ExerciseBase):
                 # Progress bar
                 cv2.rectangle(image, (150, int(bar_y)), (210, 450), c2, cv2.FILLED)
                 # Percentage text
-                cv2.putText(image, f'R: {int(per)}%', (150, 180), 
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.7, color=c2, thickness=2)
+                put_text(image, f'R: {int(per)}%', (150, 180), 
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.7, color=c2, thickness=2)
                 
                 # Draw tap indicator
                 if self.right_arm_angle < 120:
-                    cv2.putText(image, "RIGHT TAP!", 
-                               (idx[16][0] - 30, idx[16][1] - 20),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
+                    put_text(image, "RIGHT TAP!", 
+                            (idx[16][0] - 30, idx[16][1] - 20),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
             
             # Draw target circles on shoulders
             if 11 in idx:
                 cv2.circle(image, idx[11], 30, (255, 255, 0), 3)
-                cv2.putText(image, "L", (idx[11][0] - 8, idx[11][1] + 5),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
+                put_text(image, "L", (idx[11][0] - 8, idx[11][1] + 5),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
             if 12 in idx:
                 cv2.circle(image, idx[12], 30, (255, 0, 255), 3)
-                cv2.putText(image, "R", (idx[12][0] - 8, idx[12][1] + 5),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 255), 2)
+                put_text(image, "R", (idx[12][0] - 8, idx[12][1] + 5),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 255), 2)
         except:
             pass
     
@@ -145,6 +153,9 @@ class ShoulderTap(ExerciseBase):
                 self.performed_right_tap = False
                 logger.info(f"Right shoulder tap completed: {self.shoulder_tap_count}")
     
+    def rep_total(self) -> int:
+        return self.shoulder_tap_count
+    
     def get_stats(self) -> dict:
         """Get current exercise statistics"""
         return {
@@ -164,33 +175,33 @@ class ShoulderTap(ExerciseBase):
         cv2.addWeighted(overlay, 0.4, image, 0.6, 0, image)
         
         # Exercise name
-        cv2.putText(image, "SHOULDER TAPS", 
-                   (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+        put_text(image, "SHOULDER TAPS", 
+                (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
         
         # Tap counter
-        cv2.putText(image, f"Taps: ", 
-                   (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        cv2.putText(image, f"{self.shoulder_tap_count}", 
-                   (100, 70), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 3)
+        put_text(image, f"Taps: ", 
+                (20, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        put_text(image, f"{self.shoulder_tap_count}", 
+                (100, 70), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 3)
         
         # Last tap side
         if self.last_tap_side:
             side_text = "LEFT" if self.last_tap_side == "left" else "RIGHT"
             color = (255, 255, 0) if self.last_tap_side == "left" else (255, 0, 255)
-            cv2.putText(image, f"Last: {side_text}", 
-                       (200, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+            put_text(image, f"Last: {side_text}", 
+                    (200, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
         
         # Connection status
         cv2.circle(image, (25, 105), 5, (0, 255, 0), -1)
-        cv2.putText(image, "WebRTC Live", 
-                   (40, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+        put_text(image, "WebRTC Live", 
+                (40, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
         
         # Show tap count at top
         if 0 in self.idx_to_coordinates:
-            cv2.putText(image, f"Taps: {self.shoulder_tap_count}",
-                       (self.idx_to_coordinates[0][0] - 80, self.idx_to_coordinates[0][1] - 100),
-                       fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                       fontScale=1.2, color=(0, 255, 0), thickness=3)
+            put_text(image, f"Taps: {self.shoulder_tap_count}",
+                    (self.idx_to_coordinates[0][0] - 80, self.idx_to_coordinates[0][1] - 100),
+                    fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                    fontScale=1.2, color=(0, 255, 0), thickness=3)
     
     def reset(self):
         """Reset shoulder tap tracking stats"""
@@ -3,16 +3,27 @@ import logging
 import cv2
 import numpy as np
 from src.exercies.ExerciseBase import ExerciseBase
-from src.utils import ang, convert_arc, draw_ellipse
+from src.text_renderer import put_text
+from src.utils import convert_arc, draw_ellipse
 
 logger = logging.getLogger(__name__)
 
 
 class Squat(ExerciseBase):
     """Squat exercise detection with visual overlays"""
+
+    JOINT_ANGLES = {
+        'right_knee': (24, 26, 28),
+        'left_knee': (23, 25, 27),
+        'right_elbow': (12, 14, 16),
+        'left_elbow': (11, 13, 15),
+        'right_back': (12, 24, 26),
+        'left_back': (11, 23, 25),
+    }
+    REP_ANGLES = ('right_knee', 'left_knee')
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.performed_squat = False
         self.exercise_name = "squat"
     
@@ -30,10 +41,10 @@ class Squat(ExerciseBase):
                 cv2.line(image, (int(l2[0][0]), int(l2[0][1])), (int(l2[30][0]), int(l2[30][1])), 
                         thickness=4, color=(0, 0, 255))
                 
-                ang1 = ang((idx[24], idx[26]), (idx[26], idx[28]))
-                cv2.putText(image, str(round(ang1, 2)), idx[26],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                ang1 = self.joint_angles['right_knee']
+                put_text(image, str(round(ang1, 2)), idx[26],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[90], l2[10], sagitta=15)
                 axes = (radius, radius)
@@ -48,10 +59,10 @@ class Squat(ExerciseBase):
                 cv2.line(image, (int(l2[0][0]), int(l2[0][1])), (int(l2[30][0]), int(l2[30][1])), 
                         thickness=4, color=(0, 0, 255))
                 
-                ang2 = ang((idx[23], idx[25]), (idx[25], idx[27]))
-                cv2.putText(image, str(round(ang2, 2)), idx[25],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                ang2 = self.joint_angles['left_knee']
+                put_text(image, str(round(ang2, 2)), idx[25],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[90], l2[10], sagitta=15)
                 axes = (radius, radius)
@@ -69,10 +80,10 @@ class Squat(ExerciseBase):
                 cv2.line(image, (int(l2[0][0]), int(l2[0][1])), (int(l2[30][0]), int(l2[30][1])), 
                         thickness=4, color=(0, 0, 255))
                 
-                eang1 = ang((idx[12], idx[14]), (idx[14], idx[16]))
-                cv2.putText(image, str(round(eang1, 2)), idx[14],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                eang1 = self.joint_angles['right_elbow']
+                put_text(image, str(round(eang1, 2)), idx[14],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[80], l2[20], sagitta=15)
                 axes = (radius, radius)
@@ -86,10 +97,10 @@ class Squat(ExerciseBase):
                 cv2.line(image, (int(l2[0][0]), int(l2[0][1])), (int(l2[30][0]), int(l2[30][1])), 
                         thickness=4, color=(0, 0, 255))
                 
-                eang2 = ang((idx[11], idx[13]), (idx[13], idx[15]))
-                cv2.putText(image, str(round(eang2, 2)), idx[13],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                eang2 = self.joint_angles['left_elbow']
+                put_text(image, str(round(eang2, 2)), idx[13],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[80], l2[20], sagitta=15)
                 axes = (radius, radius)
@@ -107,10 +118,10 @@ class Squat(ExerciseBase):
                 cv2.line(image, (int(l2[0][0]), int(l2[0][1])), (int(l2[30][0]), int(l2[30][1])), 
                         thickness=4, color=(0, 0, 255))
                 
-                bang1 = ang((idx[12], idx[24]), (idx[24], idx[26]))
-                cv2.putText(image, str(round(bang1, 2)), idx[24],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                bang1 = self.joint_angles['right_back']
+                put_text(image, str(round(bang1, 2)), idx[24],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[90], l2[10], sagitta=15)
                 axes = (radius, radius)
@@ -123,10 +134,10 @@ class Squat(ExerciseBase):
                 cv2.line(image, (int(l2[0][0]), int(l2[0][1])), (int(l2[30][0]), int(l2[30][1])), 
                         thickness=4, color=(0, 0, 255))
                 
-                bang2 = ang((idx[11], idx[23]), (idx[23], idx[25]))
-                cv2.putText(image, str(round(bang2, 2)), idx[23],
-                           fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                           fontScale=0.6, color=(0, 255, 0), thickness=2)
+                bang2 = self.joint_angles['left_back']
+                put_text(image, str(round(bang2, 2)), idx[23],
+                        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+                        fontScale=0.6, color=(0, 255, 0), thickness=2)
                 
                 center, radius, start_angle, end_angle = convert_arc(l1[90], l2[10], sagitta=15)
                 axes = (radius, radius)
@@ -149,9 +160,9 @@ class Squat(ExerciseBase):
                 depth_text = "DEEP" if depth < 35 else "PARTIAL"
                 color = (0, 255, 0) if depth < 35 else (0, 165, 255)
                 
-                cv2.putText(image, f"Depth: {depth:.0f}px ({depth_text})", 
-                           (idx[hip_idx][0] + 10, idx[hip_idx][1] - 10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                put_text(image, f"Depth: {depth:.0f}px ({depth_text})", 
+                        (idx[hip_idx][0] + 10, idx[hip_idx][1] - 10), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
         except:
             pass
     
@@ -185,15 +196,24 @@ class Squat(ExerciseBase):
         except:
             pass
     
+    def rep_depth(self):
+        """Vertical hip-knee gap in pixels"""
+        idx = self.idx_to_coordinates
+        hip_idx = 24 if 24 in idx else 23
+        knee_idx = 26 if 26 in idx else 25
+        if hip_idx in idx and knee_idx in idx:
+            return abs(idx[hip_idx][1] - idx[knee_idx][1])
+        return None
+    
     def add_info_overlay(self, image):
         """Add squat-specific info overlay"""
         super().add_info_overlay(image)
         
         # Add squat-specific info if in position
         if self.performed_squat and 0 in self.idx_to_coordinates:
-            cv2.putText(image, "IN POSITION", 
-                       (self.idx_to_coordinates[0][0] - 50, self.idx_to_coordinates[0][1] - 100),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+            put_text(image, "IN POSITION", 
+                    (self.idx_to_coordinates[0][0] - 50, self.idx_to_coordinates[0][1] - 100),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
     
     def reset(self):
         """Reset squat tracking stats"""
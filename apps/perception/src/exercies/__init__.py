@@ -1,32 +1,71 @@
 """
 Exercise classes for WebRTC perception app
+
+Exercises are plugins: each module in this package (besides ExerciseBase)
+defines a class of the same name, registered under the lower-cased module
+name (ShoulderTap.py -> 'shouldertap'). Modules are found by listing the
+package and imported only when their exercise is first selected, so adding
+an exercise costs nothing at startup.
 """
 
-from src.exercies.Squat import Squat
-from src.exercies.Plank import Plank
-from src.exercies.Pushup import Pushup
-from src.exercies.Lunges import Lunges
-from src.exercies.ShoulderTap import ShoulderTap
+import importlib
+import pkgutil
+from collections.abc import Mapping
+from typing import Dict
+
+
+class ExerciseRegistry(Mapping):
+    """Exercise name -> class, importing each plugin module on first lookup"""
+
+    def __init__(self, package: str, path):
+        self.package = package
+        self.modules = {
+            info.name.lower(): info.name
+            for info in pkgutil.iter_modules(path)
+            if info.name != "ExerciseBase"
+        }
+        self.loaded = {}
+
+    def __getitem__(self, name: str):
+        key = name.lower()
+        if key not in self.loaded:
+            module_name = self.modules[key]
+            module = importlib.import_module(f"{self.package}.{module_name}")
+            self.loaded[key] = getattr(module, module_name)
+        return self.loaded[key]
+
+    def __contains__(self, name) -> bool:
+        return isinstance(name, str) and name.lower() in self.modules
+
+    def __iter__(self):
+        return iter(self.modules)
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    def requirements(self, name: str) -> Dict:
+        """Landmark indices and joint angles the exercise declares"""
+        exercise_class = self[name]
+        return {
+            "landmarks": list(exercise_class.LANDMARKS),
+            "joint_angles": dict(exercise_class.JOINT_ANGLES),
+        }
+
 
-# Map exercise names to classes
-EXERCISE_CLASSES = {
-    'squat': Squat,
-    'plank': Plank,
-    'pushup': Pushup,
-    'lunges': Lunges,
-    'shouldertap': ShoulderTap,
-}
+# Map exercise names to classes, loaded lazily. Always imported through the
+# src package, like the exercise modules themselves, so each class exists once
+EXERCISE_CLASSES = ExerciseRegistry("src.exercies", __path__)
 
 
-def get_exercise_processor(exercise_type: str):
+def get_exercise_processor(exercise_type: str, **kwargs):
     """
     Factory function to get the appropriate exercise processor
     Falls back to Squat if exercise type not found
+    Keyword arguments go to the processor, e.g. use_pose=False for landmark-only tracking
     """
-    exercise_class = EXERCISE_CLASSES.get(exercise_type.lower())
-    if exercise_class:
-        return exercise_class()
+    if exercise_type in EXERCISE_CLASSES:
+        return EXERCISE_CLASSES[exercise_type](**kwargs)
     else:
         # Fallback to squat for now
         print(f"Warning: Exercise '{exercise_type}' not implemented yet, using Squat")
-        return Squat()
\ No newline at end of file
+        return EXERCISE_CLASSES['squat'](**kwargs)
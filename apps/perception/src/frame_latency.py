@@ -0,0 +1,117 @@
+import bisect
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Histogram bucket upper bounds in milliseconds, the last bucket is open-ended
+LATENCY_BUCKETS_MS = (5, 10, 20, 33, 50, 75, 100, 150, 200, 300, 500, 1000)
+
+# Frame marker: a guard pair (white, black) then 32 bits per row, three rows
+MARKER_BITS = 32
+MARKER_GUARD = (255, 0)
+
+
+class LatencyHistogram:
+    """Capture-to-stage latency of the frames passing one pipeline stage
+
+    Bucket counts and the maximum cover the whole session; percentiles come
+    from the most recent ``window`` samples so they follow current load.
+    """
+
+    def __init__(self, window: int = 300):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.recent: deque = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def record(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.recent.append(ms)
+        self.count += 1
+        self.total += ms
+        self.worst = max(self.worst, ms)
+
+    def stats(self) -> Dict:
+        if not self.count:
+            return {"count": 0}
+        p50, p95, p99 = np.percentile(self.recent, (50, 95, 99))
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 1),
+            "p50_ms": round(float(p50), 1),
+            "p95_ms": round(float(p95), 1),
+            "p99_ms": round(float(p99), 1),
+            "max_ms": round(self.worst, 1),
+            # Upper bound in ms -> frames, "inf" for the open-ended bucket
+            "buckets": {
+                str(bound): n
+                for bound, n in zip(LATENCY_BUCKETS_MS + ("inf",), self.counts)
+                if n
+            },
+        }
+
+
+def marker_block(width: int) -> int:
+    """Side of one marker bit in pixels, scaled with the output width"""
+    return max(4, width // 40)
+
+
+def marker_check(seq: int, capture_wall_ms: int) -> int:
+    return ~(seq ^ capture_wall_ms) & 0xFFFFFFFF
+
+
+def stamp_frame_marker(frame: np.ndarray, seq: int, capture_wall_ms: int):
+    """Draw the frame's sequence number and capture wall-clock time into its top-left corner
+
+    Three rows of square blocks (white = 1), each row a white/black guard
+    pair then 32 bits, most significant first: the sequence number, the
+    capture time in Unix milliseconds modulo 2**32, and a check word (the
+    inverted XOR of the two) that rejects markers damaged by encoding.
+    Blocks are large enough to survive encoding. A receiver with a
+    synchronized clock decodes the marker when the frame is displayed
+    (``read_frame_marker``) for the capture-to-display latency.
+    """
+    height, width = frame.shape[:2]
+    block = marker_block(width)
+    if (MARKER_BITS + len(MARKER_GUARD)) * block > width or 3 * block > height:
+        return
+
+    seq &= 0xFFFFFFFF
+    for row, value in enumerate((seq, capture_wall_ms, marker_check(seq, capture_wall_ms))):
+        values = list(MARKER_GUARD) + [
+            255 if (value >> (MARKER_BITS - 1 - bit)) & 1 else 0 for bit in range(MARKER_BITS)
+        ]
+        strip = np.repeat(np.array(values, dtype=np.uint8), block)
+        frame[row * block:(row + 1) * block, :strip.size] = strip[None, :, None] if frame.ndim == 3 else strip
+
+
+def read_frame_marker(gray: np.ndarray) -> Optional[Tuple[int, int]]:
+    """(seq, capture wall ms mod 2**32) from a decoded grayscale frame, None if unmarked"""
+    height, width = gray.shape[:2]
+    block = marker_block(width)
+    count = MARKER_BITS + len(MARKER_GUARD)
+    if count * block > width or 3 * block > height:
+        return None
+
+    values = []
+    for row in range(3):
+        # Sample the middle of each block, away from blurred edges
+        centre = row * block + block // 2
+        inset = max(1, block // 4)
+        band = gray[centre - inset:centre + inset + 1, :count * block].astype(np.float32)
+        levels = band.reshape(band.shape[0], count, block)[:, :, inset:block - inset].mean(axis=(0, 2))
+        bits = levels > 127
+        if not bits[0] or bits[1]:
+            return None
+        value = 0
+        for bit in bits[len(MARKER_GUARD):]:
+            value = (value << 1) | int(bit)
+        values.append(value)
+
+    seq, capture_wall_ms, check = values
+    if check != marker_check(seq, capture_wall_ms):
+        return None
+    return seq, capture_wall_ms
@@ -0,0 +1,221 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Exercise processor methods timed while profiling (inclusive times)
+EXERCISE_METHODS = (
+    "process_frame", "prepare_frame", "infer", "render_frame",
+    "get_idx_to_coordinates", "update_metrics",
+    "draw_overlays", "update_tracking", "track_exercise", "add_info_overlay",
+)
+
+
+class MethodTimer:
+    """Call count and wall time per method, wrapped onto one processor instance"""
+
+    def __init__(self):
+        self.stats: Dict[str, list] = {}
+        self.wrapped = []
+        self.lock = threading.Lock()
+
+    def attach(self, target, names, prefix: str = ""):
+        for name in names:
+            method = getattr(target, name, None)
+            if method is None or name in vars(target):
+                continue
+            setattr(target, name, self.timed(prefix + name, method))
+            self.wrapped.append((target, name))
+
+    def timed(self, label: str, method):
+        stats = self.stats.setdefault(label, [0, 0.0, 0.0])
+        lock = self.lock
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with lock:
+                    stats[0] += 1
+                    stats[1] += elapsed
+                    stats[2] = max(stats[2], elapsed)
+
+        return wrapper
+
+    def detach(self):
+        """Put the class methods back (the wrappers were instance attributes)"""
+        for target, name in self.wrapped:
+            try:
+                delattr(target, name)
+            except AttributeError:
+                pass
+        self.wrapped = []
+
+    def report(self) -> Dict[str, Dict]:
+        return {
+            label: {
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total / calls * 1000, 3) if calls else 0.0,
+                "max_ms": round(worst * 1000, 3),
+            }
+            for label, (calls, total, worst) in sorted(self.stats.items(), key=lambda kv: -kv[1][1])
+            if calls
+        }
+
+
+_WRAPPER_CODE = MethodTimer().timed("", len).__code__
+
+
+class StackSampler:
+    """Samples the Python stacks of all other threads at a fixed interval
+
+    Stacks are counted in collapsed form (``thread;outer;...;inner``), the
+    input format of flamegraph.pl and speedscope. Sampling only reads frame
+    objects, the profiled code runs unmodified.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="stack-sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        me = threading.get_ident()
+        names: Dict[int, str] = {}
+        while self.running:
+            frames = sys._current_frames()
+            if len(names) != len(frames):
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == me:
+                    continue
+                self.counts[self.collapse(names.get(ident, str(ident)), frame)] += 1
+            del frames
+            self.samples += 1
+            time.sleep(self.interval)
+
+    @staticmethod
+    def collapse(thread_name: str, frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            frame = frame.f_back
+            # Leave MethodTimer's wrappers out, they are not part of the profiled code
+            if code is _WRAPPER_CODE:
+                continue
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        stack.append(thread_name)
+        return ";".join(reversed(stack))
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top_functions(self, limit: int = 10):
+        """Leaf (self time) share per thread and function, busiest first
+
+        Idle threads show up as their waiting frame (the event loop's
+        select, the camera's sleep), so shares are per sampled thread time.
+        """
+        leaves: Counter = Counter()
+        for stack, count in self.counts.items():
+            thread, _, rest = stack.partition(";")
+            leaves[f"{thread}: {rest.rsplit(';', 1)[-1]}"] += count
+        total = sum(leaves.values()) or 1
+        return [(name, round(100 * count / total, 1)) for name, count in leaves.most_common(limit)]
+
+
+class FrameLoopProfiler:
+    """On-demand profiling of the live frame loop, without restarting the session
+
+    For the requested number of seconds it samples every thread's stack
+    (the event loop thread running the video tracks' ``recv``, the analysis
+    stage threads, the camera thread) and times the exercise processor's
+    methods. Writes a collapsed-stack file and a JSON
+    file of method timings to ``out_dir``. One profile runs at a time.
+    """
+
+    def __init__(self, out_dir: str = "profiles", interval: float = 0.005):
+        self.out_dir = out_dir
+        self.interval = interval
+        self.active = False
+
+    async def profile(self, seconds: float, exercise_processor=None, label: str = "session") -> Optional[Dict]:
+        """Profile for ``seconds``, returns the output paths and a summary (None if already running)"""
+        if self.active:
+            logger.warning("Profiler already running")
+            return None
+
+        self.active = True
+        sampler = StackSampler(self.interval)
+        timer = MethodTimer()
+        try:
+            if exercise_processor is not None:
+                timer.attach(exercise_processor, EXERCISE_METHODS)
+                timer.attach(exercise_processor.skeleton, ("draw",), prefix="skeleton.")
+
+            logger.info(f"🔬 Profiling the frame loop for {seconds:g}s")
+            started = time.monotonic()
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                sampler.stop()
+                timer.detach()
+            elapsed = time.monotonic() - started
+
+            return await asyncio.to_thread(self.save, sampler, timer, label, elapsed)
+        finally:
+            self.active = False
+
+    def save(self, sampler: StackSampler, timer: MethodTimer, label: str, elapsed: float) -> Dict:
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, f"{label}-{time.strftime('%Y%m%d-%H%M%S')}")
+        stacks_path = f"{base}.folded"
+        methods_path = f"{base}-methods.json"
+
+        sampler.write(stacks_path)
+        methods = timer.report()
+        top = sampler.top_functions()
+        with open(methods_path, "w") as f:
+            json.dump({"seconds": round(elapsed, 3), "samples": sampler.samples,
+                       "methods": methods, "top_self": top}, f, indent=2)
+
+        logger.info(f"🔬 Profile written: {stacks_path} ({sampler.samples} samples), {methods_path}")
+        for name, share in top[:5]:
+            logger.info(f"   {share:5.1f}%  {name}")
+
+        return {
+            "stacks": stacks_path,
+            "methods_file": methods_path,
+            "seconds": round(elapsed, 3),
+            "samples": sampler.samples,
+            "methods": methods,
+            "top_self": top,
+        }
@@ -0,0 +1,294 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from frame_latency import LatencyHistogram
+from stage_queue import DROP_OLDEST, StageQueue
+
+logger = logging.getLogger(__name__)
+
+# Share of a stage's frames dropped, or of a worker's time spent working,
+# above which that stage is reported as the bottleneck
+DROP_LIMIT = 0.1
+BUSY_LIMIT = 0.8
+
+
+class PipelineStage:
+    """One worker thread of the analysis pipeline
+
+    Takes (payload, capture time, seq) items from ``source``, applies
+    ``work`` to the payload and hands the result to ``sink``. With
+    ``min_interval`` set, items are taken no faster than that, which caps
+    the rate of the whole pipeline behind it. With ``downstream`` set, the
+    next item is only taken once that queue has room, so a stage never
+    works on frames the slower stage after it would drop; the camera's
+    queue drops them instead, before any work was spent on them.
+    """
+
+    def __init__(self, name: str, work: Callable, source: StageQueue, sink: Callable,
+                 min_interval: float = 0.0, downstream: Optional[StageQueue] = None):
+        self.name = name
+        self.work = work
+        self.source = source
+        self.sink = sink
+        self.min_interval = min_interval
+        self.downstream = downstream
+        self.busy_time = 0.0
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def join(self):
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        while self.running:
+            if self.downstream and not self.downstream.wait_for_space(timeout=0.1):
+                continue
+            taken = time.monotonic()
+            item = self.source.get(timeout=0.1)
+            if item is None:
+                continue
+
+            payload, capture_time, seq = item
+            started = time.perf_counter()
+            try:
+                payload = self.work(payload)
+            except Exception as e:
+                logger.error(f"Error in {self.name} stage: {e}")
+                payload = None
+            self.busy_time += time.perf_counter() - started
+
+            if payload is not None and self.running:
+                self.sink((payload, capture_time, seq))
+
+            if self.min_interval:
+                time.sleep(max(0.0, self.min_interval - (time.monotonic() - taken)))
+
+
+class AnalysedFrameProducer:
+    """Single analysed-frame producer for a session
+
+    Pulls the newest camera frame, runs the exercise processor on it exactly
+    once and publishes the result. Any number of subscriber video tracks read
+    the latest analysed frame, each at its own resolution and framerate, so
+    extra viewers never add inference work or double-count reps.
+
+    Analysis runs on worker threads (MediaPipe and OpenCV release the GIL)
+    so the event loop stays free for networking. Pipelined, each frame
+    passes three stages on their own threads: prepare (mirror, colour
+    conversion), inference and render (metrics, rep counting, overlays).
+    While frame t is in inference, t-1 is being drawn and t+1 prepared, so
+    throughput follows the slowest stage rather than the sum of all of
+    them, at the cost of a frame waiting up to one inference time between
+    stages. That only pays off with cores to spare, so PIPELINED defaults
+    to on with more than one CPU and a single worker otherwise.
+
+    Stages hand frames on through bounded ``StageQueue``s: the camera's
+    queue feeds the first stage, and every subscribed video track gets its
+    own queue of analysed frames. Video queues drop the oldest frame, so a
+    slow stage costs frames rather than latency, and their counters tell
+    whether a session is camera-, inference- or encoder-bound
+    (``pipeline_stats``).
+    """
+
+    def __init__(self, threaded_camera, exercise_processor=None, draw: bool = True,
+                 on_analysed: Optional[Callable] = None, max_fps: float = 30,
+                 pipelined: Optional[bool] = None):
+        self.threaded_camera = threaded_camera
+        self.exercise_processor = exercise_processor
+        self.draw = draw
+        self.on_analysed = on_analysed
+        self.max_fps = max_fps
+        self.frame_count = 0
+
+        if pipelined is None:
+            setting = os.getenv("PIPELINED", "")
+            pipelined = setting == "1" if setting else (os.cpu_count() or 1) > 1
+        self.pipelined = pipelined and exercise_processor is not None
+
+        # (BGR frame, monotonic capture time, camera sequence number)
+        self.latest = (None, 0.0, None)
+        self.stages: List[PipelineStage] = []
+        # Queues between the pipelined stages
+        self.handoffs: List[StageQueue] = []
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Analysed frames for each subscribed video track
+        self.outputs: List[StageQueue] = []
+        self.output_size = int(os.getenv("ENCODER_QUEUE_SIZE", "1"))
+        self.output_policy = os.getenv("ENCODER_QUEUE_POLICY", DROP_OLDEST)
+
+        # Capture to analysed (flip, inference and overlays done), per frame
+        self.latency = LatencyHistogram()
+        # Counters at the last stats window
+        self.window = self.snapshot()
+
+    def start(self):
+        if self.stages:
+            return
+
+        self.loop = asyncio.get_running_loop()
+        # Frames captured before the session are stale
+        camera = self.threaded_camera.frames
+        camera.clear()
+        camera.reset_stats()
+
+        interval = 1 / self.max_fps
+        if self.pipelined:
+            processor = self.exercise_processor
+            prepared = StageQueue("prepared", 1, DROP_OLDEST)
+            inferred = StageQueue("inferred", 2, DROP_OLDEST)
+            self.handoffs = [prepared, inferred]
+            self.stages = [
+                PipelineStage("prepare", processor.prepare_frame, camera, prepared.put, interval, prepared),
+                PipelineStage("inference", self.infer, prepared, inferred.put, downstream=inferred),
+                PipelineStage("render", self.render, inferred, self.publish),
+            ]
+        else:
+            self.stages = [PipelineStage("analysis", self.analyse, camera, self.publish, interval)]
+
+        self.window = self.snapshot()
+        for stage in self.stages:
+            stage.start()
+
+    def subscribe(self, name: str) -> StageQueue:
+        """Queue of analysed frames for one consumer (a viewer's video track)"""
+        output = StageQueue(f"encoder:{name}", self.output_size, self.output_policy)
+        self.outputs.append(output)
+        return output
+
+    def unsubscribe(self, output: StageQueue):
+        if output in self.outputs:
+            self.outputs.remove(output)
+
+    async def stop(self):
+        for stage in self.stages:
+            stage.stop()
+        # Let a frame still in flight finish, off the event loop: the
+        # processor may be reused by the next session as soon as we return
+        for stage in self.stages:
+            await asyncio.to_thread(stage.join)
+        self.stages = []
+
+    def analyse(self, frame):
+        """Run the processor on one frame (single worker)"""
+        if not self.exercise_processor:
+            return frame
+
+        try:
+            frame, _ = self.exercise_processor.process_frame(frame, draw=self.draw)
+        except Exception as e:
+            logger.error(f"Error processing frame: {e}")
+        return frame
+
+    def infer(self, prepared):
+        image, image_rgb = prepared
+        return image, self.exercise_processor.infer(image_rgb)
+
+    def render(self, inferred):
+        image, results = inferred
+        image, _ = self.exercise_processor.render_frame(image, results, draw=self.draw)
+        return image
+
+    def publish(self, item):
+        """Last stage's output, called on its thread: hand it to the event loop"""
+        try:
+            self.loop.call_soon_threadsafe(self.deliver, item)
+        except RuntimeError:
+            # Event loop already closed during shutdown
+            pass
+
+    def deliver(self, item):
+        self.frame_count += 1
+        self.latency.record(time.monotonic() - item[1])
+        if self.on_analysed:
+            self.on_analysed(item[0])
+
+        self.latest = item
+        for output in self.outputs:
+            output.put(item)
+
+    def snapshot(self) -> Dict:
+        return {
+            "time": time.monotonic(),
+            "frames": self.frame_count,
+            "busy": {stage.name: stage.busy_time for stage in self.stages},
+            "camera": self.threaded_camera.frames.stats() if self.threaded_camera else None,
+            "handoffs": {queue.name: queue.stats() for queue in self.handoffs},
+            "outputs": {output.name: output.stats() for output in self.outputs},
+        }
+
+    def pipeline_stats(self) -> Dict:
+        """Queue depths and counters per stage, and the likely bottleneck
+
+        Rates and the bottleneck are computed over the time since the
+        previous call, counters are cumulative for the session.
+        """
+        previous, current = self.window, self.snapshot()
+        self.window = current
+        elapsed = max(current["time"] - previous["time"], 1e-6)
+
+        frames = current["frames"] - previous["frames"]
+        gate = getattr(self.exercise_processor, "motion_gate", None)
+        busy = {
+            name: (total - previous["busy"].get(name, 0.0)) / elapsed
+            for name, total in current["busy"].items()
+        }
+        busiest = max(busy.values(), default=0.0)
+        camera = current["camera"]
+
+        def dropped_share(now: Dict, before: Optional[Dict]) -> float:
+            put = now["put"] - (before["put"] if before else 0)
+            dropped = now["dropped"] - (before["dropped"] if before else 0)
+            return dropped / put if put else 0.0
+
+        # Frames dropped in front of any analysis stage
+        camera_drops = max(
+            [dropped_share(camera, previous["camera"])]
+            + [dropped_share(stats, previous["handoffs"].get(name)) for name, stats in current["handoffs"].items()]
+        )
+        encoder_drops = max(
+            (dropped_share(stats, previous["outputs"].get(name)) for name, stats in current["outputs"].items()),
+            default=0.0,
+        )
+
+        if encoder_drops > DROP_LIMIT:
+            bottleneck = "encoder"
+        elif busiest > BUSY_LIMIT and camera_drops > DROP_LIMIT:
+            bottleneck = "inference"
+        elif frames / elapsed < 0.9 * self.max_fps and busiest < BUSY_LIMIT:
+            bottleneck = "camera"
+        else:
+            bottleneck = None
+
+        return {
+            "camera": camera,
+            "analysis": {
+                "fps": round(frames / elapsed, 1),
+                "busy": {name: round(share, 2) for name, share in busy.items()},
+                "analysed": current["frames"],
+                "handoffs": current["handoffs"],
+                "motion_gate": gate.stats() if gate else None,
+            },
+            "encoders": current["outputs"],
+            "latency": {"analysed": self.latency.stats()},
+            "bottleneck": bottleneck,
+        }
+
+    def get_frame(self):
+        """Return the latest analysed frame, same shape as ThreadedCamera.get_frame"""
+        frame, capture_time, seq = self.latest
+        return frame is not None, frame, capture_time, seq
@@ -0,0 +1,145 @@
+import logging
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Block layout: header, one (seq, capture time) record per slot, then the frames
+HEADER_DTYPE = np.dtype([("written", "<u8"), ("slots", "<u4"), ("height", "<u4"),
+                         ("width", "<u4"), ("channels", "<u4")])
+SLOT_DTYPE = np.dtype([("seq", "<u8"), ("capture_time", "<f8")])
+ALIGN = 64
+
+
+def _aligned(size: int) -> int:
+    return (size + ALIGN - 1) // ALIGN * ALIGN
+
+
+class SharedFrameRing:
+    """Ring of preallocated frame slots in shared memory
+
+    One writer (the camera thread) and any number of readers, in this or
+    other processes. Frames never go through pickling or a queue: the writer
+    copies each capture into the next slot and readers map the same memory.
+
+    Each slot is guarded by a seqlock. The writer makes the slot's sequence
+    odd while it writes and even when done; a reader checks the sequence
+    before and after using a slot and discards the frame if it changed. No
+    lock is ever taken, a slow reader can only miss frames, never block the
+    camera. With ``slots`` slots a reader has ``slots - 1`` frame periods to
+    use a zero-copy view before the writer comes back round to it.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=shm.buf)[0]
+        self.slots = int(self.header["slots"])
+        self.shape = (int(self.header["height"]), int(self.header["width"]), int(self.header["channels"]))
+
+        meta_offset = _aligned(HEADER_DTYPE.itemsize)
+        frames_offset = meta_offset + _aligned(self.slots * SLOT_DTYPE.itemsize)
+        self.meta = np.ndarray((self.slots,), dtype=SLOT_DTYPE, buffer=shm.buf, offset=meta_offset)
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=shm.buf,
+                                 offset=frames_offset)
+
+    @classmethod
+    def create(cls, shape: Tuple[int, int, int] = (480, 640, 3), slots: int = 4,
+               name: Optional[str] = None) -> "SharedFrameRing":
+        """Allocate a new ring, the creator unlinks it on close"""
+        size = (_aligned(HEADER_DTYPE.itemsize) + _aligned(slots * SLOT_DTYPE.itemsize)
+                + slots * int(np.prod(shape)))
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=shm.buf)
+        header[0] = (0, slots, *shape)
+        np.ndarray((slots,), dtype=SLOT_DTYPE, buffer=shm.buf,
+                   offset=_aligned(HEADER_DTYPE.itemsize))[:] = (0, 0.0)
+        logger.info(f"🧩 Shared frame ring '{shm.name}': {slots} x {shape}")
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedFrameRing":
+        """Map an existing ring from another process"""
+        # Worker processes started by the app share its resource tracker,
+        # so the block is unlinked once, by the owner
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def written(self) -> int:
+        return int(self.header["written"])
+
+    def write(self, frame: np.ndarray, capture_time: float) -> int:
+        """Copy a frame into the next slot, returns its frame number (from 1)"""
+        number = self.written + 1
+        slot = number % self.slots
+        meta = self.meta[slot]
+
+        meta["seq"] += 1  # odd: write in progress
+        target = self.frames[slot]
+        if frame.shape == self.shape:
+            np.copyto(target, frame)
+        else:
+            cv2.resize(frame, (self.shape[1], self.shape[0]), dst=target)
+        meta["capture_time"] = capture_time
+        meta["seq"] += 1  # even: slot is stable
+
+        self.header["written"] = number
+        return number
+
+    def read(self, copy: bool = False):
+        """Newest frame as ``(frame, capture_time, number, token)``, frame is None if unavailable
+
+        Without ``copy`` the frame is a view into shared memory; pass the
+        token to ``still_valid`` after using it to check it was not
+        overwritten in the meantime.
+        """
+        for _ in range(3):
+            number = self.written
+            if number == 0:
+                return None, 0.0, 0, None
+
+            slot = number % self.slots
+            seq = int(self.meta[slot]["seq"])
+            if seq & 1:
+                continue
+
+            frame = self.frames[slot]
+            capture_time = float(self.meta[slot]["capture_time"])
+            if copy:
+                frame = frame.copy()
+            if int(self.meta[slot]["seq"]) != seq:
+                continue
+
+            return frame, capture_time, number, (slot, seq)
+
+        return None, 0.0, 0, None
+
+    def still_valid(self, token) -> bool:
+        """True if the slot behind a zero-copy read has not been rewritten"""
+        if token is None:
+            return False
+        slot, seq = token
+        return int(self.meta[slot]["seq"]) == seq
+
+    def get_frame(self):
+        """Same shape as ThreadedCamera.get_frame, the frame is a copy"""
+        frame, capture_time, number, _ = self.read(copy=True)
+        return frame is not None, frame, capture_time, number
+
+    def close(self):
+        # Views must go before the mapping can be closed
+        self.header = self.meta = self.frames = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,209 @@
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from src.exercies import get_exercise_processor
+from src.motion_gate import MotionGate
+from src.person_tracker import PersonTracker
+from src.pose_backend import TasksPoseBackend
+from src.skeleton_renderer import SkeletonRenderer
+from src.stage_queue import NEVER_DROP, StageQueue
+from src.text_renderer import put_text
+
+logger = logging.getLogger(__name__)
+
+class GroupExerciseProcessor:
+    """Several athletes doing the same exercise in front of one camera
+
+    One MediaPipe Tasks ``PoseLandmarker`` pass per frame detects up to
+    ``num_poses`` people (the legacy ``mp.solutions.pose`` API used by
+    ExerciseBase finds one). ``PersonTracker`` keeps their ids stable
+    across frames and every person gets their own landmark-only exercise
+    tracker, so reps, tempo and timers are counted per person and reported
+    keyed by person id. Someone who steps out and comes back to their spot
+    keeps their id and tracker; people the tracker forgets for good are
+    folded into a ``left`` summary (how many, their reps) and their tracker
+    is released, so a long session holds a bounded set of trackers and
+    stats payloads stay small.
+
+    Has the same frame interface as an exercise processor (process_frame or
+    prepare_frame/infer/render_frame, get_stats, rep_events, reset,
+    cleanup) so the producer and stats sender use it unchanged. Overlays are
+    the skeleton and a rep label per person; the exercise-specific overlays
+    need the single-person MediaPipe results and are not drawn.
+
+    The landmarker model (lite, full or heavy, POSE_MODEL by default) is
+    resolved by ``pose_backend.model_path``.
+    """
+
+    # Single-person attributes the landmark packet sender reads; packets
+    # carry one pose, so group sessions stream overlays only
+    JOINT_ANGLES: Dict[str, Tuple[int, int, int]] = {}
+
+    def __init__(self, exercise_type: str, num_poses: int = 4, pose_model: Optional[str] = None,
+                 running_mode: Optional[str] = None):
+        self.exercise_type = exercise_type
+        self.exercise_name = exercise_type.lower()
+        self.num_poses = num_poses
+        self.pose = TasksPoseBackend(
+            model=(pose_model or os.getenv("POSE_MODEL", "full")).lower(),
+            running_mode=(running_mode or os.getenv("POSE_RUNNING_MODE", "video")).lower(),
+            num_poses=num_poses,
+            min_detection_confidence=float(os.getenv('MIN_DETECTION_CONFIDENCE', '0.5')),
+            min_tracking_confidence=float(os.getenv('MIN_TRACKING_CONFIDENCE', '0.5')),
+        )
+
+        self.tracker = PersonTracker()
+        # Person id -> landmark-only exercise tracker
+        self.people: Dict[int, object] = {}
+        # People forgotten by the tracker: how many and the reps they did
+        self.left = {'people': 0, 'rep_count': 0}
+
+        self.skeleton = SkeletonRenderer(
+            mp.solutions.pose.POSE_CONNECTIONS,
+            bone_color=(0, 255, 0), bone_thickness=1,
+            joint_color=(0, 0, 255), joint_radius=2, joint_thickness=5
+        )
+        self.draw_skeleton = True
+
+        self.motion_gate = MotionGate() if os.getenv('MOTION_GATE', '1') == '1' else None
+        self.last_poses: Optional[List[np.ndarray]] = None
+
+        # Rep events of all people, tagged with the person id
+        self.rep_events = StageQueue("rep_events", 64, NEVER_DROP)
+
+        self.frame_time = time.time()
+        self.pose_landmarks = None
+        self.joint_angles: Dict[str, float] = {}
+
+        logger.info(f"Initialized group {self.exercise_name} for up to {num_poses} people ({self.pose.model} model)")
+
+    def process_frame(self, frame: np.ndarray, draw: bool = True) -> Tuple[np.ndarray, Dict]:
+        if frame is None:
+            return frame, self.get_stats()
+
+        image, image_rgb = self.prepare_frame(frame)
+        return self.render_frame(image, self.infer(image_rgb), draw)
+
+    def prepare_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Mirror the camera frame; returns (BGR image to draw on, RGB image for MediaPipe)"""
+        image = cv2.flip(frame, 1)
+        return image, cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    def infer(self, image_rgb: np.ndarray) -> List[np.ndarray]:
+        """Landmark arrays of every detected person, reused while nobody moves"""
+        gate = self.motion_gate
+        if gate and not gate.should_infer(image_rgb, self.group_region()) and self.last_poses is not None:
+            return self.last_poses
+
+        self.last_poses = self.pose.detect(image_rgb)
+        return self.last_poses
+
+    def group_region(self) -> Optional[Tuple[float, float, float, float]]:
+        """Normalized bounding box around everyone in the last inference result"""
+        if not self.last_poses:
+            return None
+        points = np.concatenate([pose[pose[:, 3] >= 0.5, :2] for pose in self.last_poses])
+        if not len(points):
+            return None
+        (x0, y0), (x1, y1) = points.min(axis=0), points.max(axis=0)
+        return float(x0), float(y0), float(x1), float(y1)
+
+    def render_frame(self, image: np.ndarray, poses: List[np.ndarray], draw: bool = True) -> Tuple[np.ndarray, Dict]:
+        """Track every person's exercise and draw their skeletons and rep labels"""
+        now = self.frame_time = time.time()
+        height, width = image.shape[:2]
+
+        tracked = self.tracker.update(poses)
+        for person in self.tracker.drain_forgotten():
+            self.retire(person)
+
+        for person, landmarks in tracked:
+            processor = self.people.get(person)
+            if processor is None:
+                processor = self.people[person] = get_exercise_processor(self.exercise_type, use_pose=False)
+                logger.info(f"👥 Person {person} joined ({len(self.tracker.active)} in frame)")
+
+            processor.process_landmarks(landmarks, width, height, timestamp=now)
+            for event in processor.rep_events.drain():
+                self.rep_events.put({**event, "person": person})
+
+            if draw:
+                if self.draw_skeleton:
+                    self.skeleton.draw(image, landmarks)
+                self.draw_label(image, person, processor, landmarks, width, height)
+
+        if draw:
+            put_text(image, f"{self.exercise_name.upper()}  people: {len(self.tracker.active)}",
+                     (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+
+        return image, self.get_stats()
+
+    def retire(self, person: int):
+        """Fold a person the tracker forgot into the left summary and release their tracker"""
+        processor = self.people.pop(person, None)
+        if processor is None:
+            return
+        reps = processor.rep_total()
+        processor.cleanup()
+        if not reps:
+            # Detection flicker or someone passing through
+            return
+        self.left['people'] += 1
+        self.left['rep_count'] += reps
+        logger.info(f"👥 Person {person} left ({reps} reps)")
+
+    @staticmethod
+    def draw_label(image, person: int, processor, landmarks: np.ndarray, width: int, height: int):
+        visible = landmarks[landmarks[:, 3] >= 0.5]
+        if not len(visible):
+            return
+        x = int(np.clip(visible[:, 0].min() * width, 0, width - 1))
+        y = int(np.clip(visible[:, 1].min() * height - 15, 20, height - 1))
+        stats = processor.get_stats()
+        value = stats.get('plank_duration')
+        text = f"#{person} {value:.0f}s" if value is not None else f"#{person} {processor.rep_total()}"
+        put_text(image, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+
+    def rep_total(self) -> int:
+        return self.left['rep_count'] + sum(processor.rep_total() for processor in self.people.values())
+
+    def get_stats(self) -> Dict:
+        """Totals plus per-person stats and tempo, keyed by person id, and the people who left"""
+        active = set(self.tracker.active)
+        return {
+            'exercise': self.exercise_name,
+            'rep_count': self.rep_total(),
+            'people': {
+                str(person): {
+                    **processor.get_stats(),
+                    'tempo': processor.timeline.summary(),
+                    'in_frame': person in active,
+                }
+                for person, processor in self.people.items()
+            },
+            'left': dict(self.left),
+        }
+
+    def reset(self):
+        """Reset for a new session: forget everyone"""
+        for processor in self.people.values():
+            processor.cleanup()
+        self.people = {}
+        self.left = {'people': 0, 'rep_count': 0}
+        self.tracker.reset()
+        self.rep_events.clear()
+        self.last_poses = None
+        if self.motion_gate:
+            self.motion_gate.reset()
+
+    def cleanup(self):
+        self.reset()
+        if self.pose:
+            self.pose.close()
+            self.pose = None
@@ -0,0 +1,116 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+NUM_LANDMARKS = 33
+
+
+class LandmarkRingBuffer:
+    """Preallocated history of the last ``capacity`` analysed frames
+
+    Holds normalized landmarks (x, y, z, visibility), the exercise's joint
+    angles and a timestamp per frame. ``push`` writes into the existing
+    arrays, nothing is allocated per frame. Frames without a pose are stored
+    as NaN landmarks so time windows stay contiguous; missing angles are NaN.
+
+    Queries return arrays ordered oldest to newest.
+    """
+
+    def __init__(self, capacity: int = 120, angle_names: Iterable[str] = (),
+                 num_landmarks: int = NUM_LANDMARKS):
+        self.capacity = capacity
+        self.angle_names = list(angle_names)
+        self.angle_slots = {name: i for i, name in enumerate(self.angle_names)}
+
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.landmarks = np.full((capacity, num_landmarks, 4), np.nan, dtype=np.float32)
+        self.angles = np.full((capacity, len(self.angle_names)), np.nan, dtype=np.float32)
+
+        # Index the next frame is written to, and number of valid frames
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def push(self, timestamp: float, pose_landmarks=None, angles: Optional[Dict[str, float]] = None):
+        """Store one frame, pose_landmarks is a MediaPipe landmark list or an (N, 4) array"""
+        slot = self.head
+        self.timestamps[slot] = timestamp
+
+        row = self.landmarks[slot]
+        if pose_landmarks is None:
+            row.fill(np.nan)
+        elif isinstance(pose_landmarks, np.ndarray):
+            row[:] = pose_landmarks
+        else:
+            for i, lm in enumerate(pose_landmarks.landmark[:len(row)]):
+                row[i, 0] = lm.x
+                row[i, 1] = lm.y
+                row[i, 2] = lm.z
+                row[i, 3] = lm.visibility
+
+        angle_row = self.angles[slot]
+        angle_row.fill(np.nan)
+        if angles:
+            for name, value in angles.items():
+                i = self.angle_slots.get(name)
+                if i is not None:
+                    angle_row[i] = value
+
+        self.head = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def indices(self, k: Optional[int] = None) -> np.ndarray:
+        """Buffer indices of the last k frames, oldest first"""
+        k = self.count if k is None else min(k, self.count)
+        return (self.head - k + np.arange(k)) % self.capacity
+
+    def last(self, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(timestamps, landmarks, angles) of the last k frames"""
+        idx = self.indices(k)
+        return self.timestamps[idx], self.landmarks[idx], self.angles[idx]
+
+    def window(self, seconds: float, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(timestamps, landmarks, angles) of the frames in the last ``seconds``"""
+        idx = self.indices()
+        if not len(idx):
+            return self.last(0)
+
+        timestamps = self.timestamps[idx]
+        now = timestamps[-1] if now is None else now
+        start = np.searchsorted(timestamps, now - seconds, side="left")
+        idx = idx[start:]
+        return self.timestamps[idx], self.landmarks[idx], self.angles[idx]
+
+    def latest(self) -> Optional[Tuple[float, np.ndarray, np.ndarray]]:
+        """Most recent frame as views into the buffer, None if empty"""
+        if not self.count:
+            return None
+        slot = (self.head - 1) % self.capacity
+        return self.timestamps[slot], self.landmarks[slot], self.angles[slot]
+
+    def angle_series(self, name: str, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, values) of one joint angle over the last k frames"""
+        idx = self.indices(k)
+        return self.timestamps[idx], self.angles[idx, self.angle_slots[name]]
+
+    def velocity(self, k: Optional[int] = None) -> np.ndarray:
+        """Per-landmark (x, y, z) velocity in normalized units per second, shape (k - 1, N, 3)"""
+        timestamps, landmarks, _ = self.last(k)
+        if len(timestamps) < 2:
+            return np.zeros((0,) + landmarks.shape[1:2] + (3,), dtype=np.float32)
+        dt = np.diff(timestamps)
+        dt[dt <= 0] = np.nan
+        return np.diff(landmarks[:, :, :3], axis=0) / dt[:, None, None]
+
+    def smoothed(self, k: int = 5) -> np.ndarray:
+        """Mean landmarks over the last k frames, ignoring frames without a pose"""
+        _, landmarks, _ = self.last(k)
+        if not len(landmarks) or np.isnan(landmarks).all():
+            return np.full(landmarks.shape[1:], np.nan, dtype=np.float32)
+        return np.nanmean(landmarks, axis=0)
@@ -0,0 +1,103 @@
+"""
+Compact binary landmark/metric packets for client-side overlay rendering
+
+Fixed little-endian layout, one packet per analysed frame:
+
+    header (34 bytes)
+        magic              2s   b"LP"
+        version            u8
+        flags              u8   bit 0: pose detected
+        seq                u32  analysed frame counter
+        timestamp_ms       u32  milliseconds since the session started
+        width, height      u16  size of the analysed (mirrored) frame
+        rep_count          u16
+        shoulder_tap_count u16
+        plank_duration     u16  tenths of a second
+        angles             6 x u16  hundredths of a degree, 0xFFFF = missing
+    landmarks (33 x 5 bytes)
+        x, y               u16  normalized coordinate * 65535
+        visibility         u8   visibility * 255, 0 = not detected
+
+Angle slots follow the order of the exercise's ``JOINT_ANGLES``.
+"""
+
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+
+MAGIC = b"LP"
+VERSION = 1
+FLAG_POSE = 0x01
+
+NUM_LANDMARKS = 33
+ANGLE_SLOTS = 6
+ANGLE_MISSING = 0xFFFF
+
+HEADER = struct.Struct(f"<2sBBIIHHHHH{ANGLE_SLOTS}H")
+LANDMARK_DTYPE = np.dtype([("x", "<u2"), ("y", "<u2"), ("v", "u1")])
+PACKET_SIZE = HEADER.size + NUM_LANDMARKS * LANDMARK_DTYPE.itemsize
+
+
+def encode_landmark_packet(seq: int, timestamp_ms: int, width: int, height: int,
+                           pose_landmarks, angles: Dict[str, float], angle_names,
+                           stats: Dict) -> bytes:
+    """Pack one analysed frame into a fixed-size binary packet"""
+    landmarks = np.zeros(NUM_LANDMARKS, dtype=LANDMARK_DTYPE)
+    flags = 0
+
+    if pose_landmarks is not None:
+        flags |= FLAG_POSE
+        raw = np.array(
+            [(lm.x, lm.y, lm.visibility) for lm in pose_landmarks.landmark[:NUM_LANDMARKS]],
+            dtype=np.float32,
+        )
+        np.clip(raw, 0.0, 1.0, out=raw)
+        n = len(raw)
+        landmarks["x"][:n] = np.rint(raw[:, 0] * 65535)
+        landmarks["y"][:n] = np.rint(raw[:, 1] * 65535)
+        landmarks["v"][:n] = np.rint(raw[:, 2] * 255)
+
+    angle_slots = [ANGLE_MISSING] * ANGLE_SLOTS
+    for slot, name in enumerate(list(angle_names)[:ANGLE_SLOTS]):
+        value = angles.get(name)
+        if value is not None:
+            angle_slots[slot] = min(int(round(value * 100)), ANGLE_MISSING - 1)
+
+    header = HEADER.pack(
+        MAGIC, VERSION, flags,
+        seq & 0xFFFFFFFF, timestamp_ms & 0xFFFFFFFF,
+        width, height,
+        min(int(stats.get("rep_count", 0)), 0xFFFF),
+        min(int(stats.get("shoulder_tap_count", 0)), 0xFFFF),
+        min(int(stats.get("plank_duration", 0) * 10), 0xFFFF),
+        *angle_slots,
+    )
+    return header + landmarks.tobytes()
+
+
+def decode_landmark_packet(packet: bytes) -> Optional[Dict]:
+    """Unpack a landmark packet, returns None if it is not one"""
+    if len(packet) != PACKET_SIZE or packet[:2] != MAGIC:
+        return None
+
+    fields = HEADER.unpack_from(packet)
+    _, version, flags, seq, timestamp_ms, width, height, reps, taps, plank = fields[:10]
+    angle_slots = fields[10:]
+    landmarks = np.frombuffer(packet, dtype=LANDMARK_DTYPE, offset=HEADER.size)
+
+    return {
+        "version": version,
+        "pose": bool(flags & FLAG_POSE),
+        "seq": seq,
+        "timestamp_ms": timestamp_ms,
+        "width": width,
+        "height": height,
+        "rep_count": reps,
+        "shoulder_tap_count": taps,
+        "plank_duration": plank / 10,
+        "angles": [None if a == ANGLE_MISSING else a / 100 for a in angle_slots],
+        "landmarks": np.stack(
+            [landmarks["x"] / 65535, landmarks["y"] / 65535, landmarks["v"] / 255], axis=1
+        ),
+    }
@@ -0,0 +1,131 @@
+import gc
+import logging
+import os
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Per-session objects whose live instance counts should return to the same
+# level after every session
+TRACKED_TYPES = (
+    "RTCPeerConnection", "RTCDataChannel", "ViewerPeer", "OpenCVVideoTrack",
+    "AnalysedFrameProducer", "PipelineStage", "WebRTCStreamer", "SessionRecorder", "ThreadedCamera",
+    "CongestionController", "ClientConnection", "Pose",
+)
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process (native + Python), 0 if unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # Peak, not current, but better than nothing off Linux (kB on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+def count_tracked() -> Dict[str, int]:
+    """Live instances of the per-session types"""
+    wanted = set(TRACKED_TYPES)
+    counts = Counter(type(obj).__name__ for obj in gc.get_objects() if type(obj).__name__ in wanted)
+    return {name: counts.get(name, 0) for name in TRACKED_TYPES}
+
+
+class SessionMemoryTracker:
+    """Memory accounting per session
+
+    ``begin`` records the process RSS and, with tracing on, a tracemalloc
+    snapshot when a session starts; ``end`` after the session is torn down
+    reports how much RSS and traced Python memory it left behind, the
+    allocation sites that grew most, and live counts of per-session objects
+    (peer connections, tracks, producers...). Reports are kept so growth
+    across many session cycles can be checked.
+
+    ``begin`` and ``end`` each force a full collection and scan the heap,
+    tens of milliseconds on the event loop, so the app only tracks sessions
+    with MEMORY_REPORTS=1 (soak tests). tracemalloc also slows every
+    allocation and is a further opt-in (MEMORY_TRACE=1).
+    """
+
+    def __init__(self, trace: bool = False, top: int = 10, frames: int = 1, keep: int = 200):
+        self.trace = trace
+        self.top = top
+        self.keep = keep
+        self.reports: List[Dict] = []
+        self.session_id: Optional[str] = None
+        self.started_at = 0.0
+        self.rss_before = 0
+        self.snapshot = None
+
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+        # Process RSS before the first session, growth is measured against it
+        self.rss_initial = rss_bytes()
+
+    def begin(self, session_id: Optional[str]):
+        gc.collect()
+        self.session_id = session_id
+        self.started_at = time.monotonic()
+        self.rss_before = rss_bytes()
+        self.snapshot = tracemalloc.take_snapshot() if self.trace else None
+
+    def end(self) -> Optional[Dict]:
+        """Report for the session begun last, None if none was"""
+        if self.started_at == 0.0:
+            return None
+
+        gc.collect()
+        rss_after = rss_bytes()
+        report = {
+            "sessionId": self.session_id,
+            "cycle": len(self.reports) + 1,
+            "durationS": round(time.monotonic() - self.started_at, 1),
+            "rssBefore": self.rss_before,
+            "rssAfter": rss_after,
+            "rssDelta": rss_after - self.rss_before,
+            "rssGrowth": rss_after - self.rss_initial,
+            "objects": count_tracked(),
+        }
+
+        if self.snapshot is not None:
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)]
+            )
+            diff = snapshot.compare_to(self.snapshot, "lineno")
+            report["tracedDelta"] = sum(stat.size_diff for stat in diff)
+            report["topGrowth"] = [
+                {"site": str(stat.traceback), "sizeDiff": stat.size_diff, "countDiff": stat.count_diff}
+                for stat in diff[:self.top] if stat.size_diff > 0
+            ]
+            self.snapshot = None
+
+        self.started_at = 0.0
+        self.reports.append(report)
+        del self.reports[:-self.keep]
+        self.log(report)
+        return report
+
+    @staticmethod
+    def log(report: Dict):
+        mb = 1024 * 1024
+        logger.info(
+            f"🧮 Session {report['sessionId']} memory: RSS {report['rssAfter'] / mb:.1f}MB "
+            f"({report['rssDelta'] / mb:+.1f}MB this session, {report['rssGrowth'] / mb:+.1f}MB since start)"
+        )
+        live = {name: n for name, n in report["objects"].items() if n}
+        logger.info(f"   Live objects: {live}")
+        if "tracedDelta" in report:
+            logger.info(f"   Python allocations: {report['tracedDelta'] / 1024:+.1f}KB")
+            for site in report["topGrowth"][:5]:
+                logger.info(f"   {site['sizeDiff'] / 1024:+8.1f}KB  {site['site']}")
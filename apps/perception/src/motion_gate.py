@@ -0,0 +1,87 @@
+import os
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Decides whether a frame moved enough since the last inferred one to run inference again
+
+    Each frame is shrunk to a small grey thumbnail and compared with the
+    thumbnail of the last frame that went through inference (not the
+    previous frame, so slow drift still adds up). The share of pixels whose
+    grey level changed by more than ``pixel_delta`` is the motion score,
+    taken over the athlete's bounding box when one is given so it does not
+    depend on how much of the frame they fill. Below ``threshold`` the
+    frame can reuse the previous landmarks. Every ``refresh_every``
+    skipped frames inference runs anyway, so a missed change can never go
+    stale for long.
+
+    Resizing and differencing a thumbnail costs a few hundred microseconds
+    against tens of milliseconds for pose inference, so static phases
+    (plank holds, rests between sets) cost a fraction of the CPU.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, refresh_every: Optional[int] = None,
+                 pixel_delta: int = 12, size=(160, 120), margin: float = 0.1):
+        self.threshold = float(os.getenv("MOTION_THRESHOLD", "0.003")) if threshold is None else threshold
+        self.refresh_every = int(os.getenv("MOTION_REFRESH_FRAMES", "10")) if refresh_every is None else refresh_every
+        self.pixel_delta = pixel_delta
+        self.size = size
+        self.margin = margin
+        self.reset()
+
+    def reset(self):
+        self.reference: Optional[np.ndarray] = None
+        self.skipped_in_row = 0
+        self.inferred = 0
+        self.skipped = 0
+        self.last_score = 0.0
+
+    def thumbnail(self, image_rgb: np.ndarray) -> np.ndarray:
+        small = cv2.resize(image_rgb, self.size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+
+    def crop(self, diff: np.ndarray, region) -> np.ndarray:
+        """Part of the thumbnail inside a normalized (x0, y0, x1, y1) region, widened by the margin"""
+        height, width = diff.shape
+        x0, y0, x1, y1 = region
+        pad_x, pad_y = (x1 - x0) * self.margin, (y1 - y0) * self.margin
+        left, right = int(max(0.0, x0 - pad_x) * width), int(np.ceil(min(1.0, x1 + pad_x) * width))
+        top, bottom = int(max(0.0, y0 - pad_y) * height), int(np.ceil(min(1.0, y1 + pad_y) * height))
+        if right - left < 2 or bottom - top < 2:
+            return diff
+        return diff[top:bottom, left:right]
+
+    def should_infer(self, image_rgb: np.ndarray, region=None) -> bool:
+        """True when the frame needs inference, False when the last result can be reused
+
+        ``region`` is the athlete's normalized (x0, y0, x1, y1) bounding box
+        in the last inferred frame, None to score the whole frame.
+        """
+        thumb = self.thumbnail(image_rgb)
+
+        if self.reference is not None and self.skipped_in_row < self.refresh_every:
+            diff = cv2.absdiff(thumb, self.reference)
+            if region is not None:
+                diff = self.crop(diff, region)
+            self.last_score = np.count_nonzero(diff > self.pixel_delta) / diff.size
+            if self.last_score < self.threshold:
+                self.skipped_in_row += 1
+                self.skipped += 1
+                return False
+
+        self.reference = thumb
+        self.skipped_in_row = 0
+        self.inferred += 1
+        return True
+
+    def stats(self) -> Dict:
+        total = self.inferred + self.skipped
+        return {
+            "inferred": self.inferred,
+            "skipped": self.skipped,
+            "skipped_share": round(self.skipped / total, 3) if total else 0.0,
+            "score": round(self.last_score, 4),
+        }
@@ -0,0 +1,136 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Shoulders and hips: the torso is the most stable part of a pose to follow
+TORSO = (11, 12, 23, 24)
+
+
+def pose_anchor(landmarks: np.ndarray, visibility_threshold: float = 0.5) -> Optional[np.ndarray]:
+    """Normalized (x, y) to follow a person by: torso centre, else the centre of the visible landmarks"""
+    visible = landmarks[:, 3] >= visibility_threshold
+    torso = [idx for idx in TORSO if visible[idx]]
+    if torso:
+        return landmarks[torso, :2].mean(axis=0)
+    if visible.any():
+        return landmarks[visible, :2].mean(axis=0)
+    return None
+
+
+class PersonTracker:
+    """Stable ids for the poses detected in each frame
+
+    Each detection is matched to the nearest known person (torso centre,
+    normalized coordinates) within ``max_distance``, closest pairs first.
+    Unmatched detections start a new track, which is only reported once
+    it has been seen in ``min_seen`` frames; one that misses a frame
+    before then is detection flicker and is dropped.
+
+    A person not seen for ``max_missing`` frames is moved to the lost list
+    with their last position. A new track confirmed within
+    ``rejoin_distance`` of a lost person horizontally takes back their id
+    (someone who stepped out and returned to their place in the row;
+    height is no guide, it changes with every squat). The lost list holds
+    the ``max_lost`` most recently lost; older ids are dropped for good and
+    listed in ``forgotten`` until the caller takes them with
+    ``drain_forgotten``. Ids start at 1 and are never handed to a
+    different person.
+    """
+
+    def __init__(self, max_distance: float = 0.15, max_missing: int = 30, min_seen: int = 5,
+                 rejoin_distance: float = 0.1, max_lost: int = 8):
+        self.max_distance = max_distance
+        self.max_missing = max_missing
+        self.min_seen = min_seen
+        self.rejoin_distance = rejoin_distance
+        self.max_lost = max_lost
+        self.reset()
+
+    def reset(self):
+        self.anchors: Dict[int, np.ndarray] = {}
+        self.missing: Dict[int, int] = {}
+        # Frames each track was detected in, a track is confirmed at min_seen
+        self.seen: Dict[int, int] = {}
+        # Lost person id -> last anchor, oldest first
+        self.lost: Dict[int, np.ndarray] = {}
+        self.forgotten: List[int] = []
+        self.next_id = 1
+
+    def update(self, poses: List[np.ndarray]) -> List[Tuple[int, np.ndarray]]:
+        """(person id, landmarks) for each detected pose of a confirmed person, in detection order"""
+        anchors = [pose_anchor(pose) for pose in poses]
+        known = list(self.anchors)
+
+        pairs = []
+        for det, anchor in enumerate(anchors):
+            if anchor is None:
+                continue
+            for person in known:
+                distance = float(np.linalg.norm(anchor - self.anchors[person]))
+                if distance <= self.max_distance:
+                    pairs.append((distance, det, person))
+
+        assigned: Dict[int, int] = {}
+        taken = set()
+        for _, det, person in sorted(pairs):
+            if det not in assigned and person not in taken:
+                assigned[det] = person
+                taken.add(person)
+
+        for det, anchor in enumerate(anchors):
+            if anchor is not None and det not in assigned:
+                assigned[det] = self.next_id
+                self.next_id += 1
+
+        for person in known:
+            if person in taken:
+                continue
+            self.missing[person] += 1
+            if self.seen[person] < self.min_seen:
+                del self.anchors[person], self.missing[person], self.seen[person]
+            elif self.missing[person] > self.max_missing:
+                self.lost[person] = self.anchors.pop(person)
+                del self.missing[person], self.seen[person]
+
+        tracked = []
+        for det, person in sorted(assigned.items()):
+            seen = self.seen.pop(person, 0) + 1
+            if seen == self.min_seen:
+                person = self.rejoin(person, anchors[det])
+            self.anchors[person] = anchors[det]
+            self.missing[person] = 0
+            self.seen[person] = seen
+            if seen >= self.min_seen:
+                tracked.append((person, poses[det]))
+
+        while len(self.lost) > self.max_lost:
+            person = next(iter(self.lost))
+            del self.lost[person]
+            self.forgotten.append(person)
+        return tracked
+
+    def rejoin(self, person: int, anchor: np.ndarray) -> int:
+        """Id for a newly confirmed track: the nearest lost person's, else its own"""
+        distance, returning = min(
+            ((abs(float(anchor[0] - last[0])), lost) for lost, last in self.lost.items()),
+            default=(None, None)
+        )
+        if returning is None or distance > self.rejoin_distance:
+            return person
+        self.anchors.pop(person, None)
+        self.missing.pop(person, None)
+        del self.lost[returning]
+        return returning
+
+    @property
+    def active(self) -> List[int]:
+        """Confirmed ids seen in the latest frame"""
+        return [
+            person for person, missing in self.missing.items()
+            if missing == 0 and self.seen[person] >= self.min_seen
+        ]
+
+    def drain_forgotten(self) -> List[int]:
+        """Ids dropped from the lost list since the last call"""
+        forgotten, self.forgotten = self.forgotten, []
+        return forgotten
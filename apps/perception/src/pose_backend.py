@@ -0,0 +1,232 @@
+import logging
+import os
+import shutil
+import threading
+import time
+import urllib.request
+from typing import List, Optional
+
+import mediapipe as mp
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+from mediapipe.tasks import python as mp_tasks
+from mediapipe.tasks.python import vision
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("legacy", "tasks", "worker")
+MODELS = ("lite", "full", "heavy")
+RUNNING_MODES = ("video", "live_stream")
+
+MODEL_URL = (
+    "https://storage.googleapis.com/mediapipe-models/pose_landmarker/"
+    "pose_landmarker_{model}/float16/latest/pose_landmarker_{model}.task"
+)
+DEFAULT_MODELS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models"
+)
+
+_download_lock = threading.Lock()
+
+
+def model_path(model: str) -> str:
+    """Path of the pose landmarker model file, downloaded on first use
+
+    POSE_MODEL_PATH names a file directly; otherwise the model is
+    ``pose_landmarker_<model>.task`` in POSE_MODELS_DIR (default models/),
+    fetched from the MediaPipe model storage if missing and
+    POSE_MODEL_DOWNLOAD is not 0. A download stalling for longer than
+    POSE_MODEL_DOWNLOAD_TIMEOUT seconds (default 30) fails.
+    """
+    if os.getenv("POSE_MODEL_PATH"):
+        path = os.getenv("POSE_MODEL_PATH")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Pose landmarker model not found at {path}")
+        return path
+
+    if model not in MODELS:
+        raise ValueError(f"Unknown pose model '{model}', expected one of {MODELS}")
+
+    models_dir = os.getenv("POSE_MODELS_DIR", DEFAULT_MODELS_DIR)
+    path = os.path.join(models_dir, f"pose_landmarker_{model}.task")
+    with _download_lock:
+        if os.path.exists(path):
+            return path
+        if os.getenv("POSE_MODEL_DOWNLOAD", "1") != "1":
+            raise FileNotFoundError(f"Pose landmarker model not found at {path} and downloads are off")
+
+        url = MODEL_URL.format(model=model)
+        logger.info(f"⬇️ Downloading {model} pose landmarker model from {url}")
+        os.makedirs(models_dir, exist_ok=True)
+        partial = f"{path}.part"
+        try:
+            timeout = float(os.getenv("POSE_MODEL_DOWNLOAD_TIMEOUT", "30"))
+            with urllib.request.urlopen(url, timeout=timeout) as response, open(partial, "wb") as f:
+                shutil.copyfileobj(response, f)
+            os.replace(partial, path)
+        except OSError as e:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise FileNotFoundError(f"Could not download the {model} pose model from {url}: {e}") from e
+        return path
+
+
+class PoseResults:
+    """Legacy ``Pose.process`` output shape: ``pose_landmarks`` is a NormalizedLandmarkList or None"""
+
+    __slots__ = ("pose_landmarks",)
+
+    def __init__(self, pose_landmarks=None):
+        self.pose_landmarks = pose_landmarks
+
+
+def to_landmark_list(pose) -> landmark_pb2.NormalizedLandmarkList:
+    """Tasks landmarks as the legacy proto, so exercise code reading ``.landmark`` works unchanged"""
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for lm in pose:
+        landmark_list.landmark.add(
+            x=lm.x, y=lm.y, z=lm.z,
+            visibility=lm.visibility if lm.visibility is not None else 1.0,
+            presence=lm.presence if lm.presence is not None else 1.0,
+        )
+    return landmark_list
+
+
+def to_array(pose) -> np.ndarray:
+    """(33, 4) float32 array of x, y, z, visibility from Tasks landmarks"""
+    return np.array(
+        [(lm.x, lm.y, lm.z, lm.visibility if lm.visibility is not None else 1.0) for lm in pose],
+        dtype=np.float32,
+    )
+
+
+class TasksPoseBackend:
+    """MediaPipe Tasks ``PoseLandmarker`` behind the legacy ``Pose`` interface
+
+    ``process(image_rgb)`` returns an object with ``pose_landmarks`` like
+    ``mp.solutions.pose.Pose.process`` does, so ExerciseBase and every
+    exercise use it unchanged; ``detect(image_rgb)`` returns landmark arrays
+    for every detected person (group classes).
+
+    Running modes:
+        video        each frame is submitted with its timestamp and the
+                     result waited for (tracking between frames like the
+                     legacy API)
+        live_stream  frames are submitted with ``detect_async`` and results
+                     come back on MediaPipe's own thread via a callback; the
+                     caller gets the newest result that has arrived, so it
+                     never waits on inference, at the cost of landmarks that
+                     may be a frame behind the image. Frames submitted while
+                     inference is busy are dropped by MediaPipe.
+
+    ``model`` picks the lite, full or heavy landmarker (speed vs accuracy).
+    """
+
+    def __init__(self, model: str = "full", running_mode: str = "video", num_poses: int = 1,
+                 min_detection_confidence: float = 0.5, min_tracking_confidence: float = 0.5):
+        if running_mode not in RUNNING_MODES:
+            raise ValueError(f"Unknown running mode '{running_mode}', expected one of {RUNNING_MODES}")
+
+        self.model = model
+        self.running_mode = running_mode
+        self.num_poses = num_poses
+        self.last_timestamp_ms = -1
+        self.lock = threading.Lock()
+        self.latest = None
+
+        live = running_mode == "live_stream"
+        self.landmarker = vision.PoseLandmarker.create_from_options(
+            vision.PoseLandmarkerOptions(
+                base_options=mp_tasks.BaseOptions(model_asset_path=model_path(model)),
+                running_mode=vision.RunningMode.LIVE_STREAM if live else vision.RunningMode.VIDEO,
+                num_poses=num_poses,
+                min_pose_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence,
+                result_callback=self.on_result if live else None,
+            )
+        )
+        logger.info(f"🦴 Tasks pose landmarker: {model} model, {running_mode} mode, up to {num_poses} pose(s)")
+
+    def on_result(self, result, output_image, timestamp_ms: int):
+        """LIVE_STREAM callback, on MediaPipe's thread"""
+        with self.lock:
+            self.latest = result
+
+    def next_timestamp_ms(self) -> int:
+        # Both modes want strictly increasing timestamps
+        timestamp_ms = max(int(time.monotonic() * 1000), self.last_timestamp_ms + 1)
+        self.last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+
+    def run(self, image_rgb: np.ndarray):
+        """Tasks result for this frame (video) or the newest one available (live stream)"""
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(image_rgb))
+        if self.running_mode == "video":
+            return self.landmarker.detect_for_video(image, self.next_timestamp_ms())
+
+        self.landmarker.detect_async(image, self.next_timestamp_ms())
+        with self.lock:
+            return self.latest
+
+    def process(self, image_rgb: np.ndarray) -> PoseResults:
+        result = self.run(image_rgb)
+        if result is None or not result.pose_landmarks:
+            return PoseResults()
+        return PoseResults(to_landmark_list(result.pose_landmarks[0]))
+
+    def detect(self, image_rgb: np.ndarray) -> List[np.ndarray]:
+        result = self.run(image_rgb)
+        if result is None:
+            return []
+        return [to_array(pose) for pose in result.pose_landmarks]
+
+    def close(self):
+        if self.landmarker:
+            self.landmarker.close()
+            self.landmarker = None
+
+
+def describe_pose_backend(pose) -> str:
+    """Short log label for a pose estimator made by create_pose_backend"""
+    if pose is None:
+        return "none (landmarks only)"
+    if isinstance(pose, TasksPoseBackend):
+        return f"tasks {pose.model} model, {pose.running_mode} mode"
+    if hasattr(pose, "ring_name"):
+        return f"worker process ({pose.backend}) on ring '{pose.ring_name}'"
+    return "legacy"
+
+
+def create_pose_backend(backend: Optional[str] = None, model: Optional[str] = None,
+                        running_mode: Optional[str] = None, num_poses: int = 1):
+    """Pose estimator for a processor: the legacy ``mp.solutions.pose.Pose``, a Tasks landmarker
+    or a worker process reading the shared frame ring (src/pose_worker.py)
+
+    Unset arguments come from POSE_BACKEND (legacy), POSE_MODEL (full) and
+    POSE_RUNNING_MODE (video). More than one pose always needs Tasks.
+    """
+    backend = (backend or os.getenv("POSE_BACKEND", "legacy")).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown pose backend '{backend}', expected one of {BACKENDS}")
+
+    min_detection = float(os.getenv('MIN_DETECTION_CONFIDENCE', '0.5'))
+    min_tracking = float(os.getenv('MIN_TRACKING_CONFIDENCE', '0.5'))
+
+    if backend == "worker" and num_poses == 1:
+        # Spawns a process, only imported when asked for
+        from src.pose_worker import PoseWorkerClient
+        return PoseWorkerClient(model=model, running_mode=running_mode)
+
+    if backend == "legacy" and num_poses == 1:
+        return mp.solutions.pose.Pose(
+            min_detection_confidence=min_detection,
+            min_tracking_confidence=min_tracking
+        )
+
+    return TasksPoseBackend(
+        model=(model or os.getenv("POSE_MODEL", "full")).lower(),
+        running_mode=(running_mode or os.getenv("POSE_RUNNING_MODE", "video")).lower(),
+        num_poses=num_poses,
+        min_detection_confidence=min_detection,
+        min_tracking_confidence=min_tracking,
+    )
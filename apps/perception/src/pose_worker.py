@@ -0,0 +1,185 @@
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+from src.frame_ring import SharedFrameRing
+from src.motion_gate import MotionGate
+from src.pose_backend import PoseResults, create_pose_backend
+
+logger = logging.getLogger(__name__)
+
+# Re-attach when the ring stops advancing for this long: the camera was
+# restarted and created a new ring under the same name
+STALE_AFTER = 2.0
+
+
+def landmarks_to_array(pose_landmarks) -> Optional[np.ndarray]:
+    """(33, 4) float32 x, y, z, visibility from a NormalizedLandmarkList, None without one"""
+    if pose_landmarks is None:
+        return None
+    return np.array(
+        [(lm.x, lm.y, lm.z, lm.visibility) for lm in pose_landmarks.landmark], dtype=np.float32
+    )
+
+
+def array_to_landmarks(landmarks: np.ndarray) -> landmark_pb2.NormalizedLandmarkList:
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z, visibility in landmarks.tolist():
+        landmark_list.landmark.add(x=x, y=y, z=z, visibility=visibility)
+    return landmark_list
+
+
+def landmarks_region(landmarks: Optional[np.ndarray], visibility_threshold: float = 0.5):
+    """Normalized bounding box of the visible landmarks, None without any"""
+    if landmarks is None:
+        return None
+    visible = landmarks[landmarks[:, 3] >= visibility_threshold, :2]
+    if not len(visible):
+        return None
+    (x0, y0), (x1, y1) = visible.min(axis=0), visible.max(axis=0)
+    return float(x0), float(y0), float(x1), float(y1)
+
+
+def publish(results: multiprocessing.Queue, item):
+    """Newest result wins: make room by dropping the oldest one the app has not taken"""
+    try:
+        results.put_nowait(item)
+    except queue.Full:
+        try:
+            results.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            results.put_nowait(item)
+        except queue.Full:
+            pass
+
+
+def run_pose_worker(ring_name: str, results, stop, backend: str, model: Optional[str],
+                    running_mode: Optional[str]):
+    """Worker process: pose on the newest camera frame in the shared ring, landmarks back to the app"""
+    app_pid = os.getppid()
+    pose = create_pose_backend(backend, model, running_mode)
+    # Frames that did not move keep the last landmarks, as in ExerciseBase.infer
+    gate = MotionGate() if os.getenv('MOTION_GATE', '1') == '1' else None
+    landmarks = None
+    inferred = False
+    ring = None
+    last_number = 0
+    last_frame_at = time.monotonic()
+
+    try:
+        # Also stop if the app died without closing us (killed, crashed)
+        while not stop.is_set() and os.getppid() == app_pid:
+            if ring is None:
+                try:
+                    ring = SharedFrameRing.attach(ring_name)
+                except FileNotFoundError:
+                    # The camera creates the ring with its first frame
+                    time.sleep(0.1)
+                    continue
+                last_number = 0
+                last_frame_at = time.monotonic()
+
+            frame, capture_time, number, token = ring.read()
+            if frame is None or number == last_number:
+                if time.monotonic() - last_frame_at > STALE_AFTER:
+                    ring.close()
+                    ring = None
+                else:
+                    time.sleep(0.002)
+                continue
+
+            # Mirror like the app's prepare stage; the flip copies the frame
+            # out of shared memory, so the slot is only needed until here
+            image = cv2.flip(frame, 1)
+            if not ring.still_valid(token):
+                continue
+            last_number = number
+            last_frame_at = time.monotonic()
+
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            if gate and not gate.should_infer(image_rgb, landmarks_region(landmarks)) and inferred:
+                continue
+            landmarks = landmarks_to_array(pose.process(image_rgb).pose_landmarks)
+            inferred = True
+            publish(results, (number, capture_time, landmarks))
+    finally:
+        if ring is not None:
+            ring.close()
+        pose.close()
+
+
+class PoseWorkerClient:
+    """Pose inference in a separate process, fed from the shared frame ring
+
+    The camera writes every capture into the SharedFrameRing named
+    FRAME_RING_NAME; a worker process attaches to it and runs the pose
+    estimator (POSE_WORKER_BACKEND, legacy or tasks) on the newest frame,
+    sending back only the 33 landmarks. Inference then uses its own core
+    and frames never cross the process boundary.
+
+    ``process`` has the legacy ``Pose`` interface like the other backends,
+    but ignores the image it is given: it returns the newest landmarks the
+    worker has finished, which may be a frame or two behind (like the
+    Tasks live-stream mode). ``frame_number`` is the ring frame they belong
+    to. Until the worker's first result pose_landmarks is None.
+    """
+
+    def __init__(self, ring_name: Optional[str] = None, backend: Optional[str] = None,
+                 model: Optional[str] = None, running_mode: Optional[str] = None):
+        ring_name = ring_name or os.getenv("FRAME_RING_NAME")
+        if not ring_name:
+            raise RuntimeError("The pose worker reads camera frames from the shared frame ring, set FRAME_RING_NAME")
+        backend = (backend or os.getenv("POSE_WORKER_BACKEND", "legacy")).lower()
+        if backend == "worker":
+            raise ValueError("The pose worker runs a legacy or tasks backend, not another worker")
+
+        self.ring_name = ring_name
+        self.backend = backend
+        self.model = model
+        # Spawned, not forked: the app runs threads (camera, asyncio, aiortc)
+        context = multiprocessing.get_context("spawn")
+        self.results = context.Queue(maxsize=2)
+        self.stop_event = context.Event()
+        self.worker = context.Process(
+            target=run_pose_worker,
+            args=(ring_name, self.results, self.stop_event, backend, model, running_mode),
+            name="pose-worker",
+            daemon=True,
+        )
+        self.worker.start()
+        self.latest = PoseResults()
+        self.frame_number = 0
+        logger.info(f"🧵 Pose worker {self.worker.pid} reading ring '{ring_name}' ({backend} backend)")
+
+    def process(self, image_rgb: np.ndarray) -> PoseResults:
+        latest = None
+        while True:
+            try:
+                latest = self.results.get_nowait()
+            except queue.Empty:
+                break
+        if latest is not None:
+            self.frame_number, _, landmarks = latest
+            self.latest = PoseResults(None if landmarks is None else array_to_landmarks(landmarks))
+        return self.latest
+
+    def close(self):
+        if self.worker is None:
+            return
+        self.stop_event.set()
+        self.worker.join(timeout=2.0)
+        if self.worker.is_alive():
+            self.worker.terminate()
+            self.worker.join(timeout=1.0)
+        self.results.cancel_join_thread()
+        self.results.close()
+        self.worker = None
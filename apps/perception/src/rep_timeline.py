@@ -0,0 +1,110 @@
+from collections import deque
+from typing import Dict, Optional
+
+
+class RepTimeline:
+    """Per-rep tempo and range-of-motion records built from the angle stream
+
+    Fed one sample per analysed frame: the exercise's driving joint angle,
+    an optional exercise-specific depth measure (smaller is deeper) and
+    whether the rep counter just moved. Only a handful of running
+    accumulators are kept for the rep in progress, so memory stays constant
+    however long the session runs.
+
+    A rep starts at the last frame the angle was near its top before the
+    descent, the eccentric phase ends at the minimum angle, and the rep ends
+    when the exercise counts it.
+    """
+
+    # Degrees below the running top that still count as "at the top"
+    TOP_TOLERANCE = 3.0
+
+    def __init__(self, history: int = 20):
+        # The most recent completed reps, for stats
+        self.recent: deque = deque(maxlen=history)
+        self.reset()
+
+    def reset(self):
+        self.rep_index = 0
+        self.recent.clear()
+
+        # Rep in progress
+        self.top_angle: Optional[float] = None
+        self.start_time: Optional[float] = None
+        self.min_angle: Optional[float] = None
+        self.min_time: Optional[float] = None
+        self.min_depth: Optional[float] = None
+
+        # Session running sums for averages
+        self.total_duration = 0.0
+        self.total_eccentric = 0.0
+        self.total_rom = 0.0
+
+    def update(self, timestamp: float, angle: Optional[float], depth: Optional[float] = None,
+               rep_completed: bool = False) -> Optional[Dict]:
+        """Add one sample, returns the rep record when a rep completes"""
+        # A rep can be counted on a frame already back near the top; that
+        # frame closes the pending rep, it must not re-arm its start first
+        closing = rep_completed and self.start_time is not None
+        if angle is not None:
+            at_top = self.top_angle is None or angle >= self.top_angle - self.TOP_TOLERANCE
+            if at_top and not closing:
+                # Still at (or back at) the top: the rep has not started yet
+                self.top_angle = angle if self.top_angle is None else max(self.top_angle, angle)
+                self.start_time = timestamp
+                self.min_angle = angle
+                self.min_time = timestamp
+                self.min_depth = depth
+            else:
+                if angle < self.min_angle:
+                    self.min_angle = angle
+                    self.min_time = timestamp
+                if depth is not None and (self.min_depth is None or depth < self.min_depth):
+                    self.min_depth = depth
+
+        if not closing:
+            return None
+
+        record = self.complete(timestamp)
+
+        # The next rep's top is measured from here
+        self.top_angle = angle
+        self.start_time = timestamp
+        self.min_angle = angle
+        self.min_time = timestamp
+        self.min_depth = depth
+        return record
+
+    def complete(self, end_time: float) -> Dict:
+        duration = end_time - self.start_time
+        eccentric = self.min_time - self.start_time
+        rom = self.top_angle - self.min_angle
+
+        self.rep_index += 1
+        self.total_duration += duration
+        self.total_eccentric += eccentric
+        self.total_rom += rom
+
+        record = {
+            "rep": self.rep_index,
+            "start": self.start_time,
+            "end": end_time,
+            "duration": round(duration, 3),
+            "eccentric": round(eccentric, 3),
+            "concentric": round(end_time - self.min_time, 3),
+            "min_angle": round(self.min_angle, 1),
+            "range_of_motion": round(rom, 1),
+            "depth": None if self.min_depth is None else round(self.min_depth, 1),
+        }
+        self.recent.append(record)
+        return record
+
+    def summary(self) -> Dict:
+        if not self.rep_index:
+            return {"reps": 0}
+        return {
+            "reps": self.rep_index,
+            "avg_duration": round(self.total_duration / self.rep_index, 3),
+            "avg_eccentric": round(self.total_eccentric / self.rep_index, 3),
+            "avg_range_of_motion": round(self.total_rom / self.rep_index, 1),
+        }
@@ -0,0 +1,106 @@
+import logging
+import os
+import queue
+import time
+from threading import Thread
+from typing import Optional
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRecorder:
+    """Archives a session's analysed frames to a video file
+
+    Frames are handed over through a bounded queue and encoded on a writer
+    thread. ``submit`` never blocks: when the writer falls behind, the frame
+    is dropped and counted instead, so recording never adds latency to the
+    live stream.
+    """
+
+    def __init__(self, path: str, fps: float = 30, queue_size: int = 60, fourcc: str = "mp4v"):
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.writer = None
+        self.frames_written = 0
+        self.dropped_frames = 0
+        self.thread = Thread(target=self.run, name="recorder", daemon=True)
+
+    @classmethod
+    def for_session(cls, session_id: str, fps: float = 30) -> "SessionRecorder":
+        """Recorder writing to RECORDINGS_DIR/<session>_<time>.mp4"""
+        directory = os.getenv("RECORDINGS_DIR", "recordings")
+        os.makedirs(directory, exist_ok=True)
+        name = f"{session_id}_{time.strftime('%Y%m%d-%H%M%S')}.mp4"
+        return cls(os.path.join(directory, name), fps=fps)
+
+    def start(self):
+        if not self.thread.is_alive():
+            self.thread.start()
+            logger.info(f"⏺️ Recording session to {self.path}")
+
+    def submit(self, frame) -> bool:
+        """Queue a BGR frame for writing, returns False if it was dropped
+
+        The frame is not copied, callers must not modify it afterwards.
+        """
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except queue.Full:
+            self.dropped_frames += 1
+            return False
+
+    def run(self):
+        while True:
+            frame = self.queue.get()
+            if frame is None:
+                break
+
+            try:
+                if self.writer is None:
+                    h, w = frame.shape[:2]
+                    self.writer = cv2.VideoWriter(
+                        self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (w, h)
+                    )
+                self.writer.write(frame)
+                self.frames_written += 1
+            except Exception as e:
+                logger.error(f"Error writing recording frame: {e}")
+
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Flush queued frames and close the file"""
+        if not self.thread.is_alive():
+            return
+
+        # The sentinel must get in even if the queue is full
+        while True:
+            try:
+                self.queue.put_nowait(None)
+                break
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped_frames += 1
+                except queue.Empty:
+                    pass
+
+        self.thread.join(timeout=timeout)
+        logger.info(
+            f"⏹️ Recording saved to {self.path}: {self.frames_written} frames, "
+            f"{self.dropped_frames} dropped"
+        )
+
+    def get_stats(self) -> dict:
+        return {
+            "frames_written": self.frames_written,
+            "dropped_frames": self.dropped_frames,
+            "queued": self.queue.qsize(),
+        }
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import logging
+import random
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import websockets
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[dict], Awaitable[None]]
+
+
+class SignalingClient:
+    """Single shared WebSocket connection to the signaling server
+
+    Every component of the perception app (session control, WebRTC
+    signaling, stats fallback) talks through this one connection. Incoming
+    messages are dispatched by ``type`` to registered handlers. When the
+    connection drops it is re-established with jittered exponential backoff
+    and the active session is registered again, without touching the camera
+    or the inference pipeline.
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        role: str = "perception",
+        min_backoff: float = 0.25,
+        max_backoff: float = 10.0,
+    ):
+        self.ws_url = ws_url
+        self.role = role
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.session_id: Optional[str] = None
+        self.ws = None
+        self.connected = False
+        self.running = False
+        self.reconnects = 0
+        self.handlers: Dict[str, List[MessageHandler]] = {}
+
+    def on(self, msg_type: str, handler: MessageHandler):
+        """Register a coroutine handler for a message type"""
+        self.handlers.setdefault(msg_type, []).append(handler)
+
+    def off(self, msg_type: str, handler: MessageHandler):
+        """Remove a previously registered handler"""
+        if handler in self.handlers.get(msg_type, []):
+            self.handlers[msg_type].remove(handler)
+
+    async def send(self, message: dict) -> bool:
+        """Send a message, returning False if the connection is down"""
+        if not self.ws or not self.connected:
+            return False
+
+        try:
+            await self.ws.send(json.dumps(message))
+            return True
+        except websockets.exceptions.ConnectionClosed:
+            self.connected = False
+            return False
+
+    async def register(self, session_id: Optional[str] = None):
+        """Register for a session (or none); remembered across reconnects"""
+        self.session_id = session_id
+
+        message = {"type": "register", "role": self.role}
+        if session_id:
+            message["sessionId"] = session_id
+
+        if await self.send(message):
+            if session_id:
+                logger.info(f"📱 Registered as {self.role} for session {session_id}")
+            else:
+                logger.info(f"📱 Registered as {self.role} client (waiting for session)")
+
+    async def run(self):
+        """Connect and dispatch messages until close() is called"""
+        self.running = True
+        attempt = 0
+
+        while self.running:
+            try:
+                async with websockets.connect(self.ws_url) as ws:
+                    self.ws = ws
+                    self.connected = True
+                    if attempt:
+                        self.reconnects += 1
+                    attempt = 0
+                    logger.info(f"✅ Connected to WebSocket server at {self.ws_url}")
+
+                    # Re-register the active session (if any) on every connect
+                    await self.register(self.session_id)
+
+                    async for message in ws:
+                        await self.dispatch(message)
+            except (OSError, websockets.exceptions.WebSocketException) as e:
+                logger.warning(f"WebSocket connection lost: {e}")
+            finally:
+                self.connected = False
+                self.ws = None
+
+            if not self.running:
+                break
+
+            # Full-jitter exponential backoff
+            delay = random.uniform(
+                self.min_backoff,
+                min(self.max_backoff, self.min_backoff * 2 ** attempt),
+            )
+            attempt += 1
+            logger.info(f"🔁 Reconnecting in {delay * 1000:.0f}ms (attempt {attempt})")
+            await asyncio.sleep(delay)
+
+    async def dispatch(self, message):
+        """Route a raw message to the handlers registered for its type"""
+        try:
+            data = json.loads(message)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Invalid message from server: {e}")
+            return
+
+        for handler in list(self.handlers.get(data.get("type"), [])):
+            try:
+                await handler(data)
+            except Exception as e:
+                logger.error(f"Error handling {data.get('type')} message: {e}")
+
+    async def close(self):
+        """Stop reconnecting and close the connection"""
+        self.running = False
+        self.connected = False
+
+        if self.ws:
+            await self.ws.close()
+            self.ws = None
@@ -0,0 +1,62 @@
+from typing import Iterable, Tuple
+
+import cv2
+import numpy as np
+
+WHITE = (224, 224, 224)
+
+
+class SkeletonRenderer:
+    """Draws a pose skeleton from landmark arrays with batched OpenCV calls
+
+    Replaces ``mp_drawing.draw_landmarks``: all bones go out in one
+    ``cv2.polylines`` call built from precomputed connection index arrays,
+    and joints in two more (border and fill, as zero-length thick segments,
+    which OpenCV draws as discs). Landmarks below the visibility threshold
+    or outside the frame are skipped, same as MediaPipe's drawing utils.
+    """
+
+    def __init__(self, connections: Iterable[Tuple[int, int]],
+                 bone_color=(0, 255, 0), bone_thickness: int = 1,
+                 joint_color=(0, 0, 255), joint_radius: int = 2, joint_thickness: int = 5,
+                 visibility_threshold: float = 0.5):
+        pairs = np.array(sorted(connections), dtype=np.intp)
+        self.starts = pairs[:, 0]
+        self.ends = pairs[:, 1]
+        self.bone_color = bone_color
+        self.bone_thickness = bone_thickness
+        self.joint_color = joint_color
+        self.visibility_threshold = visibility_threshold
+
+        # Disc sizes closest to cv2.circle(radius, thickness) and its white border
+        border_radius = max(joint_radius + 1, int(joint_radius * 1.2))
+        self.border_size = 2 * border_radius + joint_thickness + 2
+        self.joint_size = 2 * joint_radius + joint_thickness
+
+    def draw(self, image, landmarks: np.ndarray):
+        """Draw an (N, 4) array of normalized (x, y, z, visibility) landmarks"""
+        h, w = image.shape[:2]
+        xy = landmarks[:, :2]
+
+        # NaN (no pose) compares False, so it is never visible
+        with np.errstate(invalid="ignore"):
+            visible = (
+                (landmarks[:, 3] >= self.visibility_threshold)
+                & (xy[:, 0] >= 0) & (xy[:, 0] <= 1)
+                & (xy[:, 1] >= 0) & (xy[:, 1] <= 1)
+            )
+        if not visible.any():
+            return image
+
+        px = np.zeros((len(landmarks), 2), dtype=np.int32)
+        px[visible] = np.minimum(np.floor(xy[visible] * (w, h)), (w - 1, h - 1))
+
+        bones = visible[self.starts] & visible[self.ends]
+        if bones.any():
+            segments = np.stack((px[self.starts[bones]], px[self.ends[bones]]), axis=1)
+            cv2.polylines(image, list(segments), False, self.bone_color, self.bone_thickness)
+
+        joints = px[visible][:, None, :].repeat(2, axis=1)
+        cv2.polylines(image, list(joints), False, WHITE, self.border_size)
+        cv2.polylines(image, list(joints), False, self.joint_color, self.joint_size)
+        return image
@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+NEVER_DROP = "never_drop"
+POLICIES = (DROP_OLDEST, DROP_NEWEST, NEVER_DROP)
+
+
+class StageQueue:
+    """Bounded hand-off between two pipeline stages, with a drop policy
+
+    ``put`` never blocks the producing stage. When the queue is full:
+        drop_oldest  the oldest queued item is discarded (video: keep it live)
+        drop_newest  the new item is discarded
+        never_drop   the queue grows past ``maxsize`` (events that must all
+                     arrive); ``maxsize`` is only a warning level
+
+    Counters (items in and out, drops, high-water depth, how often and how
+    long the consumer found it empty) show which side of the queue is the
+    slow one. Safe to use across threads.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1, policy: str = DROP_OLDEST):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown drop policy '{policy}', expected one of {POLICIES}")
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.items: deque = deque()
+        self.ready = threading.Condition()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped = 0
+        self.high_water = 0
+        self.empty_reads = 0
+        self.wait_time = 0.0
+        self.warned = False
+
+    def __len__(self):
+        return len(self.items)
+
+    def put(self, item: Any) -> bool:
+        """Hand an item to the next stage, returns False if something was dropped"""
+        with self.ready:
+            self.put_count += 1
+            kept = True
+            if len(self.items) >= self.maxsize:
+                if self.policy == DROP_OLDEST:
+                    self.items.popleft()
+                    self.dropped += 1
+                    kept = False
+                elif self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                elif not self.warned:
+                    self.warned = True
+                    logger.warning(f"⚠️ Queue '{self.name}' is {len(self.items)} deep, its consumer is behind")
+
+            self.items.append(item)
+            self.high_water = max(self.high_water, len(self.items))
+            self.ready.notify()
+            return kept
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Next item, waiting up to ``timeout`` seconds; None if there is none"""
+        with self.ready:
+            if not self.items:
+                self.empty_reads += 1
+                if timeout is not None and timeout <= 0:
+                    return None
+                started = time.perf_counter()
+                self.ready.wait_for(lambda: self.items, timeout)
+                self.wait_time += time.perf_counter() - started
+                if not self.items:
+                    return None
+            self.get_count += 1
+            item = self.items.popleft()
+            # Wake producers waiting for space as well as other consumers
+            self.ready.notify_all()
+            return item
+
+    def wait_for_space(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the queue is below ``maxsize``, for producers that would rather wait than drop"""
+        with self.ready:
+            return self.ready.wait_for(lambda: len(self.items) < self.maxsize, timeout)
+
+    def get_nowait(self) -> Optional[Any]:
+        return self.get(timeout=0)
+
+    def drain(self) -> List[Any]:
+        """Everything queued, oldest first"""
+        with self.ready:
+            items = list(self.items)
+            self.items.clear()
+            self.get_count += len(items)
+            return items
+
+    def clear(self):
+        with self.ready:
+            self.items.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "depth": len(self.items),
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "put": self.put_count,
+            "got": self.get_count,
+            "dropped": self.dropped,
+            "high_water": self.high_water,
+            "empty_reads": self.empty_reads,
+            "wait_ms": round(self.wait_time * 1000, 1),
+        }
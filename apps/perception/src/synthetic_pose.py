@@ -0,0 +1,350 @@
+"""
+Synthetic pose sequences for driving the exercise trackers without MediaPipe
+
+Each exercise is a small 2D kinematic model (side view for squats, pushups,
+lunges and planks, front view for shoulder taps) driven by a rep phase
+between 0 (top) and 1 (bottom). Whole sequences are generated at once with
+NumPy, as (N, 33, 4) arrays of normalized (x, y, z, visibility) landmarks in
+the MediaPipe pose layout, so trackers can be fed tens of thousands of
+frames per second through ``ExerciseBase.process_landmarks``.
+
+Poses are framed so they cross the thresholds the trackers use (hip-knee
+gap for squats, shoulder-wrist gap for pushups, knee and elbow angles for
+lunges and shoulder taps, body line for planks).
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+NUM_LANDMARKS = 33
+
+# Segment lengths in normalized image units
+UPPER_ARM = 0.16
+FOREARM = 0.15
+TRUNK = 0.28
+THIGH = 0.22
+SHIN = 0.22
+HEAD = 0.09
+
+LEFT_ARM = [13, 15, 17, 19, 21]
+RIGHT_ARM = [14, 16, 18, 20, 22]
+LEFT_LEG = [25, 27, 29, 31]
+RIGHT_LEG = [26, 28, 30, 32]
+LIMBS = [LEFT_ARM, RIGHT_ARM, LEFT_LEG, RIGHT_LEG]
+
+
+class Tempo:
+    """Timing of one rep cycle, in seconds
+
+    A cycle is: hold at the top, eccentric (down) phase, hold at the
+    bottom, concentric (up) phase. ``lead_in`` is standing time before the
+    first rep (Lunges and ShoulderTap ignore their first 80 frames).
+    """
+
+    def __init__(self, rep_duration: float = 2.0, eccentric: float = 0.5, hold_top: float = 0.5,
+                 hold_bottom: float = 0.1, lead_in: float = 3.0):
+        self.down = rep_duration * eccentric
+        self.up = rep_duration * (1 - eccentric)
+        self.hold_top = hold_top
+        self.hold_bottom = hold_bottom
+        self.lead_in = lead_in
+
+    @property
+    def cycle(self) -> float:
+        return self.hold_top + self.down + self.hold_bottom + self.up
+
+    def phase(self, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(phase in [0, 1], cycle index) at times t; phase is 0 during the lead-in"""
+        t = np.maximum(t - self.lead_in, 0.0)
+        index = np.floor(t / self.cycle).astype(np.int64)
+        u = t - index * self.cycle
+
+        down_end = self.hold_top + self.down
+        bottom_end = down_end + self.hold_bottom
+        p = np.zeros_like(u)
+        falling = (u >= self.hold_top) & (u < down_end)
+        p[falling] = _smoothstep((u[falling] - self.hold_top) / self.down)
+        p[(u >= down_end) & (u < bottom_end)] = 1.0
+        rising = u >= bottom_end
+        p[rising] = 1.0 - _smoothstep((u[rising] - bottom_end) / self.up)
+        return p, index
+
+    def completed_reps(self, duration: float) -> int:
+        """Reps fully finished within ``duration`` seconds"""
+        return int(max(duration - self.lead_in, 0.0) // self.cycle)
+
+
+def _smoothstep(x):
+    x = np.clip(x, 0.0, 1.0)
+    return x * x * (3 - 2 * x)
+
+
+def _direction(angle_deg):
+    """Unit vectors (n, 2) for image-space angles (y points down)"""
+    a = np.radians(angle_deg)
+    return np.stack((np.cos(a), np.sin(a)), axis=-1)
+
+
+def _lerp(a, b, p):
+    return a + (b - a) * p
+
+
+def _ik(root, end, l1, l2, bend):
+    """Middle joint of a two-segment limb from root to end, bent to the ``bend`` side (+1/-1)"""
+    v = end - root
+    d = np.linalg.norm(v, axis=-1, keepdims=True)
+    d = np.clip(d, abs(l1 - l2) + 1e-6, l1 + l2 - 1e-6)
+    u = v / np.maximum(np.linalg.norm(v, axis=-1, keepdims=True), 1e-9)
+    a = (l1 ** 2 - l2 ** 2 + d ** 2) / (2 * d)
+    h = np.sqrt(np.maximum(l1 ** 2 - a ** 2, 0.0))
+    perp = np.stack((-u[:, 1], u[:, 0]), axis=-1)
+    return root + a * u + bend * h * perp
+
+
+def _point(x, y, n):
+    return np.tile(np.array([x, y], dtype=np.float64), (n, 1))
+
+
+# Exercise models: phase (n,) and cycle index (n,) -> named joints, each (n, 2)
+
+def squat_pose(p, index, depth: float = 1.0):
+    n = len(p)
+    ankle = _point(0.5, 0.88, n)
+    knee = ankle + SHIN * _direction(_lerp(-90, -60, p * depth))
+    hip = knee + THIGH * _direction(_lerp(-90, -180, p * depth))
+    shoulder = hip + TRUNK * _direction(_lerp(-90, -55, p * depth))
+    elbow = shoulder + UPPER_ARM * _direction(_lerp(90, 0, p))
+    wrist = elbow + FOREARM * _direction(_lerp(90, 0, p))
+    return _side_view(shoulder, elbow, wrist, hip, knee, ankle, facing=1)
+
+
+def pushup_pose(p, index, depth: float = 1.0, scale: float = 2.2):
+    # Close framing: the tracker compares the shoulder-wrist gap against 300px
+    n = len(p)
+    floor = 0.95
+    wrist = _point(0.75, floor, n)
+    elbow_angle = _lerp(175, 85, p * depth)
+    elbow = wrist + FOREARM * scale * _direction(np.full(n, -90.0))
+    shoulder = elbow + UPPER_ARM * scale * _direction(90 + elbow_angle)
+    body = (TRUNK + THIGH + SHIN) * scale
+    tilt = np.degrees(np.arcsin(np.clip((floor - shoulder[:, 1]) / body, -1, 1)))
+    along = _direction(180 - tilt)
+    hip = shoulder + TRUNK * scale * along
+    knee = hip + THIGH * scale * along
+    ankle = knee + SHIN * scale * along
+    return _side_view(shoulder, elbow, wrist, hip, knee, ankle, facing=1)
+
+
+def lunge_pose(p, index, depth: float = 1.0):
+    n = len(p)
+    front_ankle = _point(0.62, 0.9, n)
+    back_ankle = _point(0.38, 0.9, n)
+    reach = _lerp(0.985 * (THIGH + SHIN), 0.93 * np.hypot(THIGH, SHIN), p * depth)
+    hip = np.stack((np.full(n, 0.5), 0.9 - np.sqrt(reach ** 2 - 0.12 ** 2)), axis=-1)
+    front_knee = _ik(hip, front_ankle, THIGH, SHIN, -1)
+    back_knee = _ik(hip, back_ankle, THIGH, SHIN, -1)
+    shoulder = hip + TRUNK * _direction(np.full(n, -90.0))
+    elbow = shoulder + UPPER_ARM * _direction(np.full(n, 100.0))
+    wrist = elbow + FOREARM * _direction(np.full(n, 60.0))
+
+    # Alternate the leading leg every rep
+    left_front = (index % 2 == 0)[:, None]
+    joints = _side_view(shoulder, elbow, wrist, hip,
+                        np.where(left_front, front_knee, back_knee),
+                        np.where(left_front, front_ankle, back_ankle), facing=1)
+    joints["r_knee"] = np.where(left_front, back_knee, front_knee)
+    joints["r_ankle"] = np.where(left_front, back_ankle, front_ankle)
+    return joints
+
+
+def plank_pose(p, index, depth: float = 1.0):
+    # p is sag: 0 is a straight body line, 1 drops the hips out of alignment
+    n = len(p)
+    floor = 0.85
+    wrist = _point(0.7, floor, n)
+    shoulder = wrist - np.array([0.0, UPPER_ARM + FOREARM])
+    elbow = (shoulder + wrist) / 2
+    legs = THIGH + SHIN
+    tilt = np.degrees(np.arcsin((floor - shoulder[:, 1]) / (TRUNK + legs)))
+    along = _direction(180 - tilt)
+    ankle = shoulder + (TRUNK + legs) * along
+    down = np.stack((-along[:, 1], along[:, 0]), axis=-1)
+    down *= np.sign(down[:, 1:2])
+    hip = shoulder + TRUNK * along + 0.06 * (p * depth)[:, None] * down
+    knee = (hip + ankle) / 2
+    return _side_view(shoulder, elbow, wrist, hip, knee, ankle, facing=1)
+
+
+def shoulder_tap_pose(p, index, depth: float = 1.0):
+    # Front view, high plank facing the camera; taps alternate hands every rep
+    n = len(p)
+    floor = 0.8
+    reach = 0.995 * (UPPER_ARM + FOREARM)
+    joints = {
+        "l_shoulder": _point(0.6, floor - reach, n),
+        "r_shoulder": _point(0.4, floor - reach, n),
+        "l_hip": _point(0.55, 0.62, n),
+        "r_hip": _point(0.45, 0.62, n),
+        "l_knee": _point(0.54, 0.72, n),
+        "r_knee": _point(0.46, 0.72, n),
+        "l_ankle": _point(0.53, 0.82, n),
+        "r_ankle": _point(0.47, 0.82, n),
+    }
+
+    left_tap = (index % 2 == 0)
+    for side, other, outward, tapping in (("l", "r", 1, left_tap), ("r", "l", -1, ~left_tap)):
+        shoulder = joints[f"{side}_shoulder"]
+        rest = shoulder + np.array([0.0, reach])
+        target = joints[f"{other}_shoulder"] + np.array([0.0, 0.02])
+        lift = np.where(tapping, p * depth, 0.0)[:, None]
+        wrist = _lerp(rest, target, lift)
+        elbow = _ik(shoulder, wrist, UPPER_ARM, FOREARM, 1)
+        mirrored = _ik(shoulder, wrist, UPPER_ARM, FOREARM, -1)
+        # Elbows flare away from the body
+        elbow = np.where(((elbow[:, 0] - mirrored[:, 0]) * outward >= 0)[:, None], elbow, mirrored)
+        joints[f"{side}_elbow"] = elbow
+        joints[f"{side}_wrist"] = wrist
+
+    joints["head"] = _point(0.5, floor - reach - 0.06, n)
+    joints["facing"] = np.array([0.0, 1.0])
+    return joints
+
+
+def _side_view(shoulder, elbow, wrist, hip, knee, ankle, facing: int) -> Dict:
+    """Side view: the far limbs sit slightly behind the near ones"""
+    offset = np.array([-0.012 * facing, -0.004])
+    trunk = shoulder - hip
+    trunk /= np.maximum(np.linalg.norm(trunk, axis=-1, keepdims=True), 1e-9)
+    return {
+        "l_shoulder": shoulder, "l_elbow": elbow, "l_wrist": wrist,
+        "l_hip": hip, "l_knee": knee, "l_ankle": ankle,
+        "r_shoulder": shoulder + offset, "r_elbow": elbow + offset, "r_wrist": wrist + offset,
+        "r_hip": hip + offset, "r_knee": knee + offset, "r_ankle": ankle + offset,
+        "head": shoulder + HEAD * trunk,
+        "facing": np.array([float(facing), 0.0]),
+    }
+
+
+EXERCISE_MODELS = {
+    "squat": squat_pose,
+    "pushup": pushup_pose,
+    "lunges": lunge_pose,
+    "plank": plank_pose,
+    "shouldertap": shoulder_tap_pose,
+}
+
+DEFAULT_TEMPOS = {
+    "squat": Tempo(rep_duration=2.0),
+    "pushup": Tempo(rep_duration=1.6),
+    "lunges": Tempo(rep_duration=2.4),
+    # Long holds with a short sag between them
+    "plank": Tempo(rep_duration=1.0, eccentric=0.5, hold_top=20.0, hold_bottom=1.0),
+    "shouldertap": Tempo(rep_duration=1.0, hold_top=0.2, hold_bottom=0.1),
+}
+
+
+class SyntheticPoseGenerator:
+    """Landmark sequences for one exercise with tempo, noise, occlusion and dropouts
+
+    noise          standard deviation of per-frame landmark jitter (normalized units)
+    occlusion      per-frame probability that a random limb becomes occluded
+                   (visibility below threshold) for ``occlusion_frames`` frames
+    dropout        per-frame probability that no pose is detected at all
+    depth          range of motion, 1.0 reaches the trackers' thresholds comfortably
+    """
+
+    def __init__(self, exercise: str, fps: float = 30, tempo: Optional[Tempo] = None,
+                 noise: float = 0.002, occlusion: float = 0.0, occlusion_frames: int = 10,
+                 dropout: float = 0.0, depth: float = 1.0, seed: int = 0):
+        key = exercise.lower()
+        if key not in EXERCISE_MODELS:
+            raise ValueError(f"No synthetic model for exercise '{exercise}'")
+
+        self.exercise = key
+        self.model = EXERCISE_MODELS[key]
+        self.fps = fps
+        self.tempo = tempo or DEFAULT_TEMPOS[key]
+        self.noise = noise
+        self.occlusion = occlusion
+        self.occlusion_frames = occlusion_frames
+        self.dropout = dropout
+        self.depth = depth
+        self.rng = np.random.default_rng(seed)
+
+    def generate(self, n_frames: int, start_time: float = 0.0):
+        """(timestamps (N,), landmarks (N, 33, 4) float32, present (N,) bool)
+
+        Frames where ``present`` is False stand for "no pose detected" and
+        hold NaN landmarks.
+        """
+        timestamps = start_time + np.arange(n_frames) / self.fps
+        phase, index = self.tempo.phase(timestamps - start_time)
+        joints = self.model(phase, index, depth=self.depth)
+
+        landmarks = _assemble(joints, n_frames)
+        landmarks[:, :, 3] = np.where(np.arange(NUM_LANDMARKS) % 2 == 1, 0.97, 0.93)
+
+        if self.noise:
+            landmarks[:, :, :2] += self.rng.normal(0.0, self.noise, (n_frames, NUM_LANDMARKS, 2))
+
+        if self.occlusion:
+            starts = np.flatnonzero(self.rng.random(n_frames) < self.occlusion)
+            limbs = self.rng.integers(len(LIMBS), size=len(starts))
+            for start, limb in zip(starts, limbs):
+                landmarks[start:start + self.occlusion_frames, LIMBS[limb], 3] = 0.1
+
+        present = np.ones(n_frames, dtype=bool)
+        if self.dropout:
+            present = self.rng.random(n_frames) >= self.dropout
+            landmarks[~present] = np.nan
+
+        return timestamps, landmarks.astype(np.float32), present
+
+    def expected_reps(self, n_frames: int) -> int:
+        """Reps (taps for shoulder taps) finished within n_frames"""
+        if self.exercise == "plank":
+            return 0
+        return self.tempo.completed_reps(n_frames / self.fps)
+
+
+def _assemble(joints: Dict, n: int) -> np.ndarray:
+    """Full 33-landmark layout from the core joints"""
+    out = np.zeros((n, NUM_LANDMARKS, 4), dtype=np.float64)
+    facing = joints["facing"]
+    side_view = facing[1] == 0
+
+    core = {
+        11: "l_shoulder", 12: "r_shoulder", 13: "l_elbow", 14: "r_elbow",
+        15: "l_wrist", 16: "r_wrist", 23: "l_hip", 24: "r_hip",
+        25: "l_knee", 26: "r_knee", 27: "l_ankle", 28: "r_ankle",
+    }
+    for i, name in core.items():
+        out[:, i, :2] = joints[name]
+
+    # Face around the head point
+    head = joints["head"]
+    if side_view:
+        face = [(0.03, 0.0), (0.025, -0.012), (0.025, -0.012), (0.025, -0.012), (0.022, -0.012),
+                (0.022, -0.012), (0.022, -0.012), (0.0, -0.005), (-0.004, -0.005), (0.025, 0.015),
+                (0.022, 0.015)]
+        face = [(dx * facing[0], dy) for dx, dy in face]
+    else:
+        face = [(0.0, 0.0), (0.012, -0.012), (0.018, -0.012), (0.024, -0.012), (-0.012, -0.012),
+                (-0.018, -0.012), (-0.024, -0.012), (0.035, -0.005), (-0.035, -0.005), (0.01, 0.015),
+                (-0.01, 0.015)]
+    out[:, :11, :2] = head[:, None, :] + np.array(face)
+
+    # Hands continue the forearm, feet point the way the body faces
+    for wrist, elbow, fingers in ((15, 13, (17, 19, 21)), (16, 14, (18, 20, 22))):
+        forearm = out[:, wrist, :2] - out[:, elbow, :2]
+        forearm /= np.maximum(np.linalg.norm(forearm, axis=-1, keepdims=True), 1e-9)
+        side = np.stack((-forearm[:, 1], forearm[:, 0]), axis=-1)
+        for finger, spread in zip(fingers, (0.01, -0.004, -0.012)):
+            out[:, finger, :2] = out[:, wrist, :2] + 0.035 * forearm + spread * side
+    for ankle, heel, toe in ((27, 29, 31), (28, 30, 32)):
+        toe_dir = np.array([facing[0], 0.0]) if side_view else np.array([0.0, 0.01])
+        out[:, heel, :2] = out[:, ankle, :2] + np.array([-0.02 * facing[0], 0.02])
+        out[:, toe, :2] = out[:, ankle, :2] + np.array([0.0, 0.02]) + 0.05 * toe_dir
+
+    return out
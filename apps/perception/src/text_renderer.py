@@ -0,0 +1,99 @@
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class Sprite:
+    """Pre-rasterised text: a colour patch plus its mask, anchored like putText"""
+
+    __slots__ = ("patch", "mask", "offset_x", "offset_y")
+
+    def __init__(self, text: str, font: int, scale: float, color, thickness: int, line_type: int):
+        (width, height), baseline = cv2.getTextSize(text, font, scale, thickness)
+        pad = thickness + 1
+        canvas = np.zeros((height + baseline + 2 * pad, width + 2 * pad), dtype=np.uint8)
+        cv2.putText(canvas, text, (pad, pad + height), font, scale, 255, thickness, line_type)
+
+        self.mask = canvas
+        self.patch = np.empty(canvas.shape + (3,), dtype=np.uint8)
+        self.patch[:] = np.array(color[:3], dtype=np.uint8)
+        # putText's origin is the baseline start, the sprite's is its top-left corner
+        self.offset_x = -pad
+        self.offset_y = -(pad + height)
+
+    def blit(self, image, x: int, y: int) -> bool:
+        """Draw the text with its origin at (x, y); False without drawing if it does not fit
+
+        putText rasterises strokes against the frame edge, so text cut off
+        by the edge does not match a cropped sprite and is left to putText.
+        """
+        x0, y0 = x + self.offset_x, y + self.offset_y
+        h, w = self.mask.shape
+        ih, iw = image.shape[:2]
+        if x0 < 0 or y0 < 0 or x0 + w > iw or y0 + h > ih:
+            return False
+
+        # Masked copy straight into the ROI view of the frame
+        cv2.copyTo(self.patch, self.mask, image[y0:y0 + h, x0:x0 + w])
+        return True
+
+
+class TextRenderer:
+    """Drop-in replacement for cv2.putText that blits cached text sprites
+
+    Each string is rasterised once per font, scale, colour and thickness,
+    then blitted with a masked copy into the frame. Output is pixel
+    identical to putText: anti-aliased text (its blend depends on the
+    pixels underneath) and text cut off by the frame edge are drawn by
+    putText. Fixed labels are cached on first use; text with digits
+    (counters, angles, durations) once it repeats, so values that change
+    every frame do not churn the cache and are drawn by putText as before.
+    Cached strings live in a bounded LRU.
+
+    Thickness 1 text goes straight to cv2.putText, it is already as cheap
+    as a blit.
+    """
+
+    def __init__(self, max_strings: int = 512):
+        self.max_strings = max_strings
+        self.strings: OrderedDict = OrderedDict()
+        self.seen: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def remember(cache: OrderedDict, key, value, limit: int):
+        cache[key] = value
+        if len(cache) > limit:
+            cache.popitem(last=False)
+
+    def put_text(self, img, text, org, fontFace, fontScale, color, thickness=1, lineType=cv2.LINE_8):
+        if thickness <= 1 or lineType == cv2.LINE_AA:
+            return cv2.putText(img, text, org, fontFace, fontScale, color, thickness, lineType)
+
+        color = tuple(color)
+        key = (text, fontFace, fontScale, color, thickness, lineType)
+
+        sprite = self.strings.get(key)
+        if sprite is None:
+            if key not in self.seen and any(c.isdigit() for c in text):
+                # First sighting of a value, it may never come back
+                self.remember(self.seen, key, True, self.max_strings)
+                return cv2.putText(img, text, org, fontFace, fontScale, color, thickness, lineType)
+
+            self.seen.pop(key, None)
+            sprite = Sprite(text, fontFace, fontScale, color, thickness, lineType)
+            self.remember(self.strings, key, sprite, self.max_strings)
+        else:
+            self.strings.move_to_end(key)
+
+        if not sprite.blit(img, int(org[0]), int(org[1])):
+            return cv2.putText(img, text, org, fontFace, fontScale, color, thickness, lineType)
+        return img
+
+
+text_renderer = TextRenderer()
+
+
+def put_text(img, text, org, fontFace, fontScale, color, thickness=1, lineType=cv2.LINE_8):
+    """cv2.putText through the shared glyph cache"""
+    return text_renderer.put_text(img, text, org, fontFace, fontScale, color, thickness, lineType)
@@ -3,11 +3,10 @@ import fractions
 import json
 import logging
 import time
-from typing import Optional
+from typing import Dict, Optional
 
 import cv2
 import numpy as np
-import websockets
 from aiortc import (
     RTCConfiguration,
     RTCIceCandidate,
@@ -17,136 +16,337 @@ from aiortc import (
 )
 from aiortc.contrib.media import MediaPlayer
 from av import VideoFrame
+from encoder_control import CongestionController, EncoderSettings, fit_frame, prefer_codec
+from frame_latency import LatencyHistogram, stamp_frame_marker
+from frame_relay import AnalysedFrameProducer
+from landmark_packet import encode_landmark_packet
+from session_recorder import SessionRecorder
+from signaling_client import SignalingClient
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+VIDEO_CLOCK_RATE = 90000
+VIDEO_TIME_BASE = fractions.Fraction(1, VIDEO_CLOCK_RATE)
 
-class OpenCVVideoTrack(VideoStreamTrack):
-    """Custom video track that streams OpenCV frames via WebRTC"""
 
-    def __init__(self, threaded_camera, exercise_processor=None):
+class OpenCVVideoTrack(VideoStreamTrack):
+    """Custom video track that streams OpenCV frames via WebRTC
+
+    Reads from any frame source with a ``get_frame()`` method, normally the
+    session's ``AnalysedFrameProducer`` so inference runs once however many
+    tracks subscribe. Frames are paced on a monotonic clock at a fixed
+    target interval. When the track falls behind, missed slots are skipped
+    instead of being caught up in a burst. If no new frame arrived since the
+    last slot, the previous output is sent again without converting it
+    again. Timestamps come from the capture time of each frame.
+
+    Sources that offer ``subscribe`` (the producer) hand the track its own
+    bounded queue of analysed frames instead, so frames the encoder could
+    not keep up with are dropped and counted on that queue.
+
+    Each new frame's capture-to-``VideoFrame`` latency is recorded in
+    ``latency``; with ``frame_marker`` set its sequence number and capture
+    time are also stamped into the picture.
+    """
+
+    def __init__(self, source, settings: Optional[EncoderSettings] = None, name: str = "viewer"):
         super().__init__()
-        self.threaded_camera = threaded_camera
-        self.exercise_processor = exercise_processor
+        self.source = source
+        self.queue = source.subscribe(name) if hasattr(source, "subscribe") else None
         self.frame_count = 0
-        self.start_time = time.time()
+        self.dropped_slots = 0
+        self.start_time = time.monotonic()
+        self.next_slot: Optional[float] = None
+        self.last_pts = -1
+        self.last_seq = None
+        self.last_output = None
+
+        # Output caps, lowered at runtime by the congestion controller
+        settings = settings or EncoderSettings()
+        self.max_width = settings.max_width
+        self.max_height = settings.max_height
+        self.max_fps = settings.max_fps
+        self.frame_marker = settings.frame_marker
+        self.latency = LatencyHistogram()
+
+    async def wait_for_slot(self):
+        """Sleep until the next frame slot, skipping slots we are already late for"""
+        interval = 1 / self.max_fps
+        now = time.monotonic()
+
+        if self.next_slot is None:
+            self.next_slot = now
+        elif now < self.next_slot:
+            await asyncio.sleep(self.next_slot - now)
+        elif now - self.next_slot >= interval:
+            missed = int((now - self.next_slot) / interval)
+            self.dropped_slots += missed
+            self.next_slot += missed * interval
+
+        self.next_slot += interval
+
+    def next_pts(self, capture_time: float) -> int:
+        """90kHz pts from the capture time, strictly increasing"""
+        pts = int((capture_time - self.start_time) * VIDEO_CLOCK_RATE)
+        pts = max(pts, self.last_pts + 1)
+        self.last_pts = pts
+        return pts
 
     async def recv(self):
         """Generate video frames for WebRTC transmission"""
-        # Calculate target timestamp for 30fps
-        pts = int((time.time() - self.start_time) * 90000)  # 90kHz clock
+        await self.wait_for_slot()
 
-        # Get frame from threaded camera
-        success, frame = self.threaded_camera.show_frame()
+        # Get the next analysed frame
+        success, frame, capture_time, seq = self.next_frame()
+        source_frame = frame
 
-        if not success or frame is None:
+        if success and seq == self.last_seq and self.last_output is not None:
+            # No new frame since the last slot, resend the previous output
+            return self.wrap_frame(self.last_output, time.monotonic())
+        elif not success or frame is None:
             # Return black frame if no camera data
+            capture_time = time.monotonic()
             frame = np.zeros((480, 640, 3), dtype=np.uint8)
         else:
-            # Process frame with exercise tracking if processor is available
-            if self.exercise_processor:
-                try:
-                    frame, stats = self.exercise_processor.process_frame(frame)
-                    # Stats could be sent via WebSocket if needed
-                except Exception as e:
-                    logger.error(f"Error processing frame: {e}")
+            self.last_seq = seq
+
+        # Scale down to the output resolution cap before conversion and encoding
+        frame = fit_frame(frame, self.max_width, self.max_height)
 
         # Ensure frame is in the right format (RGB)
         if len(frame.shape) == 3 and frame.shape[2] == 3:
             # Convert BGR to RGB for WebRTC
             frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
-        # Create VideoFrame
+        if self.frame_marker and success:
+            # Never draw into the producer's frame, other viewers share it
+            if frame is source_frame:
+                frame = frame.copy()
+            capture_wall = time.time() - (time.monotonic() - capture_time)
+            stamp_frame_marker(frame, seq, int(capture_wall * 1000) & 0xFFFFFFFF)
+
+        self.last_output = frame
+        av_frame = self.wrap_frame(frame, capture_time)
+        if success:
+            self.latency.record(time.monotonic() - capture_time)
+        return av_frame
+
+    def next_frame(self):
+        """(success, frame, capture time, seq) from the queue or the source's latest frame"""
+        if self.queue is None:
+            return self.source.get_frame()
+
+        item = self.queue.get_nowait()
+        if item is None:
+            # Nothing new from the analysis stage, recv resends the last output
+            return self.last_seq is not None, None, 0.0, self.last_seq
+        frame, capture_time, seq = item
+        return True, frame, capture_time, seq
+
+    def stop(self):
+        if self.queue is not None:
+            self.source.unsubscribe(self.queue)
+        super().stop()
+
+    def wrap_frame(self, frame, capture_time: float) -> VideoFrame:
+        """Create the VideoFrame handed to the encoder"""
         av_frame = VideoFrame.from_ndarray(frame, format="rgb24")
-        av_frame.pts = pts
-        av_frame.time_base = fractions.Fraction(1, 90000)  # Use Fraction for time_base
+        av_frame.pts = self.next_pts(capture_time)
+        av_frame.time_base = VIDEO_TIME_BASE
 
         self.frame_count += 1
         return av_frame
 
 
-class WebRTCStreamer:
-    """WebRTC video streamer for perception app"""
+class ViewerPeer:
+    """Peer connection to one viewer, fed by the session's shared producer"""
 
-    def __init__(self, ws_url: str = "ws://192.168.1.103:3001", session_id: str = None, exercise_processor=None):
-        self.ws_url = ws_url
-        self.session_id = session_id
-        self.exercise_processor = exercise_processor
-        self.ws = None
+    def __init__(self, client_id: Optional[str], producer: AnalysedFrameProducer,
+                 stream_mode: str, settings: EncoderSettings):
+        self.client_id = client_id
+        self.producer = producer
+        self.stream_mode = stream_mode
+        self.settings = settings
         self.pc = None
         self.video_track = None
-        self.connected = False
-        self.streaming = False
+        self.data_channel = None
+        self.landmark_channel = None
+        self.congestion_controller = None
+
+    async def create_offer(self, send_signaling):
+        """Build the peer connection and send the offer to the viewer"""
+        # Create peer connection - configured for local network use
+        configuration = RTCConfiguration([])  # No ICE servers for local connections
+        self.pc = RTCPeerConnection(configuration)
+
+        # Subscribe a video track to the shared analysed stream
+        if self.stream_mode != "stats":
+            self.video_track = OpenCVVideoTrack(
+                self.producer, settings=self.settings, name=self.client_id or "mobile"
+            )
+            transceiver = self.pc.addTransceiver(self.video_track, direction="sendonly")
+            prefer_codec(transceiver, self.settings.codec)
+            logger.info(f"📹 Added video track to peer connection ({self.settings})")
+
+            # Scale resolution, framerate and bitrate with RTCP feedback
+            self.congestion_controller = CongestionController(
+                transceiver.sender, self.video_track, self.settings
+            )
+            self.congestion_controller.start()
+
+        # Data channel for stats and rep events, negotiated in the same offer
+        self.data_channel = self.pc.createDataChannel("stats", ordered=True)
+
+        @self.data_channel.on("open")
+        def on_data_channel_open():
+            logger.info(f"📊 Stats data channel open ({self.client_id or 'mobile'})")
+
+        # Landmark packets are only useful while fresh: unordered, no retransmits
+        if self.stream_mode != "overlay":
+            self.landmark_channel = self.pc.createDataChannel(
+                "landmarks", ordered=False, maxRetransmits=0
+            )
+
+        # Set up ICE candidate handling
+        @self.pc.on("icecandidate")
+        async def on_icecandidate(candidate):
+            if candidate:
+                await send_signaling(
+                    "ice-candidate",
+                    {
+                        "candidate": candidate.candidate,
+                        "sdpMid": candidate.sdpMid,
+                        "sdpMLineIndex": candidate.sdpMLineIndex,
+                    },
+                    self.client_id,
+                )
+
+        # Create offer
+        offer = await self.pc.createOffer()
+        await self.pc.setLocalDescription(offer)
+
+        # Send offer to the viewer
+        await send_signaling("offer", {"type": offer.type, "sdp": offer.sdp}, self.client_id)
+
+    @staticmethod
+    def channel_open(channel) -> bool:
+        return channel is not None and channel.readyState == "open"
+
+    async def handle_signaling(self, signal_type: str, data: dict):
+        """Apply an answer or ICE candidate from the viewer"""
+        if signal_type == "answer":
+            # Handle answer from mobile app
+            answer = RTCSessionDescription(sdp=data["sdp"], type=data["type"])
+            await self.pc.setRemoteDescription(answer)
+            logger.info("✅ Set remote description from mobile answer")
 
-    async def connect(self):
-        """Connect to WebSocket signaling server"""
-        try:
-            self.ws = await websockets.connect(self.ws_url)
-            self.connected = True
-            logger.info(f"✅ Connected to signaling server at {self.ws_url}")
+        elif signal_type == "ice-candidate":
+            # Handle ICE candidate from mobile app
+            if data.get("candidate"):
+                try:
+                    # aiortc expects the candidate to be parsed from the candidate string
+                    from aiortc.sdp import candidate_from_sdp
+                    
+                    # Parse the candidate string
+                    ice_candidate = candidate_from_sdp(data.get("candidate"))
+                    ice_candidate.sdpMid = data.get("sdpMid")
+                    ice_candidate.sdpMLineIndex = data.get("sdpMLineIndex")
+                    
+                    await self.pc.addIceCandidate(ice_candidate)
+                    logger.info("🧊 Added ICE candidate from mobile")
+                except Exception as e:
+                    logger.error(f"Failed to add ICE candidate: {e}")
+            else:
+                logger.info("📭 Received end-of-candidates signal")
 
-            # Register as perception client for the session
-            if self.session_id:
-                await self.register_client()
+    async def close(self):
+        if self.congestion_controller:
+            self.congestion_controller.stop()
+            self.congestion_controller = None
 
-            return True
-        except Exception as e:
-            logger.error(f"❌ Failed to connect to signaling server: {e}")
-            self.connected = False
-            return False
+        if self.video_track:
+            self.video_track.stop()
 
-    async def register_client(self):
-        """Register this client as a perception device for the session"""
-        register_message = {
-            "type": "register",
-            "sessionId": self.session_id,
-            "role": "perception",
-        }
-        await self.send_message(register_message)
-        logger.info(f"📱 Registered as perception client for session {self.session_id}")
+        if self.pc:
+            try:
+                await self.pc.close()
+            except Exception as e:
+                logger.error(f"Error closing peer connection: {e}")
+            self.pc = None
+
+        self.video_track = None
+        self.data_channel = None
+        self.landmark_channel = None
+
+
+class WebRTCStreamer:
+    """WebRTC video streamer for perception app
+
+    Signaling goes through the shared ``SignalingClient`` connection; the
+    owner forwards incoming ``webrtc_signaling`` messages to
+    ``handle_signaling``.
+
+    One ``AnalysedFrameProducer`` per session runs inference and rep
+    counting once; every viewer (the member's phone, a coach tablet, a wall
+    display) gets its own ``ViewerPeer`` subscribed to it, with its own
+    resolution and framerate caps.
+
+    Stream modes:
+        overlay   - video with server-rendered overlays (default)
+        landmarks - raw video plus a binary landmark packet per analysed frame,
+                    the app draws the skeleton itself
+        stats     - no video track at all, landmark packets only
+    """
+
+    STREAM_MODES = ("overlay", "landmarks", "stats")
+
+    def __init__(self, signaling: SignalingClient, session_id: str = None, exercise_processor=None,
+                 stream_mode: str = "overlay", encoder_settings: Optional[EncoderSettings] = None,
+                 recorder: Optional[SessionRecorder] = None):
+        if stream_mode not in self.STREAM_MODES:
+            logger.warning(f"Unknown stream mode '{stream_mode}', using overlay")
+            stream_mode = "overlay"
+
+        self.signaling = signaling
+        self.session_id = session_id
+        self.exercise_processor = exercise_processor
+        self.stream_mode = stream_mode
+        self.encoder_settings = encoder_settings or EncoderSettings()
+        self.recorder = recorder
+        self.producer: Optional[AnalysedFrameProducer] = None
+        # Viewer peers by signaling client id; None until the first viewer answers
+        self.peers: Dict[Optional[str], ViewerPeer] = {}
+        self.packet_seq = 0
+        self.start_time = time.monotonic()
+        self.streaming = False
 
     async def send_message(self, message):
-        """Send message via WebSocket"""
-        if self.ws and self.connected:
-            await self.ws.send(json.dumps(message))
+        """Send message via the shared signaling connection"""
+        await self.signaling.send(message)
 
     async def start_streaming(self, threaded_camera):
-        """Start WebRTC video streaming"""
+        """Start the shared producer and stream to the session's mobile app"""
         if self.streaming:
             logger.warning("Already streaming")
             return
 
         try:
-            # Create peer connection - configured for local network use
-            configuration = RTCConfiguration([])  # No ICE servers for local connections
-            self.pc = RTCPeerConnection(configuration)
-
-            # Create video track from camera with exercise processor
-            self.video_track = OpenCVVideoTrack(threaded_camera, self.exercise_processor)
-            self.pc.addTrack(self.video_track)
-            logger.info(f"📹 Added video track to peer connection")
-
-            # Set up ICE candidate handling
-            @self.pc.on("icecandidate")
-            async def on_icecandidate(candidate):
-                if candidate:
-                    await self.send_signaling(
-                        "ice-candidate",
-                        {
-                            "candidate": candidate.candidate,
-                            "sdpMid": candidate.sdpMid,
-                            "sdpMLineIndex": candidate.sdpMLineIndex,
-                        },
-                    )
-
-            # Create offer
-            offer = await self.pc.createOffer()
-            await self.pc.setLocalDescription(offer)
-
-            # Send offer to mobile app
-            await self.send_signaling("offer", {"type": offer.type, "sdp": offer.sdp})
+            self.producer = AnalysedFrameProducer(
+                threaded_camera,
+                self.exercise_processor,
+                draw=self.stream_mode == "overlay",
+                on_analysed=self.on_analysed,
+                max_fps=self.encoder_settings.max_fps,
+            )
+            self.producer.start()
+
+            if self.stream_mode != "overlay":
+                logger.info(f"🦴 Streaming landmark packets ({self.stream_mode} mode)")
+
+            # First viewer: whichever mobile client the server routes to
+            await self.add_viewer(None)
 
             self.streaming = True
             logger.info("🎥 Started WebRTC video streaming")
@@ -155,120 +355,170 @@ class WebRTCStreamer:
             logger.error(f"❌ Failed to start streaming: {e}")
             self.streaming = False
 
-    async def send_signaling(self, signal_type: str, data: dict):
+    async def add_viewer(self, client_id: Optional[str], options: Optional[dict] = None):
+        """Offer the session's stream to a viewer, replacing any previous peer for it"""
+        if not self.producer:
+            return
+
+        if client_id in self.peers:
+            await self.peers.pop(client_id).close()
+
+        settings = self.encoder_settings
+        if options:
+            settings = EncoderSettings.from_options({**settings.to_options(), **options})
+
+        peer = ViewerPeer(client_id, self.producer, self.stream_mode, settings)
+        self.peers[client_id] = peer
+        await peer.create_offer(self.send_signaling)
+
+        @peer.pc.on("connectionstatechange")
+        async def on_connectionstatechange():
+            if peer.pc and peer.pc.connectionState in ("failed", "closed"):
+                if self.peers.get(peer.client_id) is peer:
+                    del self.peers[peer.client_id]
+                await peer.close()
+                logger.info(f"👋 Viewer {peer.client_id or 'mobile'} left")
+
+        if client_id:
+            logger.info(f"👀 Added viewer {client_id} ({len(self.peers)} total)")
+
+    def on_analysed(self, image):
+        """Fan each analysed frame out to the recorder and landmark channels"""
+        if self.recorder:
+            self.recorder.submit(image)
+
+        if self.stream_mode != "overlay":
+            self.send_landmarks(image)
+
+    def send_data(self, message: dict) -> bool:
+        """Send a message peer-to-peer over every viewer's stats data channel
+
+        Returns False unless all viewers' channels are open, so callers can
+        fall back to the WebSocket server which reaches every viewer.
+        """
+        if not self.peers or not all(ViewerPeer.channel_open(p.data_channel) for p in self.peers.values()):
+            return False
+
+        try:
+            payload = json.dumps(message)
+            for peer in self.peers.values():
+                peer.data_channel.send(payload)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send over data channel: {e}")
+            return False
+
+    def send_landmarks(self, image):
+        """Send the processor's latest landmarks and metrics as a binary packet"""
+        processor = self.exercise_processor
+        channels = [p.landmark_channel for p in self.peers.values() if ViewerPeer.channel_open(p.landmark_channel)]
+        if not processor or not channels:
+            return
+
+        h, w = image.shape[:2]
+        packet = encode_landmark_packet(
+            self.packet_seq,
+            int((time.monotonic() - self.start_time) * 1000),
+            w, h,
+            processor.pose_landmarks,
+            processor.joint_angles,
+            processor.JOINT_ANGLES,
+            processor.get_stats(),
+        )
+        self.packet_seq += 1
+
+        for channel in channels:
+            try:
+                channel.send(packet)
+            except Exception as e:
+                logger.error(f"Failed to send landmark packet: {e}")
+
+    def pipeline_stats(self) -> dict:
+        """Stage queue depths, drop counters and latencies, see AnalysedFrameProducer.pipeline_stats"""
+        if not self.producer:
+            return {}
+        stats = self.producer.pipeline_stats()
+        # Capture to VideoFrame handed to the encoder, per viewer
+        stats["latency"]["encoded"] = {
+            client_id or "mobile": peer.video_track.latency.stats()
+            for client_id, peer in self.peers.items() if peer.video_track
+        }
+        if self.recorder:
+            stats["recorder"] = self.recorder.get_stats()
+        return stats
+
+    async def send_signaling(self, signal_type: str, data: dict, client_id: Optional[str] = None):
         """Send WebRTC signaling message"""
         message = {
             "type": "webrtc_signaling",
             "targetRole": "mobile",
             "signaling": {"type": signal_type, "data": data},
         }
+        if client_id:
+            message["targetClientId"] = client_id
         await self.send_message(message)
         logger.info(f"📡 Sent {signal_type} signaling")
 
-    async def handle_signaling(self, signaling):
+    async def handle_signaling(self, signaling, from_client_id: Optional[str] = None):
         """Handle incoming WebRTC signaling messages"""
         signal_type = signaling.get("type")
         data = signaling.get("data", {})
 
         logger.info(f"📨 Received {signal_type} signaling")
 
-        if signal_type == "answer":
-            # Handle answer from mobile app
-            answer = RTCSessionDescription(sdp=data["sdp"], type=data["type"])
-            await self.pc.setRemoteDescription(answer)
-            logger.info("✅ Set remote description from mobile answer")
+        peer = self.peers.get(from_client_id)
+        if peer is None and None in self.peers:
+            # The first viewer is offered before we know its client id
+            peer = self.peers.pop(None)
+            peer.client_id = from_client_id
+            self.peers[from_client_id] = peer
 
-        elif signal_type == "ice-candidate":
-            # Handle ICE candidate from mobile app
-            if data.get("candidate"):
-                try:
-                    # aiortc expects the candidate to be parsed from the candidate string
-                    from aiortc import RTCIceCandidate as IceCandidate
-                    from aiortc.sdp import candidate_from_sdp
-                    
-                    # Parse the candidate string
-                    ice_candidate = candidate_from_sdp(data.get("candidate"))
-                    ice_candidate.sdpMid = data.get("sdpMid")
-                    ice_candidate.sdpMLineIndex = data.get("sdpMLineIndex")
-                    
-                    await self.pc.addIceCandidate(ice_candidate)
-                    logger.info("🧊 Added ICE candidate from mobile")
-                except Exception as e:
-                    logger.error(f"Failed to add ICE candidate: {e}")
-            else:
-                logger.info("📭 Received end-of-candidates signal")
+        if peer is None:
+            logger.warning(f"No peer connection for viewer {from_client_id}")
+            return
 
-    async def listen_for_signaling(self):
-        """Listen for WebRTC signaling messages"""
-        while self.connected:
-            try:
-                message = await self.ws.recv()
-                data = json.loads(message)
-
-                if (
-                    data.get("type") == "webrtc_signaling"
-                    and data.get("fromRole") == "mobile"
-                ):
-                    await self.handle_signaling(data.get("signaling", {}))
-
-            except websockets.exceptions.ConnectionClosed:
-                logger.info("WebSocket connection closed")
-                self.connected = False
-                break
-            except Exception as e:
-                logger.error(f"Error handling signaling message: {e}")
+        await peer.handle_signaling(signal_type, data)
 
     async def stop_streaming(self):
         """Stop WebRTC streaming"""
         self.streaming = False
 
-        if self.pc:
-            try:
-                await self.pc.close()
-            except Exception as e:
-                logger.error(f"Error closing peer connection: {e}")
-            self.pc = None
+        for peer in list(self.peers.values()):
+            await peer.close()
+        self.peers.clear()
 
-        if self.video_track:
-            self.video_track = None
+        if self.producer:
+            await self.producer.stop()
+            self.producer = None
 
         logger.info("🛑 Stopped WebRTC streaming")
 
     async def disconnect(self):
-        """Disconnect from signaling server"""
+        """Tear down the peer connections (the signaling connection is shared)"""
         await self.stop_streaming()
 
-        if self.ws:
-            await self.ws.close()
-            self.ws = None
-
-        self.connected = False
-        logger.info("📱 Disconnected from signaling server")
-
 
 # Global WebRTC streamer instance
 webrtc_streamer: Optional[WebRTCStreamer] = None
 
 
-async def init_webrtc_streaming(session_id: str, threaded_camera):
+async def init_webrtc_streaming(signaling: SignalingClient, session_id: str, threaded_camera):
     """Initialize WebRTC streaming for a session"""
     global webrtc_streamer
 
     if webrtc_streamer:
         await webrtc_streamer.disconnect()
 
-    webrtc_streamer = WebRTCStreamer(session_id=session_id)
-
-    if await webrtc_streamer.connect():
-        # Start listening for signaling in background
-        asyncio.create_task(webrtc_streamer.listen_for_signaling())
+    webrtc_streamer = WebRTCStreamer(signaling, session_id=session_id)
+    signaling.on("webrtc_signaling", _forward_signaling)
+    await webrtc_streamer.start_streaming(threaded_camera)
 
-        # Start streaming
-        await webrtc_streamer.start_streaming(threaded_camera)
+    return webrtc_streamer
 
-        return webrtc_streamer
 
-    return None
+async def _forward_signaling(data):
+    if webrtc_streamer and data.get("fromRole") == "mobile":
+        await webrtc_streamer.handle_signaling(data.get("signaling", {}), data.get("fromClientId"))
 
 
 async def cleanup_webrtc_streaming():
@@ -276,5 +526,6 @@ async def cleanup_webrtc_streaming():
     global webrtc_streamer
 
     if webrtc_streamer:
+        webrtc_streamer.signaling.off("webrtc_signaling", _forward_signaling)
         await webrtc_streamer.disconnect()
         webrtc_streamer = None
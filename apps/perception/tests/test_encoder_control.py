@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.encoder_control import CongestionController, EncoderSettings, fit_frame
+
+
+def test_settings_from_options():
+    settings = EncoderSettings.from_options({
+        "maxWidth": "320", "maxHeight": 240, "maxFps": 15, "maxBitrate": 500_000,
+        "codec": "H264", "frameMarker": True,
+    })
+    assert (settings.max_width, settings.max_height) == (320, 240)
+    assert settings.max_fps == 15.0
+    assert settings.max_bitrate == 500_000
+    assert settings.codec == "h264"
+    assert settings.frame_marker
+
+
+def test_settings_defaults_and_round_trip():
+    settings = EncoderSettings.from_options({})
+    assert settings.to_options() == {
+        "maxWidth": 640, "maxHeight": 480, "maxFps": 30.0, "maxBitrate": 1_000_000,
+        "codec": None, "frameMarker": False,
+    }
+    assert EncoderSettings.from_options(settings.to_options()).to_options() == settings.to_options()
+
+
+def test_fit_frame_keeps_the_aspect_ratio_with_even_sides():
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    assert fit_frame(frame, 640, 480).shape == (360, 640, 3)
+    assert fit_frame(frame, 333, 333).shape == (186, 332, 3)
+
+
+def test_fit_frame_never_upscales():
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    assert fit_frame(frame, 640, 480) is frame
+
+
+class StubSender:
+    """getStats returns whatever receiver report was set last, like aiortc between RTCP packets"""
+
+    def __init__(self):
+        self.report = {}
+
+    def receive(self, timestamp: float, fraction_lost: float, rtt: float = 0.05):
+        self.report = {"remote": SimpleNamespace(
+            id="remote", type="remote-inbound-rtp", timestamp=timestamp,
+            fractionLost=fraction_lost * 256, roundTripTime=rtt,
+        )}
+
+    async def getStats(self):
+        return self.report
+
+
+def controller(settings=None):
+    track = SimpleNamespace(max_width=0, max_height=0, max_fps=0)
+    return CongestionController(StubSender(), track, settings or EncoderSettings(), interval=0.01)
+
+
+def test_levels_scale_the_track():
+    control = controller(EncoderSettings(max_width=640, max_height=480, max_fps=30, max_bitrate=1_000_000))
+    assert (control.track.max_width, control.track.max_height, control.track.max_fps) == (640, 480, 30)
+
+    control.on_report(0.2, 0.05)
+    assert (control.track.max_width, control.track.max_height) == (480, 360)
+    assert control.bitrate_cap == 700_000
+
+
+def test_congestion_steps_down_and_a_clean_link_steps_back_up():
+    control = controller()
+    control.on_report(0.2, 0.05)
+    control.on_report(0.0, 0.5)
+    assert control.level == 2
+
+    for _ in range(CongestionController.RECOVER_TICKS - 1):
+        control.on_report(0.0, 0.05)
+    assert control.level == 2
+    control.on_report(0.0, 0.05)
+    assert control.level == 1
+
+
+def test_lowest_level_is_the_floor():
+    control = controller()
+    for _ in range(10):
+        control.on_report(0.5, 1.0)
+    assert control.level == len(CongestionController.LEVELS) - 1
+
+
+def test_each_receiver_report_is_acted_on_once():
+    async def run():
+        control = controller()
+        control.sender.receive(timestamp=1.0, fraction_lost=0.2)
+        control.start()
+        # Several ticks see the same report
+        await asyncio.sleep(0.1)
+        assert control.level == 1
+
+        control.sender.receive(timestamp=2.0, fraction_lost=0.2)
+        await asyncio.sleep(0.1)
+        control.stop()
+        return control.level
+
+    assert asyncio.run(run()) == 2
@@ -0,0 +1,57 @@
+import sys
+
+import pytest
+
+import src.exercies as exercies
+from src.exercies import ExerciseRegistry, get_exercise_processor
+
+EXERCISES = {"lunges", "plank", "pushup", "shouldertap", "squat"}
+
+
+@pytest.fixture
+def registry():
+    return ExerciseRegistry("src.exercies", exercies.__path__)
+
+
+def test_lists_every_plugin_but_the_base(registry):
+    assert set(registry) == EXERCISES
+    assert len(registry) == len(EXERCISES)
+
+
+def test_lookup_is_case_insensitive(registry):
+    assert "ShoulderTap" in registry
+    assert registry["ShoulderTap"] is registry["shouldertap"]
+    assert registry["squat"].__name__ == "Squat"
+    assert "burpee" not in registry
+    assert None not in registry
+    with pytest.raises(KeyError):
+        registry["burpee"]
+
+
+def test_modules_are_imported_on_first_lookup(registry, monkeypatch):
+    monkeypatch.delitem(sys.modules, "src.exercies.Plank", raising=False)
+    assert "plank" in registry
+    list(registry)
+    assert "src.exercies.Plank" not in sys.modules
+    assert registry.loaded == {}
+
+    plank = registry["plank"]
+    assert "src.exercies.Plank" in sys.modules
+    assert registry.loaded == {"plank": plank}
+
+
+def test_requirements_are_the_declared_landmarks(registry):
+    requirements = registry.requirements("squat")
+    assert requirements["joint_angles"]["left_knee"] == (23, 25, 27)
+    joints = {idx for joint in requirements["joint_angles"].values() for idx in joint}
+    # The joints of every angle plus the nose for the rep label
+    assert requirements["landmarks"] == sorted(joints | {0})
+
+
+def test_unknown_exercise_falls_back_to_squat():
+    processor = get_exercise_processor("burpee", use_pose=False)
+    try:
+        assert processor.exercise_name == "squat"
+        assert processor.pose is None
+    finally:
+        processor.cleanup()
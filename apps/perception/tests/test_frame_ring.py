@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from src.frame_ring import SharedFrameRing
+
+SHAPE = (48, 64, 3)
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing.create(SHAPE, slots=3, name=f"perception-test-{os.getpid()}")
+    yield ring
+    ring.close()
+
+
+@pytest.fixture
+def reader(ring):
+    reader = SharedFrameRing.attach(ring.name)
+    yield reader
+    reader.close()
+
+
+def frame(value: int) -> np.ndarray:
+    return np.full(SHAPE, value, dtype=np.uint8)
+
+
+def read_in_child(name, results):
+    reader = SharedFrameRing.attach(name)
+    image, capture_time, number, token = reader.read(copy=True)
+    results.put((number, capture_time, int(image.min()), int(image.max()), reader.still_valid(token)))
+    reader.close()
+
+
+def test_empty_ring(ring):
+    frame_, capture_time, number, token = ring.read()
+    assert frame_ is None and number == 0 and token is None
+    assert ring.get_frame()[0] is False
+
+
+def test_reader_sees_the_newest_frame(ring, reader):
+    assert reader.shape == SHAPE and reader.slots == 3
+    for number in range(1, 5):
+        assert ring.write(frame(number), capture_time=number / 10) == number
+
+    image, capture_time, number, token = reader.read()
+    assert number == 4
+    assert capture_time == pytest.approx(0.4)
+    assert (image == 4).all()
+    assert reader.still_valid(token)
+
+
+def test_zero_copy_read_is_invalidated_when_the_slot_is_rewritten(ring, reader):
+    ring.write(frame(1), 0.1)
+    image, _, _, token = reader.read()
+
+    # The writer comes back round to the same slot
+    for value in (2, 3, 4):
+        ring.write(frame(value), 0.0)
+    assert not reader.still_valid(token)
+    assert (image == 4).all()
+
+
+def test_copy_survives_rewrites(ring, reader):
+    ring.write(frame(1), 0.1)
+    image, _, _, _ = reader.read(copy=True)
+    for value in (2, 3, 4):
+        ring.write(frame(value), 0.0)
+    assert (image == 1).all()
+
+
+def test_write_in_progress_is_not_read(ring, reader):
+    ring.write(frame(1), 0.1)
+    # Writer stopped half way: sequence odd
+    ring.meta[1]["seq"] += 1
+    assert reader.read()[0] is None
+    ring.meta[1]["seq"] += 1
+    assert reader.read()[2] == 1
+
+
+def test_frames_of_another_size_are_resized(ring, reader):
+    ring.write(np.full((96, 128, 3), 9, dtype=np.uint8), 0.0)
+    ok, image, _, number = reader.get_frame()
+    assert ok and number == 1
+    assert image.shape == SHAPE and (image == 9).all()
+
+
+def test_reader_in_another_process(ring):
+    ring.write(frame(5), 1.5)
+    ring.write(frame(6), 2.5)
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    child = context.Process(target=read_in_child, args=(ring.name, results))
+    child.start()
+    try:
+        assert results.get(timeout=30) == (2, 2.5, 6, 6, True)
+    finally:
+        child.join(timeout=10)
+    assert child.exitcode == 0
+
+
+def test_owner_unlinks_the_block(ring):
+    name = ring.name
+    SharedFrameRing.attach(name).close()
+    ring.close()
+    with pytest.raises(FileNotFoundError):
+        SharedFrameRing.attach(name)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+import src.group_processor as group_processor
+from src.person_tracker import PersonTracker
+from src.synthetic_pose import SyntheticPoseGenerator
+
+
+class StubLandmarker:
+    """Stands in for the Tasks landmarker, which needs a model file"""
+
+    model = "full"
+
+    def __init__(self, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def group(monkeypatch):
+    monkeypatch.setattr(group_processor, "TasksPoseBackend", StubLandmarker)
+    group = group_processor.GroupExerciseProcessor("squat", num_poses=3)
+    group.tracker = PersonTracker(max_missing=10, min_seen=2, max_lost=1)
+    yield group
+    group.cleanup()
+
+
+@pytest.fixture(scope="module")
+def squats():
+    # About 2 s per rep at 30 fps
+    _, landmarks, _ = SyntheticPoseGenerator("squat", seed=3).generate(600)
+    return landmarks
+
+
+def at(landmarks: np.ndarray, x: float) -> np.ndarray:
+    """The pose squeezed into a third of the frame, starting at x"""
+    moved = landmarks.copy()
+    moved[:, 0] = moved[:, 0] / 3 + x
+    return moved
+
+
+def run(group, frames):
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    events = []
+    for poses in frames:
+        group.render_frame(image, poses, draw=False)
+        events += group.rep_events.drain()
+    return events
+
+
+def test_reps_are_counted_per_person(group, squats):
+    events = run(group, ([at(pose, 0.0), at(pose, 0.6)] for pose in squats))
+    stats = group.get_stats()
+
+    assert set(stats["people"]) == {"1", "2"}
+    reps = stats["people"]["1"]["rep_count"]
+    assert reps >= 4
+    assert stats["people"]["2"]["rep_count"] == reps
+    assert stats["rep_count"] == 2 * reps
+    assert {event["person"] for event in events} == {1, 2}
+
+
+def test_person_returning_to_their_place_keeps_id_and_reps(group, squats):
+    frames = []
+    for i, pose in enumerate(squats):
+        poses = [at(pose, 0.0)]
+        # Person 2 steps out for a second and a half in the middle
+        if not 250 <= i < 295:
+            poses.append(at(pose, 0.6))
+        frames.append(poses)
+    run(group, frames)
+
+    stats = group.get_stats()
+    assert set(stats["people"]) == {"1", "2"}
+    assert stats["people"]["2"]["rep_count"] >= stats["people"]["1"]["rep_count"] - 1
+    assert stats["left"] == {"people": 0, "rep_count": 0}
+
+
+def test_forgotten_people_are_released_into_the_left_summary(group, squats):
+    frames = [[at(pose, 0.0), at(pose, 0.6)] for pose in squats[:300]]
+    # Person 2 leaves, then two others take turns at new places
+    frames += [[at(pose, 0.0)] for pose in squats[300:320]]
+    frames += [[at(pose, 0.0), at(pose, 0.3)] for pose in squats[320:340]]
+    frames += [[at(pose, 0.0)] for pose in squats[340:360]]
+    run(group, frames)
+
+    stats = group.get_stats()
+    # Person 2 was pushed off the lost list by person 3
+    assert set(stats["people"]) == {"1", "3"}
+    assert len(group.people) == 2
+    assert stats["left"]["people"] == 1
+    assert stats["left"]["rep_count"] >= 2
+    assert stats["rep_count"] == stats["left"]["rep_count"] + sum(
+        person["rep_count"] for person in stats["people"].values()
+    )
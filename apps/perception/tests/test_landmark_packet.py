@@ -0,0 +1,73 @@
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+from src.landmark_packet import (
+    ANGLE_SLOTS, NUM_LANDMARKS, PACKET_SIZE, decode_landmark_packet, encode_landmark_packet,
+)
+
+
+def landmark_list(points):
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    for x, y, visibility in points:
+        landmarks.landmark.add(x=x, y=y, z=0.0, visibility=visibility)
+    return landmarks
+
+
+def test_round_trip():
+    rng = np.random.default_rng(7)
+    points = rng.random((NUM_LANDMARKS, 3))
+    angles = {"left_knee": 92.5, "right_knee": 178.25}
+
+    packet = encode_landmark_packet(
+        seq=41, timestamp_ms=123456, width=640, height=480,
+        pose_landmarks=landmark_list(points.tolist()),
+        angles=angles, angle_names=["left_knee", "right_knee", "left_hip"],
+        stats={"rep_count": 7, "shoulder_tap_count": 3, "plank_duration": 12.34},
+    )
+    assert len(packet) == PACKET_SIZE
+
+    decoded = decode_landmark_packet(packet)
+    assert decoded["pose"]
+    assert decoded["seq"] == 41
+    assert decoded["timestamp_ms"] == 123456
+    assert (decoded["width"], decoded["height"]) == (640, 480)
+    assert decoded["rep_count"] == 7
+    assert decoded["shoulder_tap_count"] == 3
+    assert decoded["plank_duration"] == 12.3
+    assert decoded["angles"] == [92.5, 178.25] + [None] * (ANGLE_SLOTS - 2)
+
+    # Coordinates are quantised to 16 bits, visibility to 8
+    assert decoded["landmarks"].shape == (NUM_LANDMARKS, 3)
+    np.testing.assert_allclose(decoded["landmarks"][:, :2], points[:, :2], atol=1 / 65535)
+    np.testing.assert_allclose(decoded["landmarks"][:, 2], points[:, 2], atol=1 / 255)
+
+
+def test_no_pose():
+    packet = encode_landmark_packet(1, 0, 320, 240, None, {}, [], {})
+    decoded = decode_landmark_packet(packet)
+    assert not decoded["pose"]
+    assert decoded["rep_count"] == 0
+    assert decoded["angles"] == [None] * ANGLE_SLOTS
+    assert not decoded["landmarks"].any()
+
+
+def test_values_are_clamped_to_their_fields():
+    points = [(-0.5, 1.5, 2.0)] * NUM_LANDMARKS
+    packet = encode_landmark_packet(
+        seq=2 ** 32 + 5, timestamp_ms=0, width=640, height=480,
+        pose_landmarks=landmark_list(points),
+        angles={"knee": 1000.0}, angle_names=["knee"],
+        stats={"rep_count": 70000},
+    )
+    decoded = decode_landmark_packet(packet)
+    assert decoded["seq"] == 5
+    assert decoded["rep_count"] == 0xFFFF
+    assert decoded["angles"][0] == 655.34
+    np.testing.assert_array_equal(decoded["landmarks"][0], [0.0, 1.0, 1.0])
+
+
+def test_other_payloads_are_not_packets():
+    packet = encode_landmark_packet(1, 0, 320, 240, None, {}, [], {})
+    assert decode_landmark_packet(packet[:-1]) is None
+    assert decode_landmark_packet(b"XX" + packet[2:]) is None
+    assert decode_landmark_packet(b'{"type": "exercise_stats"}') is None
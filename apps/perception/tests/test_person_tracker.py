@@ -0,0 +1,117 @@
+import numpy as np
+
+from src.person_tracker import PersonTracker, pose_anchor
+
+
+def pose(x: float, y: float = 0.5, visibility: float = 1.0) -> np.ndarray:
+    landmarks = np.zeros((33, 4), dtype=np.float32)
+    landmarks[:, 0] = x
+    landmarks[:, 1] = y
+    landmarks[:, 3] = visibility
+    return landmarks
+
+
+def ids(tracked):
+    return [person for person, _ in tracked]
+
+
+def confirm(tracker: PersonTracker, poses):
+    """Feed the same detections until their tracks are confirmed"""
+    tracked = []
+    for _ in range(tracker.min_seen):
+        tracked = tracker.update(poses)
+    return tracked
+
+
+def test_anchor_is_the_torso_centre():
+    landmarks = pose(0.5)
+    landmarks[[11, 12, 23, 24], 0] = [0.2, 0.4, 0.2, 0.4]
+    np.testing.assert_allclose(pose_anchor(landmarks), [0.3, 0.5])
+
+
+def test_anchor_without_visible_landmarks():
+    assert pose_anchor(pose(0.5, visibility=0.0)) is None
+
+
+def test_new_tracks_are_reported_once_confirmed():
+    tracker = PersonTracker(min_seen=3)
+    assert tracker.update([pose(0.2), pose(0.7)]) == []
+    assert tracker.update([pose(0.2), pose(0.7)]) == []
+    assert ids(tracker.update([pose(0.2), pose(0.7)])) == [1, 2]
+    assert tracker.active == [1, 2]
+
+
+def test_ids_follow_people_across_frames():
+    tracker = PersonTracker(min_seen=1)
+    assert ids(tracker.update([pose(0.2), pose(0.7)])) == [1, 2]
+    # Detection order changes and both move a little
+    tracked = tracker.update([pose(0.72), pose(0.22)])
+    assert ids(tracked) == [2, 1]
+    assert tracked[0][1][0, 0] == np.float32(0.72)
+
+
+def test_undetectable_poses_are_skipped():
+    tracker = PersonTracker(min_seen=1)
+    assert ids(tracker.update([pose(0.2, visibility=0.0), pose(0.7)])) == [1]
+
+
+def test_flicker_is_dropped_without_an_id():
+    tracker = PersonTracker(min_seen=5)
+    confirm(tracker, [pose(0.2)])
+    # One-frame false detection
+    tracker.update([pose(0.2), pose(0.8)])
+    tracker.update([pose(0.2)])
+    assert list(tracker.anchors) == [1]
+    assert tracker.drain_forgotten() == []
+
+
+def test_missing_person_keeps_their_id_for_max_missing_frames():
+    tracker = PersonTracker(min_seen=1, max_missing=3)
+    tracker.update([pose(0.2), pose(0.7)])
+    for _ in range(3):
+        assert ids(tracker.update([pose(0.2)])) == [1]
+    assert tracker.active == [1]
+    assert ids(tracker.update([pose(0.2), pose(0.7)])) == [1, 2]
+    assert tracker.lost == {}
+
+
+def test_returning_person_takes_their_id_back():
+    tracker = PersonTracker(min_seen=2, max_missing=3)
+    confirm(tracker, [pose(0.2), pose(0.7)])
+    for _ in range(5):
+        tracker.update([pose(0.2)])
+    assert list(tracker.lost) == [2]
+
+    # Back at their place in the row, at a different height (mid squat)
+    assert ids(tracker.update([pose(0.2), pose(0.74, y=0.7)])) == [1]
+    assert ids(tracker.update([pose(0.2), pose(0.74, y=0.7)])) == [1, 2]
+    assert tracker.lost == {}
+    assert tracker.next_id == 4
+
+
+def test_someone_else_elsewhere_gets_a_new_id():
+    tracker = PersonTracker(min_seen=1, max_missing=1)
+    tracker.update([pose(0.2), pose(0.7)])
+    tracker.update([pose(0.2)])
+    tracker.update([pose(0.2)])
+    assert list(tracker.lost) == [2]
+    assert ids(tracker.update([pose(0.2), pose(0.45)])) == [1, 3]
+    assert list(tracker.lost) == [2]
+
+
+def test_lost_list_is_bounded_and_drained():
+    tracker = PersonTracker(min_seen=1, max_missing=0, max_lost=2)
+    for x in (0.1, 0.3, 0.5, 0.7):
+        tracker.update([pose(x)])
+    tracker.update([])
+    assert list(tracker.lost) == [3, 4]
+    assert tracker.drain_forgotten() == [1, 2]
+    assert tracker.drain_forgotten() == []
+
+
+def test_reset_forgets_everyone():
+    tracker = PersonTracker(min_seen=1)
+    tracker.update([pose(0.2)])
+    tracker.reset()
+    assert tracker.active == []
+    assert ids(tracker.update([pose(0.2)])) == [1]
@@ -0,0 +1,78 @@
+import pytest
+
+from src.rep_timeline import RepTimeline
+
+
+def feed(timeline: RepTimeline, samples):
+    """(timestamp, angle, depth, rep_completed) samples, returns the completed records"""
+    records = []
+    for timestamp, angle, depth, completed in samples:
+        record = timeline.update(timestamp, angle, depth, rep_completed=completed)
+        if record:
+            records.append(record)
+    return records
+
+
+def squat(start: float, top: float = 170.0, bottom: float = 80.0):
+    """One rep at 0.1 s per frame: at the top until +0.1 s, bottom 0.5 s later, counted back at the top at +1.1 s"""
+    angles = [top, top, 150, 130, 110, bottom + 10, bottom, bottom + 15, 115, 135, 155, top - 2]
+    return [
+        (start + 0.1 * i, angle, angle / 2, i == len(angles) - 1)
+        for i, angle in enumerate(angles)
+    ]
+
+
+def test_rep_record():
+    timeline = RepTimeline()
+    [record] = feed(timeline, squat(0.0))
+
+    assert record["rep"] == 1
+    # Starts at the last frame at the top, before the descent
+    assert record["start"] == pytest.approx(0.1)
+    assert record["end"] == pytest.approx(1.1)
+    assert record["duration"] == pytest.approx(1.0)
+    assert record["eccentric"] == pytest.approx(0.5)
+    assert record["concentric"] == pytest.approx(0.5)
+    assert record["min_angle"] == 80.0
+    assert record["range_of_motion"] == 90.0
+    assert record["depth"] == 40.0
+
+
+def test_rep_counted_back_at_the_top_has_a_duration():
+    # The counting frame is within the top tolerance; it must close the
+    # rep, not restart it (zero-duration records)
+    timeline = RepTimeline()
+    records = feed(timeline, squat(0.0) + squat(1.2) + squat(2.4))
+    assert [r["rep"] for r in records] == [1, 2, 3]
+    assert all(r["duration"] > 0.5 for r in records)
+    assert all(r["range_of_motion"] > 80 for r in records)
+
+
+def test_missing_angles_are_skipped():
+    timeline = RepTimeline()
+    samples = squat(0.0)
+    samples[5] = (samples[5][0], None, None, False)
+    [record] = feed(timeline, samples)
+    assert record["min_angle"] == 80.0
+
+
+def test_summary_and_history():
+    timeline = RepTimeline(history=2)
+    assert timeline.summary() == {"reps": 0}
+
+    feed(timeline, squat(0.0) + squat(1.2, bottom=100.0) + squat(2.4))
+    assert [r["rep"] for r in timeline.recent] == [2, 3]
+    summary = timeline.summary()
+    assert summary["reps"] == 3
+    assert summary["avg_duration"] == pytest.approx(1.0, abs=0.1)
+    assert summary["avg_range_of_motion"] == pytest.approx((90 + 70 + 90) / 3, abs=1.0)
+
+    timeline.reset()
+    assert timeline.summary() == {"reps": 0}
+    assert not timeline.recent
+
+
+def test_counter_without_a_started_rep_is_ignored():
+    timeline = RepTimeline()
+    assert timeline.update(0.0, None, rep_completed=True) is None
+    assert timeline.summary() == {"reps": 0}
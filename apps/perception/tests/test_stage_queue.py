@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+
+from src.stage_queue import DROP_NEWEST, DROP_OLDEST, NEVER_DROP, StageQueue
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        StageQueue("frames", 1, "drop_random")
+
+
+def test_drop_oldest_keeps_the_newest_items():
+    queue = StageQueue("frames", 2, DROP_OLDEST)
+    assert queue.put(1)
+    assert queue.put(2)
+    assert not queue.put(3)
+
+    assert queue.drain() == [2, 3]
+    stats = queue.stats()
+    assert stats["put"] == 3
+    assert stats["got"] == 2
+    assert stats["dropped"] == 1
+    assert stats["high_water"] == 2
+
+
+def test_drop_newest_keeps_the_queued_items():
+    queue = StageQueue("frames", 2, DROP_NEWEST)
+    queue.put(1)
+    queue.put(2)
+    assert not queue.put(3)
+
+    assert queue.drain() == [1, 2]
+    assert queue.stats()["dropped"] == 1
+
+
+def test_never_drop_grows_past_maxsize():
+    queue = StageQueue("events", 2, NEVER_DROP)
+    for item in range(5):
+        assert queue.put(item)
+
+    assert len(queue) == 5
+    assert queue.stats()["dropped"] == 0
+    assert queue.stats()["high_water"] == 5
+    assert queue.drain() == [0, 1, 2, 3, 4]
+
+
+def test_maxsize_is_at_least_one():
+    queue = StageQueue("frames", 0)
+    assert queue.maxsize == 1
+    queue.put("a")
+    queue.put("b")
+    assert queue.drain() == ["b"]
+
+
+def test_get_nowait_on_empty_queue_counts_an_empty_read():
+    queue = StageQueue("frames")
+    assert queue.get_nowait() is None
+    assert queue.stats()["empty_reads"] == 1
+    assert queue.stats()["got"] == 0
+
+
+def test_get_times_out_and_records_the_wait():
+    queue = StageQueue("frames")
+    assert queue.get(timeout=0.02) is None
+    stats = queue.stats()
+    assert stats["empty_reads"] == 1
+    assert stats["wait_ms"] >= 15
+
+
+def test_get_wakes_up_for_an_item_from_another_thread():
+    queue = StageQueue("frames")
+    timer = threading.Timer(0.02, queue.put, args=("frame",))
+    timer.start()
+    try:
+        assert queue.get(timeout=2.0) == "frame"
+    finally:
+        timer.join()
+    assert queue.stats()["got"] == 1
+
+
+def test_wait_for_space():
+    queue = StageQueue("frames", 1)
+    assert queue.wait_for_space(timeout=0)
+    queue.put(1)
+    assert not queue.wait_for_space(timeout=0.01)
+
+    timer = threading.Timer(0.02, queue.get_nowait)
+    timer.start()
+    try:
+        assert queue.wait_for_space(timeout=2.0)
+    finally:
+        timer.join()
+
+
+def test_clear_and_reset_stats():
+    queue = StageQueue("frames", 1)
+    queue.put(1)
+    queue.put(2)
+    queue.clear()
+    assert len(queue) == 0
+
+    queue.reset_stats()
+    assert queue.stats() == {
+        "depth": 0, "maxsize": 1, "policy": DROP_OLDEST, "put": 0, "got": 0, "dropped": 0,
+        "high_water": 0, "empty_reads": 0, "wait_ms": 0.0,
+    }
@@ -2,6 +2,10 @@ import { WebSocket, WebSocketServer } from 'ws';
 
 let wss: WebSocketServer | null = null;
 
+// Stats every 500 ms, rep events and every ICE candidate: only logged per message with WS_DEBUG=1
+const DEBUG = process.env.WS_DEBUG === '1';
+const HIGH_RATE_TYPES = new Set(['exercise_stats', 'rep_event', 'webrtc_signaling']);
+
 const connections: Map<string, { ws: WebSocket; sessionId?: string; role?: 'perception' | 'mobile' }> = new Map();
 
 export function initWebSocketServer(port: number) {
@@ -26,7 +30,9 @@ export function initWebSocketServer(port: number) {
 		ws.on('message', (data) => {
 			try {
 				const message = JSON.parse(data.toString());
-				console.log(`📨 Received from ${clientId}:`, message);
+				if (DEBUG || !HIGH_RATE_TYPES.has(message.type)) {
+					console.log(`📨 Received from ${clientId}:`, message);
+				}
 
 				// Handle different message types
 				if (message.type === 'register') {
@@ -39,6 +45,10 @@ export function initWebSocketServer(port: number) {
 					handleSessionEnd(clientId, message);
 				} else if (message.type === 'exercise_stats') {
 					handleExerciseStats(clientId, message);
+				} else if (message.type === 'rep_event') {
+					handleRepEvent(clientId, message);
+				} else if (message.type === 'session_ready') {
+					handleSessionReady(clientId, message);
 				} else {
 					// Legacy message handling
 					const enrichedMessage = {
@@ -82,6 +92,7 @@ function handleRegisterClient(clientId: string, message: any) {
 					type: 'client_registered',
 					clientId,
 					role: message.role,
+					options: message.options,
 					timestamp: new Date().toISOString(),
 				},
 				clientId
@@ -101,22 +112,34 @@ function handleWebRTCSignaling(clientId: string, message: any) {
 	}
 
 	const { sessionId } = connection;
-	const { targetRole, signaling } = message;
+	const { targetRole, targetClientId, signaling } = message;
 
-	console.log(`🔄 WebRTC signaling from ${clientId} (${connection.role}) to ${targetRole} in session ${sessionId}`);
+	// Offers and answers are worth a line, ICE candidates only when debugging
+	const logged = DEBUG || signaling?.type !== 'ice-candidate';
+	if (logged) {
+		console.log(`🔄 WebRTC signaling from ${clientId} (${connection.role}) to ${targetClientId ?? targetRole} in session ${sessionId}`);
+	}
 
-	// Forward signaling message to target role in the same session
+	// Forward signaling message to the target client, or the first client with the target role, in the same session
 	for (const [otherClientId, otherConnection] of connections.entries()) {
-		if (otherClientId !== clientId && otherConnection.sessionId === sessionId && otherConnection.role === targetRole) {
+		if (
+			otherClientId !== clientId &&
+			otherConnection.sessionId === sessionId &&
+			otherConnection.role === targetRole &&
+			(!targetClientId || otherClientId === targetClientId)
+		) {
 			otherConnection.ws.send(
 				JSON.stringify({
 					type: 'webrtc_signaling',
 					fromRole: connection.role,
+					fromClientId: clientId,
 					signaling,
 					timestamp: new Date().toISOString(),
 				})
 			);
-			console.log(`✅ Forwarded signaling to ${otherClientId}`);
+			if (logged) {
+				console.log(`✅ Forwarded signaling to ${otherClientId}`);
+			}
 			return;
 		}
 	}
@@ -126,7 +149,7 @@ function handleWebRTCSignaling(clientId: string, message: any) {
 
 // Handle session start message - forward to perception app
 function handleSessionStart(clientId: string, message: any) {
-	const { sessionId, exercise, memberId } = message;
+	const { sessionId, exercise, memberId, options } = message;
 	console.log(`🚀 Session start: ${sessionId} for member ${memberId}, exercise: ${exercise}`);
 
 	// Forward to all perception clients (they will filter by sessionId if needed)
@@ -138,6 +161,7 @@ function handleSessionStart(clientId: string, message: any) {
 					sessionId,
 					exercise,
 					memberId,
+					options,
 					timestamp: new Date().toISOString(),
 				})
 			);
@@ -169,7 +193,7 @@ function handleSessionEnd(clientId: string, message: any) {
 	}
 }
 
-// Handle exercise stats from perception app
+// Handle exercise stats from perception app (fallback when the WebRTC data channel is not open)
 function handleExerciseStats(clientId: string, message: any) {
 	const connection = connections.get(clientId);
 	if (!connection?.sessionId) {
@@ -179,16 +203,60 @@ function handleExerciseStats(clientId: string, message: any) {
 	const { sessionId, stats } = message;
 
 	// Forward stats to all mobile clients in this session
-	for (const [otherClientId, otherConnection] of connections.entries()) {
-		if (otherConnection.role === 'mobile' && otherConnection.sessionId === sessionId) {
-			otherConnection.ws.send(
-				JSON.stringify({
-					type: 'exercise_stats',
-					sessionId,
-					stats,
-					timestamp: new Date().toISOString(),
-				})
-			);
+	sendToSessionMobiles(sessionId, {
+		type: 'exercise_stats',
+		sessionId,
+		stats,
+		timestamp: new Date().toISOString(),
+	});
+}
+
+// Handle rep events from perception app (fallback when the WebRTC data channel is not open)
+function handleRepEvent(clientId: string, message: any) {
+	const connection = connections.get(clientId);
+	if (!connection?.sessionId) {
+		return;
+	}
+
+	const { sessionId, exercise, count, reps, person } = message;
+
+	sendToSessionMobiles(sessionId, {
+		type: 'rep_event',
+		sessionId,
+		exercise,
+		count,
+		reps,
+		// Group sessions tag each rep with the tracked person's id
+		...(person !== undefined ? { person } : {}),
+		timestamp: new Date().toISOString(),
+	});
+}
+
+// Handle session ready from perception app, reports how long the session took to start
+function handleSessionReady(clientId: string, message: any) {
+	const connection = connections.get(clientId);
+	if (!connection?.sessionId) {
+		return;
+	}
+
+	const { sessionId, startupMs, warm } = message;
+	console.log(`⏱️ Session ${sessionId} ready in ${startupMs}ms (${warm ? 'warm' : 'cold'})`);
+
+	sendToSessionMobiles(sessionId, {
+		type: 'session_ready',
+		sessionId,
+		startupMs,
+		warm,
+		timestamp: new Date().toISOString(),
+	});
+}
+
+// Send to all mobile clients in a specific session
+function sendToSessionMobiles(sessionId: string, data: any) {
+	const payload = JSON.stringify(data);
+	for (const connection of connections.values()) {
+		if (connection.role === 'mobile' && connection.sessionId === sessionId) {
+			connection.ws.send(payload);
 		}
 	}
 }